@@ -0,0 +1 @@
+# Scripts de medición de rendimiento (se ejecutan con python -m benchmarks.<script>)
@@ -0,0 +1,197 @@
+# Latencia, consultas y memoria de los controladores detrás de cada pantalla
+#
+#   python -m benchmarks.bench_controladores [--atletas 1000 10000] [--repeticiones 20]
+#       [--salida resultados.json] [--comparar base.json] [--tolerancia 0.25]
+#
+# Para cada tamaño crea una base SQLite en memoria, la migra, la llena con
+# benchmarks.datos_sinteticos (semilla fija) y mide cada escenario: la primera
+# llamada (caches vacías), p50/p95 de las repeticiones, consultas y filas
+# leídas (con la instrumentación, que también marca los N+1) y pico de memoria
+# de Python. Con --comparar sale con código 1 si algún p95 empeora más que la
+# tolerancia o si un escenario hace más consultas.
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from controllers.atleta_controller import AtletaController
+from controllers.coach_controller import CoachController
+from controllers.finance_controller import FinanceController
+from controllers.rutina_controller import RutinaController
+from controllers.user_controller import UserController
+from models.database import Database, BACKEND_CONFIG
+from models.instrumentacion import instrumentacion, INSTRUMENTACION_CONFIG
+from models.registro import configurar_registro
+from benchmarks import datos_sinteticos
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano (sin interpolar) de una lista no vacía"""
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[indice]
+
+
+def escenarios(datos):
+    """(nombre, pantalla, función) de cada entrada de controlador a medir"""
+    atletas = AtletaController()
+    coaches = CoachController()
+    finanzas = FinanceController()
+    rutinas = RutinaController()
+    usuarios = UserController()
+
+    hoy = datos['hoy']
+    emails = datos['emails_atletas']
+    coach_mayor = datos['ids_coaches'][0]
+    inicio_mes = hoy.replace(day=1)
+    turno = iter(range(sys.maxsize))
+
+    return [
+        ('login', 'Inicio de sesión',
+         lambda: usuarios.validar_credenciales(emails[next(turno) % len(emails)], datos_sinteticos.CONTRASEÑA)),
+        ('atletas.todos', 'Atletas', atletas.obtener_todos_atletas),
+        ('atletas.proximos_vencer', 'Atletas', lambda: atletas.obtener_atletas_proximos_vencer(7)),
+        ('usuarios.todos', 'Usuarios', usuarios.obtener_todos_usuarios),
+        ('ingresos.detallados', 'Pagos', finanzas.obtener_ingresos_detallados),
+        ('ingresos.pagina', 'Pagos', lambda: finanzas.obtener_ingresos_pagina(100)),
+        ('reporte.mes', 'Reportes', lambda: finanzas.generar_reporte_financiero(inicio_mes, hoy)),
+        ('reporte.año', 'Reportes', lambda: finanzas.generar_reporte_financiero(hoy - timedelta(days=365), hoy)),
+        ('coaches.resumen', 'Coaches', coaches.obtener_resumen_coaches),
+        ('coaches.reporte', 'Coaches', lambda: coaches.generar_reporte_coach(coach_mayor)),
+        ('coaches.atletas', 'Coaches', lambda: coaches.obtener_atletas_por_coach(coach_mayor)),
+        ('rutinas.resumen', 'Rutinas', rutinas.obtener_rutinas_resumen),
+    ]
+
+
+def medir(nombre, funcion, repeticiones, max_segundos):
+    """
+    Mide un escenario; las consultas y la memoria salen de llamadas aparte para no
+    sumar el costo de medirlas a los tiempos
+    """
+    inicio = time.perf_counter()
+    resultado = funcion()
+    primera = time.perf_counter() - inicio
+
+    tiempos = []
+    limite = time.perf_counter() + max_segundos
+    while len(tiempos) < repeticiones and (not tiempos or time.perf_counter() < limite):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    INSTRUMENTACION_CONFIG['activa'] = True
+    try:
+        with instrumentacion.accion(nombre) as accion:
+            funcion()
+    finally:
+        INSTRUMENTACION_CONFIG['activa'] = False
+
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'exito': not (isinstance(resultado, dict) and resultado.get('success') is False),
+        'primera_ms': round(primera * 1000, 3),
+        'p50_ms': round(percentil(tiempos, 50) * 1000, 3),
+        'p95_ms': round(percentil(tiempos, 95) * 1000, 3),
+        'repeticiones': len(tiempos),
+        'consultas': accion.total_consultas,
+        'filas': sum(estadistica['filas'] for estadistica in accion.consultas.values()),
+        'n_mas_1': [clave for clave, _ in accion.n_mas_1(INSTRUMENTACION_CONFIG['umbral_n_mas_1'])],
+        'memoria_pico_kb': round(pico / 1024, 1)
+    }
+
+
+def correr_tamaño(atletas, repeticiones, max_segundos, semilla):
+    # Cada tamaño en su propia base en memoria
+    BACKEND_CONFIG.update(motor='sqlite', ruta_sqlite=':memory:')
+    Database.cerrar_pools()
+
+    inicio = time.perf_counter()
+    datos = datos_sinteticos.generar(atletas, semilla, hoy=date.today())
+    print(f"\n{atletas:,} atletas: datos generados en {time.perf_counter() - inicio:.1f} s "
+          f"({datos['filas']['ingresos']:,} pagos)")
+
+    resultados = {}
+    print(f"  {'escenario':26} {'primera':>10} {'p50':>10} {'p95':>10} {'consultas':>10} {'memoria':>10}")
+    for nombre, pantalla, funcion in escenarios(datos):
+        medicion = medir(nombre, funcion, repeticiones, max_segundos)
+        medicion['pantalla'] = pantalla
+        resultados[nombre] = medicion
+        print(f"  {nombre:26} {medicion['primera_ms']:>8.1f}ms {medicion['p50_ms']:>8.1f}ms "
+              f"{medicion['p95_ms']:>8.1f}ms {medicion['consultas']:>10} {medicion['memoria_pico_kb']:>8.0f}KB"
+              + ("" if medicion['exito'] else "  (falló)")
+              + (f"  N+1: {len(medicion['n_mas_1'])}" if medicion['n_mas_1'] else ""))
+
+    Database.cerrar_pools()
+    return {'filas': datos['filas'], 'escenarios': resultados}
+
+
+def comparar(actual, base, tolerancia):
+    """Lista de regresiones de `actual` respecto de `base` (mismos tamaños y escenarios)"""
+    regresiones = []
+    for tamaño, corrida in actual['tamaños'].items():
+        anterior = base.get('tamaños', {}).get(tamaño)
+        if anterior is None:
+            continue
+        for nombre, medicion in corrida['escenarios'].items():
+            previa = anterior['escenarios'].get(nombre)
+            if previa is None:
+                continue
+            if medicion['p95_ms'] > previa['p95_ms'] * (1 + tolerancia):
+                regresiones.append(f"{tamaño} atletas, {nombre}: p95 {previa['p95_ms']} -> {medicion['p95_ms']} ms")
+            if medicion['consultas'] > previa['consultas']:
+                regresiones.append(f"{tamaño} atletas, {nombre}: consultas {previa['consultas']} -> {medicion['consultas']}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los controladores con datos sintéticos")
+    parser.add_argument('--atletas', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--max-segundos', type=float, default=10.0,
+                        help="tiempo máximo de repeticiones por escenario (al menos una)")
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--salida', help="archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', metavar='BASE', help="JSON de una corrida anterior")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="empeoramiento de p95 admitido al comparar (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # Los mensajes de los controladores no se mezclan con la tabla; un escenario
+    # que devuelve success=False aparece como "(falló)"
+    configurar_registro(nivel='CRITICAL')
+
+    resultado = {
+        'fecha': date.today().isoformat(),
+        'python': platform.python_version(),
+        'semilla': args.semilla,
+        'repeticiones': args.repeticiones,
+        'tamaños': {}
+    }
+    for atletas in args.atletas:
+        resultado['tamaños'][str(atletas)] = correr_tamaño(atletas, args.repeticiones, args.max_segundos, args.semilla)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+        print(f"\nResultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            regresiones = comparar(resultado, json.load(archivo), args.tolerancia)
+        if regresiones:
+            print("\nRegresiones:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            sys.exit(1)
+        print("\nSin regresiones respecto de la base")
+
+
+if __name__ == '__main__':
+    main()
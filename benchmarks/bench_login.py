@@ -0,0 +1,95 @@
+# Latencia del login con 10k/100k usuarios: carga completa vs consulta por email
+#
+#   python -m benchmarks.bench_login [--usuarios 10000 100000] [--repeticiones 200]
+#
+# Usa una tabla `usuarios` en SQLite en memoria con las mismas columnas e índice
+# único en email, para poder correrlo sin servidor MySQL.
+import argparse
+import hashlib
+import random
+import sqlite3
+import statistics
+import time
+
+from controllers.password_hasher import PasswordHasher
+
+
+def crear_tabla(cantidad):
+    conexion = sqlite3.connect(':memory:')
+    conexion.execute("""
+        CREATE TABLE usuarios (
+            id INTEGER PRIMARY KEY, nombre TEXT, apellido TEXT, edad INTEGER,
+            direccion TEXT, telefono TEXT, email TEXT UNIQUE, contraseña TEXT,
+            rol TEXT, estado_activo INTEGER, creado_por INTEGER, ultimo_acceso TEXT,
+            fecha_creacion TEXT
+        )
+    """)
+    legado = hashlib.sha256(b'clave123').hexdigest()
+    conexion.executemany(
+        "INSERT INTO usuarios VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((i, f'Nombre{i}', f'Apellido{i}', 30, '', '', f'usuario{i}@gym.com', legado,
+          'atleta', 1, 1, None, '2024-01-01') for i in range(1, cantidad + 1))
+    )
+    conexion.commit()
+    return conexion
+
+
+def login_carga_completa(conexion, email):
+    """Camino anterior: leer todos los usuarios y buscar el email en Python"""
+    usuarios = conexion.execute("SELECT * FROM usuarios").fetchall()
+    for usuario in usuarios:
+        if usuario[6].lower() == email:
+            return usuario
+    return None
+
+
+def login_por_email(conexion, email):
+    """Camino nuevo: consulta puntual sobre el índice de email"""
+    return conexion.execute("SELECT * FROM usuarios WHERE email=? LIMIT 1", (email,)).fetchone()
+
+
+def medir(funcion, conexion, emails):
+    tiempos = []
+    for email in emails:
+        inicio = time.perf_counter()
+        funcion(conexion, email)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+def medir_hasher(repeticiones):
+    hasher = PasswordHasher()
+    almacenado = hasher.cifrar('clave123')
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        hasher.verificar('clave123', almacenado)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return hasher.kdf.nombre, statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del login")
+    parser.add_argument('--usuarios', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeticiones', type=int, default=200)
+    args = parser.parse_args()
+
+    for cantidad in args.usuarios:
+        conexion = crear_tabla(cantidad)
+        emails = [f'usuario{random.randint(1, cantidad)}@gym.com' for _ in range(args.repeticiones)]
+        # La carga completa es lenta: con menos repeticiones alcanza para la mediana
+        completa = medir(login_carga_completa, conexion, emails[:20])
+        indexada = medir(login_por_email, conexion, emails)
+        conexion.close()
+
+        print(f"{cantidad} usuarios:")
+        print(f"  carga completa    p50={completa[0]:.3f} ms  p95={completa[1]:.3f} ms")
+        print(f"  consulta indexada p50={indexada[0]:.3f} ms  p95={indexada[1]:.3f} ms")
+
+    nombre, mediana = medir_hasher(min(args.repeticiones, 20))
+    print(f"Verificación {nombre} (costo fijo por login, independiente de la tabla): p50={mediana:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+# Datos sintéticos con distribuciones parecidas a las de un gimnasio real
+#
+#   python -m benchmarks.datos_sinteticos --atletas 10000 --sqlite datos.db
+#
+# Llena una base vacía (la de BACKEND_CONFIG) con usuarios, atletas, coaches,
+# asignaciones, pagos, egresos y rutinas. Con la misma semilla genera siempre
+# los mismos datos, para que los benchmarks sean comparables entre corridas.
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from controllers.password_hasher import PasswordHasher
+from models.database import Database, BACKEND_CONFIG
+from models.migraciones import Migrador
+from models.resumen_financiero_model import ResumenFinancieroModel
+from models.usuario_model import directorio
+
+
+# Contraseña de todos los usuarios generados (cifrada una sola vez)
+CONTRASEÑA = 'clave123'
+
+# (nombre, precio, duración en días, peso en la elección)
+PLANES = [
+    ('Mensual', Decimal('30.00'), 30, 60),
+    ('Trimestral', Decimal('80.00'), 90, 25),
+    ('Semestral', Decimal('150.00'), 180, 10),
+    ('Anual', Decimal('280.00'), 365, 5),
+]
+METODOS_PAGO = (('efectivo', 'transferencia', 'tarjeta', 'pago_movil'), (45, 30, 20, 5))
+TIPOS_EGRESO = (('servicios', 'mantenimiento', 'salarios', 'equipos', 'otros'), (35, 20, 25, 10, 10))
+ESPECIALIDADES = ('fuerza', 'crossfit', 'funcional', 'cardio', 'yoga', 'halterofilia')
+NIVELES = ('principiante', 'intermedio', 'avanzado')
+
+DIAS_HISTORIA = 730     # inscripciones repartidas en los últimos dos años
+ATLETAS_POR_COACH = 40
+PROB_ABANDONO = 0.12    # probabilidad de no renovar en cada vencimiento
+TAMAÑO_LOTE = 5000
+
+
+def _insertar(db, tabla, columnas, filas):
+    """INSERT por lotes de TAMAÑO_LOTE filas, cada lote en su transacción"""
+    consulta = (f"INSERT INTO `{tabla}` ({', '.join(f'`{c}`' for c in columnas)}) "
+                f"VALUES ({', '.join(['%s'] * len(columnas))})")
+    for inicio in range(0, len(filas), TAMAÑO_LOTE):
+        with db.transaccion():
+            with db.cursor() as cursor:
+                cursor.executemany(consulta, filas[inicio:inicio + TAMAÑO_LOTE])
+
+
+def generar(atletas, semilla=42, hoy=None):
+    """
+    Genera `atletas` atletas y todo lo que cuelga de ellos en la base actual, que
+    debe estar vacía (se aplican las migraciones si faltan). Devuelve un dict con
+    la cantidad de filas por tabla y datos útiles para los escenarios (emails,
+    ids de coaches, fecha de referencia).
+    """
+    azar = random.Random(semilla)
+    hoy = hoy or date.today()
+    db = Database()
+
+    if Migrador().migrar() is None:
+        raise RuntimeError("No se pudo crear el esquema")
+    with db.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM `usuarios`")
+        if cursor.fetchone()[0]:
+            raise RuntimeError("La base no está vacía: los datos sintéticos necesitan una base nueva")
+
+    hash_contraseña = PasswordHasher().cifrar(CONTRASEÑA)
+    cantidad_coaches = max(1, atletas // ATLETAS_POR_COACH)
+    cantidad_secretarias = max(2, atletas // 2000)
+
+    # ---- usuarios: admin, secretarias, coaches y atletas, con ids consecutivos
+    usuarios = [(1, 'Admin', 'Principal', 40, '', '', 'admin@gym.com', hash_contraseña, 'admin_principal', 1, None)]
+    for i in range(cantidad_secretarias):
+        usuarios.append((len(usuarios) + 1, f'Secretaria{i}', 'Gym', 30, '', '', f'secretaria{i}@gym.com',
+                         hash_contraseña, 'secretaria', 1, 1))
+    ids_secretarias = [u[0] for u in usuarios[1:]]
+
+    primer_coach = len(usuarios) + 1
+    for i in range(cantidad_coaches):
+        usuarios.append((primer_coach + i, f'Coach{i}', 'Gym', azar.randint(22, 50), '', '', f'coach{i}@gym.com',
+                         hash_contraseña, 'coach', 1, 1))
+
+    primer_atleta = len(usuarios) + 1
+    for i in range(atletas):
+        usuarios.append((primer_atleta + i, f'Atleta{i}', f'Apellido{i % 500}', azar.randint(16, 65),
+                         f'Calle {azar.randint(1, 200)}', f'0414{azar.randint(1000000, 9999999)}',
+                         f'atleta{i}@gym.com', hash_contraseña, 'atleta', int(azar.random() > 0.03),
+                         azar.choice(ids_secretarias)))
+
+    _insertar(db, 'usuarios', ('id', 'nombre', 'apellido', 'edad', 'direccion', 'telefono', 'email',
+                               'contraseña', 'rol', 'estado_activo', 'creado_por'), usuarios)
+
+    # ---- planes y coaches
+    _insertar(db, 'planes', ('id_plan', 'nombre_plan', 'descripcion', 'precio', 'duracion_dias', 'estado_activo'),
+              [(i, nombre, f'Plan {nombre.lower()}', precio, dias, 1)
+               for i, (nombre, precio, dias, _) in enumerate(PLANES, start=1)])
+
+    coaches = [(i, primer_coach + i - 1, ', '.join(azar.sample(ESPECIALIDADES, azar.randint(1, 3))),
+                'Lunes a viernes', hoy - timedelta(days=azar.randint(30, 2000)), Decimal(azar.randint(300, 900)))
+               for i in range(1, cantidad_coaches + 1)]
+    _insertar(db, 'coaches', ('id_coach', 'id_usuario', 'especialidades', 'horario_disponible',
+                              'fecha_contratacion', 'salario'), coaches)
+
+    # Popularidad desigual: unos pocos coaches concentran muchos atletas
+    popularidad = [azar.paretovariate(1.5) for _ in coaches]
+
+    # ---- atletas, asignaciones e ingresos
+    filas_atletas = []
+    asignaciones = []
+    ingresos = []
+    pesos_planes = [plan[3] for plan in PLANES]
+    for i in range(atletas):
+        id_atleta = i + 1
+        id_usuario = primer_atleta + i
+        id_plan = azar.choices(range(1, len(PLANES) + 1), pesos_planes)[0]
+        _, precio, duracion, _ = PLANES[id_plan - 1]
+        inscripcion = hoy - timedelta(days=azar.randint(0, DIAS_HISTORIA))
+        procesado_por = azar.choice(ids_secretarias)
+
+        # Inscripción (ligada al usuario, como en registrar_atleta_completo) y
+        # renovaciones (ligadas al atleta, como en renovar_membresia) hasta que abandona
+        vencimiento = inscripcion + timedelta(days=duracion)
+        ingresos.append((id_usuario, id_plan, precio, 'inscripcion', azar.choices(*METODOS_PAGO)[0],
+                         'Pago inicial de membresía', inscripcion, None, vencimiento, procesado_por))
+        while vencimiento <= hoy and azar.random() > PROB_ABANDONO:
+            fecha_pago = vencimiento + timedelta(days=min(int(azar.expovariate(0.3)), 20))
+            nuevo = vencimiento + timedelta(days=duracion)
+            ingresos.append((id_atleta, id_plan, precio, 'renovacion', azar.choices(*METODOS_PAGO)[0],
+                             'Renovación de membresía', min(fecha_pago, hoy), vencimiento, nuevo,
+                             azar.choice(ids_secretarias)))
+            vencimiento = nuevo
+        if azar.random() < 0.05:
+            ingresos.append((id_atleta, None, Decimal(azar.choice((5, 10, 15, 25))), 'servicio_extra',
+                             azar.choices(*METODOS_PAGO)[0], 'Servicio extra',
+                             inscripcion + timedelta(days=azar.randint(0, max(0, (hoy - inscripcion).days))),
+                             None, None, procesado_por))
+
+        if azar.random() < 0.03:
+            estado = 'suspendido'
+        else:
+            estado = 'solvente' if vencimiento >= hoy else 'vencido'
+
+        id_coach = None
+        if azar.random() < 0.7:
+            id_coach = azar.choices(range(1, cantidad_coaches + 1), popularidad)[0]
+            if azar.random() < 0.2:
+                # Un coach anterior ya finalizado
+                anterior = azar.randint(1, cantidad_coaches)
+                fin = inscripcion + timedelta(days=azar.randint(0, max(0, (hoy - inscripcion).days)))
+                asignaciones.append((anterior, id_atleta, inscripcion, fin, 0, 'Reasignado'))
+                asignaciones.append((id_coach, id_atleta, fin, None, 1, ''))
+            else:
+                asignaciones.append((id_coach, id_atleta, inscripcion, None, 1, ''))
+
+        filas_atletas.append((id_atleta, id_usuario, f'V{10000000 + i}', Decimal(azar.randint(450, 1200)) / 10,
+                              hoy - timedelta(days=365 * azar.randint(16, 65) + azar.randint(0, 364)),
+                              inscripcion, vencimiento, id_plan, id_coach, 'Mejorar condición física', '', estado))
+
+    _insertar(db, 'atletas', ('id_atleta', 'id_usuario', 'cedula', 'peso', 'fecha_nacimiento', 'fecha_inscripcion',
+                              'fecha_vencimiento', 'id_plan', 'id_coach', 'meta_largo_plazo',
+                              'valoracion_especiales', 'estado_solvencia'), filas_atletas)
+    _insertar(db, 'asignaciones_coach_atleta', ('id_coach', 'id_atleta', 'fecha_asignacion', 'fecha_fin',
+                                                'estado_activo', 'notas'), asignaciones)
+    _insertar(db, 'ingresos', ('id_atleta', 'id_plan', 'monto', 'tipo_pago', 'metodo_pago', 'descripcion',
+                               'fecha_pago', 'fecha_vencimiento_anterior', 'fecha_vencimiento_nueva',
+                               'procesado_por'), ingresos)
+
+    # ---- egresos: unos pocos por día a lo largo de la historia
+    egresos = [(Decimal(azar.randint(1000, 80000)) / 100, azar.choices(*TIPOS_EGRESO)[0], 'Gasto operativo',
+                f'Proveedor {azar.randint(1, 50)}', azar.choices(*METODOS_PAGO)[0],
+                hoy - timedelta(days=azar.randint(0, DIAS_HISTORIA)), azar.choice(ids_secretarias), '')
+               for _ in range(max(10, atletas // 10))]
+    _insertar(db, 'egresos', ('monto', 'tipo_egreso', 'descripcion', 'beneficiario', 'metodo_pago',
+                              'fecha_egreso', 'registrado_por', 'comprobante'), egresos)
+
+    # ---- rutinas con sus ejercicios
+    cantidad_ejercicios = 60
+    _insertar(db, 'ejercicios', ('id_ejercicio', 'nombre_ejercicio', 'tipo_ejercicio', 'descripcion', 'instrucciones'),
+              [(i, f'Ejercicio {i}', azar.choice(ESPECIALIDADES), '', '') for i in range(1, cantidad_ejercicios + 1)])
+    cantidad_rutinas = max(5, atletas // 100)
+    _insertar(db, 'rutinas', ('id_rutina', 'nombre_rutina', 'nivel', 'descripcion', 'creado_por'),
+              [(i, f'Rutina {i}', azar.choice(NIVELES), '', primer_coach + azar.randrange(cantidad_coaches))
+               for i in range(1, cantidad_rutinas + 1)])
+    rutina_ejercicios = []
+    for id_rutina in range(1, cantidad_rutinas + 1):
+        for orden, id_ejercicio in enumerate(azar.sample(range(1, cantidad_ejercicios + 1), azar.randint(4, 10)), 1):
+            rutina_ejercicios.append((id_rutina, id_ejercicio, azar.choice(NIVELES),
+                                      azar.randint(3, 5), azar.randint(8, 15), orden))
+    _insertar(db, 'rutina_ejercicios', ('id_rutina', 'id_ejercicio', 'nivel', 'series', 'rondas', 'orden_ejercicio'),
+              rutina_ejercicios)
+
+    # El resumen diario se crea y se llena una vez al final en lugar de fila por fila
+    ResumenFinancieroModel().asegurar_tabla()
+    directorio.invalidar()
+
+    return {
+        'filas': {
+            'usuarios': len(usuarios),
+            'atletas': len(filas_atletas),
+            'coaches': len(coaches),
+            'asignaciones_coach_atleta': len(asignaciones),
+            'ingresos': len(ingresos),
+            'egresos': len(egresos),
+            'rutinas': cantidad_rutinas,
+            'rutina_ejercicios': len(rutina_ejercicios)
+        },
+        'hoy': hoy,
+        'ids_secretarias': ids_secretarias,
+        'ids_coaches': [coach[0] for coach in coaches],
+        'emails_atletas': [f'atleta{i}@gym.com' for i in range(atletas)]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos en una base SQLite nueva")
+    parser.add_argument('--atletas', type=int, default=10000)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--sqlite', metavar='ARCHIVO', required=True, help="archivo SQLite a crear")
+    args = parser.parse_args()
+
+    BACKEND_CONFIG.update(motor='sqlite', ruta_sqlite=args.sqlite)
+    inicio = time.perf_counter()
+    datos = generar(args.atletas, args.semilla)
+    print(f"Generado en {time.perf_counter() - inicio:.1f} s:")
+    for tabla, cantidad in datos['filas'].items():
+        print(f"  {tabla:27} {cantidad:>10,}")
+
+
+if __name__ == '__main__':
+    main()
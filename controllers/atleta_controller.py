@@ -5,8 +5,11 @@ from controllers.user_controller import UserController
 from controllers.finance_controller import FinanceController
 from models.coach_model import CoachModel
 from datetime import datetime, date, timedelta
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 
 class AtletaController:
     def __init__(self):
@@ -23,7 +26,7 @@ class AtletaController:
         Orquesta el proceso completo de registrar un atleta, asegurando la creación de un usuario.
         """
         try:
-            print(f"--- DEBUG: Verificando permisos para el ID de usuario: {registrado_por_id} ---")
+            logger.debug("Verificando permisos para el ID de usuario: %s", registrado_por_id)
             # 1. Validar permisos del operador
             if not self._puede_gestionar_atletas(registrado_por_id):
                 return {"success": False, "message": "No tienes permisos para registrar atletas"}
@@ -33,64 +36,70 @@ class AtletaController:
             if not validacion["success"]:
                 return validacion
 
-            # 3. Crear la cuenta de usuario asociada
-            datos_para_usuario = {
-                'nombre': datos_atleta['nombre'],
-                'apellido': datos_atleta['apellido'],
-                'email': datos_atleta.get('email') or f"{datos_atleta['cedula']}@sinemail.com",
-                'contraseña': self.user_controller.generar_password_seguro(),
-                'rol': 'atleta',
-                'estado_activo': True
-            }
-            resultado_usuario = self.user_controller.crear_usuario(datos_para_usuario, registrado_por_id)
-            if not resultado_usuario.get('success'):
-                return {"success": False, "message": f"Error al crear cuenta de usuario: {resultado_usuario.get('message', 'Error desconocido.')}"}
-
-            id_nuevo_usuario = resultado_usuario['usuario_id']
-            
-            # 4. Crear el perfil de atleta usando el ID del nuevo usuario
-            # SIN CAMBIOS AQUÍ: La lógica ahora funciona porque el modelo devuelve un ID o None.
-            atleta_id = self.atleta_model.insert_atleta(
-                id_usuario=id_nuevo_usuario,
-                cedula=datos_atleta['cedula'],
-                peso=datos_atleta.get('peso'),
-                fecha_nacimiento=datos_atleta.get('fecha_nacimiento'),
-                id_plan=datos_atleta['id_plan'],
-                id_coach=datos_atleta.get('id_coach'),
-                meta_largo_plazo=datos_atleta.get('meta_largo_plazo', ''),
-                valoracion_especiales=datos_atleta.get('valoracion_especiales', '')
-            )
-            
-            if not atleta_id:
-                # Si falla, se elimina el usuario creado para no dejar datos huérfanos
-                self.user_controller.eliminar_usuario(id_nuevo_usuario, registrado_por_id)
-                return {"success": False, "message": "Error al crear el perfil de atleta en la base de datos."}
+            # El DDL de MySQL confirma implícitamente: se verifica el resumen antes de abrir la transacción
+            self.finance_controller.ingreso_model.resumen.disponible()
+
+            # 3 a 5 en una sola transacción: usuario, atleta e ingreso se guardan juntos o ninguno
+            with self.atleta_model.db.transaccion() as transaccion:
+                # 3. Crear la cuenta de usuario asociada
+                datos_para_usuario = {
+                    'nombre': datos_atleta['nombre'],
+                    'apellido': datos_atleta['apellido'],
+                    'email': datos_atleta.get('email') or f"{datos_atleta['cedula']}@sinemail.com",
+                    'contraseña': self.user_controller.generar_password_seguro(),
+                    'rol': 'atleta',
+                    'estado_activo': True
+                }
+                resultado_usuario = self.user_controller.crear_usuario(datos_para_usuario, registrado_por_id)
+                if not resultado_usuario.get('success'):
+                    transaccion.cancelar()
+                    return {"success": False, "message": f"Error al crear cuenta de usuario: {resultado_usuario.get('message', 'Error desconocido.')}"}
+
+                id_nuevo_usuario = resultado_usuario['usuario_id']
+            
+                # 4. Crear el perfil de atleta usando el ID del nuevo usuario
+                # SIN CAMBIOS AQUÍ: La lógica ahora funciona porque el modelo devuelve un ID o None.
+                atleta_id = self.atleta_model.insert_atleta(
+                    id_usuario=id_nuevo_usuario,
+                    cedula=datos_atleta['cedula'],
+                    peso=datos_atleta.get('peso'),
+                    fecha_nacimiento=datos_atleta.get('fecha_nacimiento'),
+                    id_plan=datos_atleta['id_plan'],
+                    id_coach=datos_atleta.get('id_coach'),
+                    meta_largo_plazo=datos_atleta.get('meta_largo_plazo', ''),
+                    valoracion_especiales=datos_atleta.get('valoracion_especiales', '')
+                )
             
-            # 5. Procesar pago automático de inscripción
-            pago_result = self.finance_controller.procesar_pago_inscripcion(
-                id_atleta=id_nuevo_usuario, # El pago se vincula al ID de usuario
-                id_plan=datos_atleta['id_plan'],
-                metodo_pago=metodo_pago,
-                procesado_por_id=registrado_por_id,
-                descripcion="Pago inicial de membresía"
-            )
+                if not atleta_id:
+                    # Al cancelar se revierte también el usuario: no quedan datos huérfanos
+                    transaccion.cancelar()
+                    return {"success": False, "message": "Error al crear el perfil de atleta en la base de datos."}
+            
+                # 5. Procesar pago automático de inscripción
+                pago_result = self.finance_controller.procesar_pago_inscripcion(
+                    id_atleta=id_nuevo_usuario, # El pago se vincula al ID de usuario
+                    id_plan=datos_atleta['id_plan'],
+                    metodo_pago=metodo_pago,
+                    procesado_por_id=registrado_por_id,
+                    descripcion="Pago inicial de membresía"
+                )
                 
-            if not pago_result.get("success"):
-                return {"success": True, 
-                        "message": f"Atleta registrado (ID: {atleta_id}), pero el pago falló: {pago_result.get('message', 'N/A')}. Procesar manualmente."}
+                if not pago_result.get("success"):
+                    transaccion.cancelar()
+                    return {"success": False,
+                            "message": f"Atleta no registrado: el pago de inscripción falló ({pago_result.get('message', 'N/A')})."}
             
-            # 6. Actualizar la fecha de vencimiento (si tienes un método para ello)
-            # self.atleta_model.actualizar_vencimiento_atleta(atleta_id, pago_result['fecha_vencimiento'])
+                # 6. Actualizar la fecha de vencimiento (si tienes un método para ello)
+                # self.atleta_model.actualizar_vencimiento_atleta(atleta_id, pago_result['fecha_vencimiento'])
 
-            return {
-                "success": True,
-                "message": "Atleta registrado y pago procesado exitosamente.",
-                "atleta_id": atleta_id
-            }
+                return {
+                    "success": True,
+                    "message": "Atleta registrado y pago procesado exitosamente.",
+                    "atleta_id": atleta_id
+                }
                 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al registrar atleta: %s", e)
             return {"success": False, "message": f"Error interno del controlador: {str(e)}"}
     
     # SOLUCIÓN: MÉTODO DE ELIMINACIÓN CORREGIDO Y COMPLETO
@@ -132,6 +141,18 @@ class AtletaController:
     # TAMBIÉN AGREGA ESTE MÉTODO DE VALIDACIÓN SIMPLIFICADO:
     def _validar_datos_atleta_basicos(self, datos_atleta):
         """Valida los datos básicos necesarios para crear un atleta"""
+        validacion = self._validar_campos_atleta(datos_atleta)
+        if not validacion["success"]:
+            return validacion
+        
+        # Validar que la cédula sea única
+        if self._cedula_existe(datos_atleta['cedula']):
+            return {"success": False, "message": "La cédula ya está registrada"}
+        
+        return {"success": True}
+    
+    def _validar_campos_atleta(self, datos_atleta):
+        """Reglas de _validar_datos_atleta_basicos que no consultan la BD (también las usa la importación)"""
         # Campos requeridos
         campos_requeridos = ['nombre', 'apellido', 'cedula', 'id_plan']
         
@@ -139,10 +160,6 @@ class AtletaController:
             if not datos_atleta.get(campo):
                 return {"success": False, "message": f"Campo requerido: {campo}"}
         
-        # Validar que la cédula sea única
-        if self._cedula_existe(datos_atleta['cedula']):
-            return {"success": False, "message": "La cédula ya está registrada"}
-        
         # Validar email si se proporciona
         if datos_atleta.get('email') and '@' not in datos_atleta['email']:
             return {"success": False, "message": "Email inválido"}
@@ -199,7 +216,7 @@ class AtletaController:
                     return {"success": False, "message": "No se puede determinar fecha de vencimiento"}
                     
             except Exception as e:
-                print(f"Error calculando fecha vencimiento: {e}")
+                logger.error("Error calculando fecha vencimiento: %s", e)
                 return {"success": False, "message": "Error al calcular fecha de vencimiento"}
             
             # Asegurar que id_plan sea entero
@@ -207,9 +224,7 @@ class AtletaController:
             if not id_plan:
                 return {"success": False, "message": "El atleta no tiene un plan asignado"}
             
-            print(f"🔍 DATOS CORREGIDOS:")
-            print(f"   id_plan: {id_plan} (tipo: {type(id_plan)})")
-            print(f"   fecha_vencimiento_actual: {fecha_vencimiento_actual} (tipo: {type(fecha_vencimiento_actual)})")
+            logger.debug("Renovación con id_plan %r y fecha_vencimiento_actual %r", id_plan, fecha_vencimiento_actual)
             
             # Procesar renovación
             renovacion_result = self.finance_controller.procesar_renovacion_membresia(
@@ -254,6 +269,99 @@ class AtletaController:
         except Exception as e:
             return {"success": False, "message": f"Error interno: {str(e)}"}
 
+    def renovar_membresias_lote(self, atleta_ids, metodo_pago, procesado_por_id, descripcion=""):
+        """
+        Renueva varias membresías de una vez (p. ej. a inicio de mes). Valida permisos
+        una sola vez, lee atletas y planes en una consulta y guarda todos los ingresos y
+        vencimientos en una sola transacción. Devuelve un resultado por atleta.
+        """
+        try:
+            if not self._puede_gestionar_atletas(procesado_por_id):
+                return {"success": False, "message": "No tienes permisos para renovar membresías"}
+
+            if not metodo_pago:
+                return {"success": False, "message": "El método de pago es requerido"}
+
+            resultados = {}
+            ids_validos = []
+            for atleta_id in atleta_ids:
+                try:
+                    atleta_id = int(atleta_id)
+                except (ValueError, TypeError):
+                    resultados[atleta_id] = {"success": False, "message": "ID de atleta inválido"}
+                    continue
+                if atleta_id not in resultados:
+                    resultados[atleta_id] = None
+                    ids_validos.append(atleta_id)
+
+            filas = self.atleta_model.get_datos_renovacion(ids_validos)
+            if filas is None:
+                return {"success": False, "message": "Error al consultar los atletas"}
+            datos_por_atleta = {fila[0]: fila for fila in filas}
+
+            fecha_pago = datetime.now().date()
+            renovaciones = []
+            for atleta_id in ids_validos:
+                fila = datos_por_atleta.get(atleta_id)
+                if fila is None:
+                    resultados[atleta_id] = {"success": False, "message": "Atleta no encontrado"}
+                    continue
+
+                _, id_plan, fecha_vencimiento_actual, precio, duracion_dias = fila
+                if not id_plan or precio is None or duracion_dias is None:
+                    resultados[atleta_id] = {"success": False, "message": "El atleta no tiene un plan válido asignado"}
+                    continue
+
+                if isinstance(fecha_vencimiento_actual, str):
+                    fecha_vencimiento_actual = datetime.strptime(fecha_vencimiento_actual[:10], '%Y-%m-%d').date()
+                elif isinstance(fecha_vencimiento_actual, datetime):
+                    fecha_vencimiento_actual = fecha_vencimiento_actual.date()
+
+                # Igual que una renovación individual: se extiende desde hoy si ya venció
+                if fecha_vencimiento_actual and fecha_vencimiento_actual >= fecha_pago:
+                    fecha_base = fecha_vencimiento_actual
+                else:
+                    fecha_base = fecha_pago
+
+                renovaciones.append({
+                    'id_atleta': atleta_id,
+                    'id_plan': id_plan,
+                    'monto': precio,
+                    'metodo_pago': metodo_pago,
+                    'descripcion': descripcion if descripcion else 'Renovación de membresía',
+                    'fecha_pago': fecha_pago,
+                    'fecha_vencimiento_anterior': fecha_vencimiento_actual,
+                    'fecha_vencimiento_nueva': fecha_base + timedelta(days=duracion_dias),
+                    'procesado_por': procesado_por_id
+                })
+
+            guardado = self.finance_controller.ingreso_model.insert_renovaciones(renovaciones)
+            for renovacion in renovaciones:
+                if guardado:
+                    resultados[renovacion['id_atleta']] = {
+                        "success": True,
+                        "message": "Membresía renovada exitosamente",
+                        "fecha_vencimiento_anterior": renovacion['fecha_vencimiento_anterior'],
+                        "fecha_vencimiento_nueva": renovacion['fecha_vencimiento_nueva'],
+                        "monto": float(renovacion['monto'])
+                    }
+                else:
+                    resultados[renovacion['id_atleta']] = {"success": False, "message": "Error al guardar la renovación"}
+
+            detalle = [dict(resultado, atleta_id=atleta_id) for atleta_id, resultado in resultados.items()]
+            renovadas = sum(1 for resultado in detalle if resultado["success"])
+
+            return {
+                "success": guardado,
+                "message": f"{renovadas} membresías renovadas, {len(detalle) - renovadas} con errores",
+                "renovadas": renovadas,
+                "fallidas": len(detalle) - renovadas,
+                "resultados": detalle
+            }
+
+        except Exception as e:
+            return {"success": False, "message": f"Error interno: {str(e)}"}
+
     def cambiar_plan_atleta(self, atleta_id, nuevo_plan_id, metodo_pago, procesado_por_id):
         """Cambia el plan de un atleta y procesa el pago correspondiente"""
         try:
@@ -304,35 +412,27 @@ class AtletaController:
     # ==================== CONSULTAS Y FILTROS ====================
     
     def obtener_todos_atletas(self):
-        """Obtiene todos los atletas con información del usuario"""
+        """Obtiene todos los atletas con información del usuario, plan y coach"""
         try:
-            atletas = self.atleta_model.read_atletas()
-            usuarios = self.usuario_model.read_usuarios()
-            
-            # Combinar datos de atletas con usuarios
-            atletas_completos = []
-            for atleta in atletas:
-                usuario = next((u for u in usuarios if u[0] == atleta[1]), None)  # id_usuario
-                if usuario:
-                    atleta_completo = {
-                        'atleta_data': atleta,
-                        'usuario_data': usuario
-                    }
-                    atletas_completos.append(atleta_completo)
-            
+            atletas_completos = self.atleta_model.get_atletas_completos()
             return {"success": True, "atletas": atletas_completos}
         except Exception as e:
             return {"success": False, "message": f"Error al obtener atletas: {str(e)}"}
     
+    def obtener_atletas_completos_por_coach(self, coach_id):
+        """Obtiene los atletas de un coach con información del usuario, plan y coach"""
+        try:
+            atletas_completos = self.atleta_model.get_atletas_completos(id_coach=coach_id)
+            return {"success": True, "atletas": atletas_completos}
+        except Exception as e:
+            return {"success": False, "message": f"Error al obtener atletas del coach: {str(e)}"}
+    
     def obtener_atleta_por_id(self, atleta_id):
         """Obtiene un atleta específico por ID"""
         try:
-            # Esta implementación es ineficiente. Es mejor consultar por ID en la BD.
-            # Por ahora, se mantiene la lógica original para no introducir cambios mayores.
-            atletas = self.atleta_model.read_atletas()
-            for atleta in atletas:
-                if atleta[0] == atleta_id:  # id_atleta en posición 0
-                    return {"success": True, "atleta": atleta}
+            atleta = self.atleta_model.get_atleta_by_id(atleta_id)
+            if atleta:
+                return {"success": True, "atleta": atleta}
             return {"success": False, "message": "Atleta no encontrado"}
         except Exception as e:
             return {"success": False, "message": f"Error al obtener atleta: {str(e)}"}
@@ -340,8 +440,7 @@ class AtletaController:
     def obtener_atletas_por_coach(self, coach_id):
         """Obtiene atletas asignados a un coach específico"""
         try:
-            atletas = self.atleta_model.read_atletas()
-            atletas_coach = [a for a in atletas if a[6] == coach_id]  
+            atletas_coach = self.atleta_model.get_atletas_by_coach(coach_id)
             return {"success": True, "atletas": atletas_coach}
         except Exception as e:
             return {"success": False, "message": f"Error al obtener atletas del coach: {str(e)}"}
@@ -349,8 +448,7 @@ class AtletaController:
     def obtener_atletas_por_estado_solvencia(self, estado):
         """Obtiene atletas filtrados por estado de solvencia"""
         try:
-            atletas = self.atleta_model.read_atletas()
-            atletas_filtrados = [a for a in atletas if a[9] == estado]  # estado_solvencia en posición 9
+            atletas_filtrados = self.atleta_model.get_atletas_by_estado(estado)
             return {"success": True, "atletas": atletas_filtrados}
         except Exception as e:
             return {"success": False, "message": f"Error al filtrar atletas: {str(e)}"}
@@ -360,20 +458,44 @@ class AtletaController:
         try:
             from datetime import timedelta
             fecha_limite = date.today() + timedelta(days=dias_adelanto)
-            atletas = self.atleta_model.read_atletas()
-            
-            atletas_proximos = []
-            for atleta in atletas:
-                fecha_vencimiento_str = atleta[7]  # fecha_vencimiento en posición 7
-                if fecha_vencimiento_str:
-                    fecha_vencimiento = datetime.strptime(str(fecha_vencimiento_str), '%Y-%m-%d').date()
-                    if fecha_vencimiento <= fecha_limite and atleta[9] == 'solvente':
-                        atletas_proximos.append(atleta)
+            # Filtra y ordena la BD sobre el índice (estado_solvencia, fecha_vencimiento)
+            atletas_proximos = self.atleta_model.get_atletas_proximos_vencer(fecha_limite)
             
             return {"success": True, "atletas": atletas_proximos}
         except Exception as e:
             return {"success": False, "message": f"Error al obtener atletas próximos a vencer: {str(e)}"}
     
+    def actualizar_vencidos(self):
+        """
+        Marca como vencidos a los atletas solventes cuya membresía ya venció.
+        Los solventes forman una cola por fecha de vencimiento (el índice
+        (estado_solvencia, fecha_vencimiento)): primero se mira su cabeza y el UPDATE
+        solo corre si ya hay alguno vencido, y entonces solo toca esas filas.
+        `proximo_vencimiento` es la fecha de la nueva cabeza, para programar el
+        barrido siguiente (None si no quedan solventes).
+        """
+        try:
+            hoy = date.today()
+            cabeza = self.atleta_model.get_cabeza_vencimientos()
+            if cabeza is None:
+                return {"success": False, "message": "Error al leer la cola de vencimientos"}
+            
+            actualizados = 0
+            if cabeza and self._como_fecha(cabeza[0][1]) < hoy:
+                actualizados = self.atleta_model.marcar_vencidos(hoy)
+                if actualizados is None:
+                    return {"success": False, "message": "Error al actualizar membresías vencidas"}
+                cabeza = self.atleta_model.get_cabeza_vencimientos() or []
+            
+            return {
+                "success": True,
+                "actualizados": actualizados,
+                "proximo_vencimiento": self._como_fecha(cabeza[0][1]) if cabeza else None,
+                "message": f"{actualizados} membresías pasaron a vencido"
+            }
+        except Exception as e:
+            return {"success": False, "message": f"Error al actualizar membresías vencidas: {str(e)}"}
+    
     # ==================== ASIGNACIÓN DE COACHES ====================
     
     def asignar_coach(self, atleta_id, coach_id, asignado_por_id):
@@ -447,7 +569,7 @@ class AtletaController:
             
         except Exception as e:
             # En caso de un error inesperado, lo veremos en la consola.
-            print(f"Error inesperado al verificar permisos: {e}")
+            logger.error("Error inesperado al verificar permisos: %s", e)
             return False
     
     def _validar_datos_completos(self, datos_atleta, datos_usuario):
@@ -457,8 +579,7 @@ class AtletaController:
     def _coach_existe(self, coach_id):
         """Verifica si el coach existe en la tabla coaches"""
         try:
-            coaches = self.coach_model.read_coaches()
-            return any(coach[0] == coach_id for coach in coaches)  # id_coach en posición 0
+            return self.coach_model.get_coach_by_id(coach_id) is not None
         except Exception:
             return False
 
@@ -474,22 +595,26 @@ class AtletaController:
     def _cedula_existe(self, cedula):
         """Verifica si la cédula ya está registrada"""
         try:
-            atletas = self.atleta_model.read_atletas()
-            return any(atleta[2] == cedula for atleta in atletas)
+            return self.atleta_model.get_atleta_by_cedula(cedula) is not None
         except Exception:
             return False
  
     def _obtener_atleta_id_por_usuario(self, usuario_id):
         """Obtiene el ID del atleta por ID de usuario"""
         try:
-            atletas = self.atleta_model.read_atletas()
-            for atleta in atletas:
-                if atleta[1] == usuario_id:  # id_usuario en posición 1
-                    return atleta[0]  # id_atleta en posición 0
-            return None
+            atleta = self.atleta_model.get_atleta_by_usuario(usuario_id)
+            return atleta[0] if atleta else None  # id_atleta en posición 0
         except Exception:
             return None
     
+    def _como_fecha(self, valor):
+        """date desde lo que devuelva el motor (date, datetime o texto AAAA-MM-DD)"""
+        if isinstance(valor, str):
+            return datetime.strptime(valor[:10], '%Y-%m-%d').date()
+        if isinstance(valor, datetime):
+            return valor.date()
+        return valor
+    
     def _actualizar_estado_membresia(self, atleta_id, fecha_vencimiento, estado_solvencia, fecha_actualizacion):
         """Actualiza el estado de membresía del atleta"""
         try:
@@ -510,17 +635,17 @@ class AtletaController:
             )
             
             if resultado:
-                print(f"✅ Estado de membresía actualizado para atleta {atleta_id}")
+                logger.info("Estado de membresía actualizado para atleta %s", atleta_id)
                 return True
             else:
-                print(f"❌ Error al actualizar estado de membresía para atleta {atleta_id}")
+                logger.error("Error al actualizar estado de membresía para atleta %s", atleta_id)
                 return False
                 
         except ValueError as ve:
-            print(f"❌ Error de formato en _actualizar_estado_membresia: {ve}")
+            logger.error("Error de formato en _actualizar_estado_membresia: %s", ve)
             return False
         except Exception as e:
-            print(f"❌ Error en _actualizar_estado_membresia: {e}")
+            logger.error("Error en _actualizar_estado_membresia: %s", e)
             return False
 
     def _actualizar_plan_y_membresia(self, atleta_id, nuevo_plan_id, fecha_vencimiento, estado_solvencia, fecha_ultimo_pago):
@@ -544,7 +669,7 @@ class AtletaController:
                 # También se debería actualizar la fecha de vencimiento aquí.
                 
         except Exception as e:
-            print(f"Error al actualizar plan y membresía: {str(e)}")
+            logger.error("Error al actualizar plan y membresía: %s", e)
     
     def actualizar_perfil_atleta(self, atleta_id, datos_atleta, actualizado_por_id):
         """Actualiza el perfil del atleta (sin afectar membresía)"""
@@ -1,21 +1,24 @@
 # Controlador para autenticación y sesiones
 from controllers.user_controller import UserController
 from models.usuario_model import UsuarioModel
+from models.session_store import crear_almacen_sesiones
 import hashlib
+import logging
 import secrets
 import time
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 
 class AuthController:
     def __init__(self):
         self.user_controller = UserController()
         self.usuario_model = UsuarioModel()
-        # Almacén de sesiones en memoria (en producción usar Redis/Base de datos)
-        self.sesiones_activas = {}
         self.tiempo_expiracion = 3600  
-        self.intentos_fallidos = {}
         self.tiempo_bloqueo = 300  
+        # Sesiones e intentos fallidos (en BD o en memoria según SESSION_CONFIG)
+        self.sesiones = crear_almacen_sesiones(self.tiempo_expiracion)
     
     # ==================== SISTEMA DE LOGIN ====================
   
@@ -79,9 +82,9 @@ class AuthController:
     def cerrar_sesion(self, token_sesion):
         """Cierra la sesión del usuario"""
         try:
-            if token_sesion in self.sesiones_activas:
-                usuario_info = self.sesiones_activas[token_sesion]["usuario"]
-                del self.sesiones_activas[token_sesion]
+            sesion = self.sesiones.eliminar(token_sesion) if token_sesion else None
+            if sesion is not None:
+                usuario_info = sesion["usuario"]
                 
                 return {
                     "success": True,
@@ -96,16 +99,7 @@ class AuthController:
     def cerrar_todas_sesiones_usuario(self, user_id):
         """Cierra todas las sesiones activas de un usuario específico"""
         try:
-            sesiones_cerradas = 0
-            tokens_a_eliminar = []
-            
-            for token, sesion in self.sesiones_activas.items():
-                if sesion["usuario"]["id"] == user_id:
-                    tokens_a_eliminar.append(token)
-                    sesiones_cerradas += 1
-            
-            for token in tokens_a_eliminar:
-                del self.sesiones_activas[token]
+            sesiones_cerradas = self.sesiones.eliminar_por_usuario(user_id)
             
             return {
                 "success": True,
@@ -120,23 +114,22 @@ class AuthController:
     def validar_sesion(self, token_sesion):
         """Valida si una sesión es válida y activa"""
         try:
-            if not token_sesion or token_sesion not in self.sesiones_activas:
+            sesion = self.sesiones.obtener(token_sesion) if token_sesion else None
+            if sesion is None:
                 return {"success": False, "message": "Sesión no válida"}
             
-            sesion = self.sesiones_activas[token_sesion]
-            
             # Verificar si la sesión ha expirado
             if self._sesion_expirada(sesion):
-                del self.sesiones_activas[token_sesion]
+                self.sesiones.eliminar(token_sesion)
                 return {"success": False, "message": "Sesión expirada. Inicia sesión nuevamente"}
             
             # Verificar que el usuario siga activo
             if not self._usuario_esta_activo(sesion["usuario"]["id"]):
-                del self.sesiones_activas[token_sesion]
+                self.sesiones.eliminar(token_sesion)
                 return {"success": False, "message": "Usuario desactivado"}
             
-            # Actualizar último acceso
-            sesion["ultimo_acceso"] = time.time()
+            # Actualizar último acceso (el almacén decide si hace falta escribirlo)
+            self.sesiones.tocar(token_sesion, sesion, time.time())
             
             return {
                 "success": True,
@@ -154,11 +147,9 @@ class AuthController:
             if not self._es_administrador(admin_user_id):
                 return {"success": False, "message": "No tienes permisos para ver sesiones activas"}
             
-            # Limpiar sesiones expiradas primero
-            self._limpiar_sesiones_expiradas()
-            
+            # El almacén descarta las sesiones expiradas antes de listarlas
             sesiones_info = []
-            for token, sesion in self.sesiones_activas.items():
+            for token, sesion in self.sesiones.sesiones():
                 sesiones_info.append({
                     "token": token[:10] + "...",  # Solo mostrar parte del token por seguridad
                     "usuario": sesion["usuario"]["nombre"] + " " + sesion["usuario"]["apellido"],
@@ -186,8 +177,8 @@ class AuthController:
             if not validacion["success"]:
                 return validacion
             
-            sesion = self.sesiones_activas[token_sesion]
-            sesion["ultimo_acceso"] = time.time()
+            # validar_sesion ya renovó el último acceso
+            sesion = self.sesiones.obtener(token_sesion)
             
             return {
                 "success": True,
@@ -292,12 +283,13 @@ class AuthController:
     
     def _crear_sesion(self, token, usuario, ip_cliente):
         """Crea una nueva sesión"""
-        self.sesiones_activas[token] = {
+        ahora = time.time()
+        self.sesiones.guardar(token, {
             "usuario": usuario,
-            "inicio_sesion": time.time(),
-            "ultimo_acceso": time.time(),
+            "inicio_sesion": ahora,
+            "ultimo_acceso": ahora,
             "ip_cliente": ip_cliente
-        }
+        })
     
     def _sesion_expirada(self, sesion):
         """Verifica si una sesión ha expirado"""
@@ -312,10 +304,9 @@ class AuthController:
     def _usuario_esta_activo(self, user_id):
         """Verifica si un usuario está activo"""
         try:
-            usuarios = self.usuario_model.read_usuarios()
-            for usuario in usuarios:
-                if usuario[0] == user_id:
-                    return usuario[9]  # estado_activo en posición 9
+            usuario = self.usuario_model.get_user_by_id(user_id)
+            if usuario:
+                return usuario[9]  # estado_activo en posición 9
             return False
         except Exception:
             return False
@@ -323,10 +314,9 @@ class AuthController:
     def _es_administrador(self, user_id):
         """Verifica si un usuario es administrador"""
         try:
-            usuarios = self.usuario_model.read_usuarios()
-            for usuario in usuarios:
-                if usuario[0] == user_id:
-                    return usuario[8] == 'admin_principal'  # rol en posición 8
+            usuario = self.usuario_model.get_user_by_id(user_id)
+            if usuario:
+                return usuario[8] == 'admin_principal'  # rol en posición 8
             return False
         except Exception:
             return False
@@ -342,28 +332,21 @@ class AuthController:
         return dashboard_urls.get(rol, '/dashboard/default')
     
     def _limpiar_sesiones_expiradas(self):
-        """Limpia sesiones expiradas del almacén"""
+        """Limpia sesiones expiradas del almacén (solo recorre las vencidas)"""
         try:
-            tokens_expirados = []
-            for token, sesion in self.sesiones_activas.items():
-                if self._sesion_expirada(sesion):
-                    tokens_expirados.append(token)
-            
-            for token in tokens_expirados:
-                del self.sesiones_activas[token]
+            self.sesiones.limpiar_expiradas()
                 
         except Exception as e:
-            print(f"Error limpiando sesiones: {str(e)}")
+            logger.error("Error limpiando sesiones: %s", e)
     
     # ==================== CONTROL DE INTENTOS FALLIDOS ====================
     
     def _ip_esta_bloqueada(self, ip):
         """Verifica si una IP está bloqueada por intentos fallidos"""
-        if ip not in self.intentos_fallidos:
+        datos_ip = self.sesiones.obtener_intentos(ip)
+        if datos_ip is None:
             return False
         
-        datos_ip = self.intentos_fallidos[ip]
-        
         # Si tiene más de 5 intentos fallidos
         if datos_ip["intentos"] >= 5:
             # Y el último intento fue hace menos del tiempo de bloqueo
@@ -371,7 +354,7 @@ class AuthController:
                 return True
             else:
                 # Si ya pasó el tiempo de bloqueo, limpiar
-                del self.intentos_fallidos[ip]
+                self.sesiones.limpiar_intentos(ip)
                 return False
         
         return False
@@ -379,21 +362,18 @@ class AuthController:
     def _registrar_intento_fallido(self, ip):
         """Registra un intento fallido de login"""
         if ip:
-            if ip not in self.intentos_fallidos:
-                self.intentos_fallidos[ip] = {"intentos": 0, "ultimo_intento": 0}
-            
-            self.intentos_fallidos[ip]["intentos"] += 1
-            self.intentos_fallidos[ip]["ultimo_intento"] = time.time()
+            self.sesiones.registrar_intento(ip, time.time())
     
     def _limpiar_intentos_fallidos(self, ip):
         """Limpia los intentos fallidos de una IP tras login exitoso"""
-        if ip in self.intentos_fallidos:
-            del self.intentos_fallidos[ip]
+        if ip:
+            self.sesiones.limpiar_intentos(ip)
     
     def _tiempo_restante_bloqueo(self, ip):
         """Calcula el tiempo restante de bloqueo en minutos"""
-        if ip in self.intentos_fallidos:
-            tiempo_transcurrido = time.time() - self.intentos_fallidos[ip]["ultimo_intento"]
+        datos_ip = self.sesiones.obtener_intentos(ip)
+        if datos_ip is not None:
+            tiempo_transcurrido = time.time() - datos_ip["ultimo_intento"]
             tiempo_restante = self.tiempo_bloqueo - tiempo_transcurrido
             return max(0, int(tiempo_restante / 60))
         return 0
@@ -441,36 +421,30 @@ class AuthController:
 
     def iniciar_sesion_debug(self, email, password, ip_cliente=""):
         """MÉTODO DE DEBUG - USA ESTE TEMPORALMENTE"""
-        print(f"\n🔍 === DEBUG LOGIN AuthController ===")
-        print(f"Email recibido: '{email}'")
-        print(f"Password recibido: '{password}'")
-        print(f"IP cliente: '{ip_cliente}'")
+        logger.debug("Login de depuración: email '%s', IP '%s'", email, ip_cliente)
         
         try:
-            # BYPASS: validación directa con base de datos
-            print("🔍 Consultando directamente la base de datos...")
-            usuarios = self.usuario_model.read_usuarios()
-            print(f"🔍 Total usuarios en BD: {len(usuarios)}")
+            # BYPASS: validación directa con una consulta por email
+            logger.debug("Consultando usuario por email...")
+            usuario_email = self.usuario_model.buscar_por_email(email)
+            usuarios = [usuario_email] if usuario_email else []
+            logger.debug("Usuarios con ese email: %s", len(usuarios))
             
             for usuario in usuarios:
-                print(f"\n🔍 Verificando usuario:")
-                print(f"  ID: {usuario[0]}")
-                print(f"  Nombre: {usuario[1]} {usuario[2]}")
-                print(f"  Email BD: '{usuario[6]}'")
-                print(f"  Password BD: '{usuario[7]}'")
-                print(f"  Rol: '{usuario[8]}'")
-                print(f"  Activo: {usuario[9]}")
+                logger.debug("Verificando usuario %s (%s %s), email '%s', rol '%s', activo %s",
+                             usuario[0], usuario[1], usuario[2], usuario[6], usuario[8], usuario[9])
                 
                 # Comparación exacta
                 email_match = str(usuario[6]).strip().lower() == email.strip().lower()
-                password_match = self.user_controller._verify_password(password.strip(), usuario[7])
+                password_match = email_match and self.user_controller.verificar_password_usuario(
+                    usuario, password.strip()
+                )
 
                 
-                print(f"  Email match: {email_match}")
-                print(f"  Password match: {password_match}")
+                logger.debug("Email coincide: %s, contraseña coincide: %s", email_match, password_match)
                 
                 if email_match and password_match:
-                    print("✅ ¡CREDENCIALES VÁLIDAS! Creando sesión...")
+                    logger.debug("Credenciales válidas, creando sesión")
                     
                     # Crear datos de usuario
                     usuario_data = {
@@ -493,13 +467,11 @@ class AuthController:
                         "dashboard_url": self._obtener_dashboard_por_rol(usuario[8])
                     }
             
-            print("❌ No se encontraron credenciales válidas")
+            logger.debug("No se encontraron credenciales válidas")
             return {"success": False, "message": "Credenciales incorrectas"}
             
         except Exception as e:
-            print(f"❌ Error en debug login: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error en debug login: %s", e)
             return {"success": False, "message": f"Error interno: {str(e)}"}
 
     def iniciar_sesion(self, email, password, ip_cliente=""):
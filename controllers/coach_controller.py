@@ -1,4 +1,5 @@
 # Controlador para gestión de coaches y asignaciones
+import logging
 from models.coach_model import CoachModel
 from models.asign_coch_atlh_model import AsignacionModel
 from models.usuario_model import UsuarioModel
@@ -7,6 +8,8 @@ from controllers.user_controller import UserController
 from datetime import datetime, date
 from decimal import Decimal
 
+logger = logging.getLogger(__name__)
+
 
 class CoachController:
     def __init__(self):
@@ -73,25 +76,26 @@ class CoachController:
             return {"success": False, "message": f"Error interno: {str(e)}"}
     
     def obtener_todos_coaches(self):
-        """Obtiene todos los coaches con información del usuario"""
+        """Obtiene todos los coaches activos con información del usuario (un solo JOIN)"""
         try:
-            coaches = self.coach_model.read_coaches()
-            usuarios = self.usuario_model.read_usuarios()
+            coaches = self.coach_model.get_coaches_con_usuario()
+            if coaches is None:
+                return {"success": False, "message": "Error al leer los coaches de la base de datos"}
             
             coaches_completos = []
-            for coach in coaches:
-                usuario = next((u for u in usuarios if u[0] == coach[1]), None)  # id_usuario
-                if usuario and usuario[9]:  # usuario activo
-                    coach_completo = {
-                        'coach_data': coach,
-                        'usuario_data': usuario,
-                        'nombre_completo': f"{usuario[1]} {usuario[2]}",  # nombre + apellido
-                        'email': usuario[6],
-                        'especialidades': coach[2],
-                        'salario': float(coach[5]) if coach[5] else 0,
-                        'fecha_contratacion': coach[4]
-                    }
-                    coaches_completos.append(coach_completo)
+            for fila in coaches:
+                coach = fila['coach_data']
+                usuario = fila['usuario_data']
+                coach_completo = {
+                    'coach_data': coach,
+                    'usuario_data': usuario,
+                    'nombre_completo': f"{usuario[1]} {usuario[2]}",  # nombre + apellido
+                    'email': usuario[6],
+                    'especialidades': coach[2],
+                    'salario': float(coach[5]) if coach[5] else 0,
+                    'fecha_contratacion': coach[4]
+                }
+                coaches_completos.append(coach_completo)
             
             return {"success": True, "coaches": coaches_completos}
         except Exception as e:
@@ -100,10 +104,9 @@ class CoachController:
     def obtener_coach_por_id(self, coach_id):
         """Obtiene un coach específico por ID"""
         try:
-            coaches = self.coach_model.read_coaches()
-            for coach in coaches:
-                if coach[0] == coach_id:  # id_coach en posición 0
-                    return {"success": True, "coach": coach}
+            coach = self.coach_model.get_coach_by_id(coach_id)
+            if coach:
+                return {"success": True, "coach": coach}
             return {"success": False, "message": "Coach no encontrado"}
         except Exception as e:
             return {"success": False, "message": f"Error al obtener coach: {str(e)}"}
@@ -155,6 +158,9 @@ class CoachController:
             if not coaches_result["success"]:
                 return coaches_result
             
+            # Conteo de todos los coaches en una sola consulta agrupada
+            atletas_por_coach = self.contar_atletas_por_coach()
+            
             coaches_disponibles = []
             for coach in coaches_result["coaches"]:
                 # Filtrar por especialidad si se especifica
@@ -164,7 +170,7 @@ class CoachController:
                         continue
                 
                 # Contar atletas actualmente asignados
-                atletas_asignados = self.contar_atletas_asignados(coach['coach_data'][0])
+                atletas_asignados = atletas_por_coach.get(coach['coach_data'][0], 0)
                 
                 coach_disponible = coach.copy()
                 coach_disponible['atletas_asignados'] = atletas_asignados
@@ -295,40 +301,27 @@ class CoachController:
     def obtener_atletas_por_coach(self, coach_id, solo_activos=True):
         """Obtiene atletas asignados a un coach específico"""
         try:
-            asignaciones = self.asignacion_model.read_asignaciones()
-            atletas = self.atleta_model.read_atletas()
-            usuarios = self.usuario_model.read_usuarios()
-            
-            # Filtrar asignaciones del coach
-            asignaciones_coach = []
-            for asignacion in asignaciones:
-                if asignacion[1] == coach_id:  # id_coach
-                    if not solo_activos or asignacion[5]:  # estado_activo
-                        asignaciones_coach.append(asignacion)
+            # Asignación, atleta y usuario llegan juntos: el costo depende solo de
+            # cuántas asignaciones tiene el coach, no del tamaño de `atletas`
+            asignaciones_coach = self.asignacion_model.get_asignaciones_completas_by_coach(
+                coach_id, solo_activas=solo_activos
+            )
             
-            # Obtener información completa de atletas
             atletas_del_coach = []
-            for asignacion in asignaciones_coach:
-                atleta_id = asignacion[2]  # id_atleta
-                
-                # Buscar datos del atleta
-                atleta = next((a for a in atletas if a[0] == atleta_id), None)
-                if atleta:
-                    # Buscar datos del usuario
-                    usuario = next((u for u in usuarios if u[0] == atleta[1]), None)
-                    if usuario:
-                        atleta_info = {
-                            'asignacion_data': asignacion,
-                            'atleta_data': atleta,
-                            'usuario_data': usuario,
-                            'nombre_completo': f"{usuario[1]} {usuario[2]}",
-                            'email': usuario[6],
-                            'fecha_asignacion': asignacion[3],
-                            'fecha_fin': asignacion[4],
-                            'estado_activo': asignacion[5],
-                            'notas': asignacion[6]
-                        }
-                        atletas_del_coach.append(atleta_info)
+            for fila in asignaciones_coach:
+                asignacion = fila['asignacion_data']
+                usuario = fila['usuario_data']
+                atletas_del_coach.append({
+                    'asignacion_data': asignacion,
+                    'atleta_data': fila['atleta_data'],
+                    'usuario_data': usuario,
+                    'nombre_completo': f"{usuario[1]} {usuario[2]}",
+                    'email': usuario[6],
+                    'fecha_asignacion': asignacion[3],
+                    'fecha_fin': asignacion[4],
+                    'estado_activo': asignacion[5],
+                    'notas': asignacion[6]
+                })
             
             return {"success": True, "atletas": atletas_del_coach}
         except Exception as e:
@@ -337,30 +330,27 @@ class CoachController:
     def obtener_historial_asignaciones_atleta(self, atleta_id):
         """Obtiene el historial completo de asignaciones de un atleta"""
         try:
-            asignaciones = self.asignacion_model.read_asignaciones()
-            coaches = self.coach_model.read_coaches()
-            usuarios = self.usuario_model.read_usuarios()
+            asignaciones = self.asignacion_model.get_asignaciones_by_atleta(atleta_id)
+            coaches = {c[0]: c for c in self.coach_model.read_coaches()}
             
-            # Filtrar asignaciones del atleta
             historial = []
             for asignacion in asignaciones:
-                if asignacion[2] == atleta_id:  # id_atleta
-                    # Obtener información del coach
-                    coach = next((c for c in coaches if c[0] == asignacion[1]), None)
-                    if coach:
-                        usuario_coach = next((u for u in usuarios if u[0] == coach[1]), None)
-                        if usuario_coach:
-                            registro = {
-                                'asignacion_id': asignacion[0],
-                                'coach_nombre': f"{usuario_coach[1]} {usuario_coach[2]}",
-                                'especialidades': coach[2],
-                                'fecha_asignacion': asignacion[3],
-                                'fecha_fin': asignacion[4],
-                                'estado_activo': asignacion[5],
-                                'notas': asignacion[6],
-                                'duracion_dias': self._calcular_duracion_asignacion(asignacion)
-                            }
-                            historial.append(registro)
+                # Obtener información del coach
+                coach = coaches.get(asignacion[1])
+                if coach:
+                    usuario_coach = self.usuario_model.get_user_by_id(coach[1])
+                    if usuario_coach:
+                        registro = {
+                            'asignacion_id': asignacion[0],
+                            'coach_nombre': f"{usuario_coach[1]} {usuario_coach[2]}",
+                            'especialidades': coach[2],
+                            'fecha_asignacion': asignacion[3],
+                            'fecha_fin': asignacion[4],
+                            'estado_activo': asignacion[5],
+                            'notas': asignacion[6],
+                            'duracion_dias': self._calcular_duracion_asignacion(asignacion)
+                        }
+                        historial.append(registro)
             
             # Ordenar por fecha de asignación
             historial.sort(key=lambda x: x['fecha_asignacion'], reverse=True)
@@ -380,9 +370,8 @@ class CoachController:
                 return coach_info
             
             # Obtener datos del usuario
-            usuarios = self.usuario_model.read_usuarios()
             coach_data = coach_info["coach"]
-            usuario_coach = next((u for u in usuarios if u[0] == coach_data[1]), None)
+            usuario_coach = self.usuario_model.get_user_by_id(coach_data[1])
             
             if not usuario_coach:
                 return {"success": False, "message": "Datos del usuario no encontrados"}
@@ -424,40 +413,52 @@ class CoachController:
             return {"success": False, "message": f"Error generando reporte: {str(e)}"}
     
     def obtener_resumen_coaches(self):
-        """Obtiene resumen estadístico de todos los coaches"""
+        """
+        Resumen estadístico de todos los coaches activos. Atletas y asignaciones
+        activas por coach llegan agrupados en una sola consulta; aquí solo se suman
+        (una fila por coach) y se reparten las especialidades, que son texto libre.
+        """
         try:
-            coaches_result = self.obtener_todos_coaches()
-            if not coaches_result["success"]:
-                return coaches_result
+            filas = self.coach_model.get_resumen_por_coach()
+            if filas is None:
+                return {"success": False, "message": "Error al leer los coaches de la base de datos"}
             
-            coaches = coaches_result["coaches"]
             resumen = {
-                "total_coaches": len(coaches),
+                "total_coaches": len(filas),
                 "coaches_con_atletas": 0,
                 "total_atletas_asignados": 0,
+                "total_asignaciones_activas": 0,
                 "salario_promedio": 0,
-                "coaches_por_especialidad": {}
+                "coaches_por_especialidad": {},
+                "detalle_por_coach": []
             }
             
             salarios_totales = 0
             coaches_con_salario = 0
             
-            for coach in coaches:
-                coach_id = coach['coach_data'][0]
+            for coach_id, nombre_completo, especialidades, salario, atletas_asignados, asignaciones_activas in filas:
+                atletas_asignados = int(atletas_asignados)
+                asignaciones_activas = int(asignaciones_activas)
+                salario = float(salario) if salario else 0
                 
-                # Contar atletas asignados
-                atletas_asignados = self.contar_atletas_asignados(coach_id)
                 if atletas_asignados > 0:
                     resumen["coaches_con_atletas"] += 1
                 resumen["total_atletas_asignados"] += atletas_asignados
+                resumen["total_asignaciones_activas"] += asignaciones_activas
+                resumen["detalle_por_coach"].append({
+                    "id_coach": coach_id,
+                    "nombre_completo": nombre_completo,
+                    "atletas_asignados": atletas_asignados,
+                    "asignaciones_activas": asignaciones_activas,
+                    "salario": salario
+                })
                 
                 # Calcular salario promedio
-                if coach['salario'] > 0:
-                    salarios_totales += coach['salario']
+                if salario > 0:
+                    salarios_totales += salario
                     coaches_con_salario += 1
                 
                 # Agrupar por especialidades
-                especialidades = coach['especialidades']
                 if especialidades:
                     for esp in especialidades.split(','):
                         esp = esp.strip()
@@ -476,47 +477,22 @@ class CoachController:
     
     def contar_atletas_asignados(self, coach_id):
         """Cuenta cuántos atletas tiene asignados un coach"""
-        try:
-            print(f"🔍 DEBUG: Buscando atletas para coach_id: {coach_id} (tipo: {type(coach_id)})")
-            
-            # Obtener todos los atletas
-            resultado = self.atleta_controller.obtener_todos_atletas()
-            print(f"🔍 DEBUG: Resultado obtener_todos_atletas: {resultado['success']}")
-            
-            if not resultado["success"]:
-                return 0
-            
-            print(f"🔍 DEBUG: Total atletas encontrados: {len(resultado['atletas'])}")
-            
-            # Contar atletas con este coach
-            contador = 0
-            for i, atleta_completo in enumerate(resultado["atletas"]):
-                atleta_data = atleta_completo['atleta_data']
-                print(f"🔍 DEBUG: Atleta {i}: {atleta_data}")
-                
-                coach_atleta_id = atleta_data[8] if len(atleta_data) > 8 else None
-                print(f"🔍 DEBUG: coach_atleta_id: {coach_atleta_id} (tipo: {type(coach_atleta_id)})")
-                
-                if coach_atleta_id == coach_id:
-                    print(f"✅ MATCH: Atleta {i} pertenece al coach {coach_id}")
-                    contador += 1
-                else:
-                    print(f"❌ NO MATCH: {coach_atleta_id} != {coach_id}")
-            
-            print(f"🔍 DEBUG: Contador final: {contador}")
-            return contador
-            
-        except Exception as e:
-            print(f"Error contando atletas: {e}")
-            return 0
+        return self.contar_atletas_por_coach(coach_id).get(coach_id, 0)
+    
+    def contar_atletas_por_coach(self, coach_id=None):
+        """Dict id_coach -> atletas asignados (uno o todos los coaches) en una consulta agrupada"""
+        conteo = self.atleta_model.contar_por_coach(coach_id)
+        if conteo is None:
+            return {}
+        logger.debug("Atletas por coach: %s", conteo)
+        return conteo
     
     def _puede_crear_coaches(self, user_id):
         """Verifica si el usuario puede crear coaches (solo secretarias)"""
         try:
-            usuarios = self.usuario_model.read_usuarios()
-            for usuario in usuarios:
-                if usuario[0] == user_id:
-                    return usuario[8] == 'secretaria'  # rol en posición 8
+            usuario = self.usuario_model.get_user_by_id(user_id)
+            if usuario:
+                return usuario[8] == 'secretaria'  # rol en posición 8
             return False
         except Exception:
             return False
@@ -524,11 +500,10 @@ class CoachController:
     def _puede_gestionar_coaches(self, user_id):
         """Verifica si el usuario puede gestionar coaches (admin y secretarias)"""
         try:
-            usuarios = self.usuario_model.read_usuarios()
-            for usuario in usuarios:
-                if usuario[0] == user_id:
-                    rol = usuario[8]
-                    return rol in ['admin_principal', 'secretaria']
+            usuario = self.usuario_model.get_user_by_id(user_id)
+            if usuario:
+                rol = usuario[8]
+                return rol in ['admin_principal', 'secretaria']
             return False
         except Exception:
             return False
@@ -559,27 +534,22 @@ class CoachController:
     def _atleta_existe(self, atleta_id):
         """Verifica si un atleta existe"""
         try:
-            atletas = self.atleta_model.read_atletas()
-            return any(atleta[0] == atleta_id for atleta in atletas)
+            return self.atleta_model.get_atleta_by_id(atleta_id) is not None
         except Exception:
             return False
     
     def _obtener_asignacion_por_id(self, asignacion_id):
         """Obtiene una asignación por ID"""
         try:
-            asignaciones = self.asignacion_model.read_asignaciones()
-            return next((a for a in asignaciones if a[0] == asignacion_id), None)
+            return self.asignacion_model.get_asignacion_by_id(asignacion_id)
         except Exception:
             return None
     
     def _obtener_asignacion_activa_atleta(self, atleta_id):
         """Obtiene la asignación activa de un atleta"""
         try:
-            asignaciones = self.asignacion_model.read_asignaciones()
-            for asignacion in asignaciones:
-                if asignacion[2] == atleta_id and asignacion[5]:  # id_atleta y estado_activo
-                    return asignacion
-            return None
+            asignaciones = self.asignacion_model.get_asignaciones_by_atleta(atleta_id, solo_activas=True)
+            return asignaciones[0] if asignaciones else None
         except Exception:
             return None
     
@@ -610,11 +580,11 @@ class CoachController:
     def _calcular_tiempo_promedio_asignaciones(self, coach_id):
         """Calcula el tiempo promedio de asignaciones finalizadas de un coach"""
         try:
-            asignaciones = self.asignacion_model.read_asignaciones()
+            asignaciones = self.asignacion_model.get_asignaciones_by_coach(coach_id)
             duraciones = []
             
             for asignacion in asignaciones:
-                if asignacion[1] == coach_id and asignacion[4]:  # id_coach y fecha_fin
+                if asignacion[4]:  # fecha_fin
                     duracion = self._calcular_duracion_asignacion(asignacion)
                     if duracion > 0:
                         duraciones.append(duracion)
@@ -0,0 +1,121 @@
+# Controlador para exportar pagos, egresos, atletas y el reporte financiero a CSV/XLSX
+import csv
+import os
+
+from models.exportacion_model import ExportacionModel, EXPORTACIONES
+from models.resumen_financiero_model import ResumenFinancieroModel
+
+
+class _EscritorCSV:
+    def __init__(self, ruta, encabezados):
+        # utf-8-sig para que Excel reconozca los acentos
+        self.archivo = open(ruta, 'w', newline='', encoding='utf-8-sig')
+        self.escritor = csv.writer(self.archivo)
+        self.escritor.writerow(encabezados)
+
+    def escribir(self, filas):
+        self.escritor.writerows(filas)
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class _EscritorXLSX:
+    def __init__(self, ruta, encabezados):
+        from openpyxl import Workbook
+
+        # write_only: cada fila se vuelca al archivo temporal del libro, no queda en memoria
+        self.ruta = ruta
+        self.libro = Workbook(write_only=True)
+        self.hoja = self.libro.create_sheet()
+        self.hoja.append(encabezados)
+
+    def escribir(self, filas):
+        for fila in filas:
+            self.hoja.append(fila)
+
+    def cerrar(self):
+        self.libro.save(self.ruta)
+
+
+ESCRITORES = {'.csv': _EscritorCSV, '.xlsx': _EscritorXLSX}
+
+
+class ExportController:
+    def __init__(self):
+        self.exportacion_model = ExportacionModel()
+        self.resumen_model = ResumenFinancieroModel()
+
+    def exportar(self, tipo, ruta, fecha_inicio=None, fecha_fin=None, al_progresar=None, cancelado=None, tamaño_bloque=1000):
+        """
+        Escribe la exportación `tipo` ('pagos', 'egresos', 'atletas' o 'reporte') en `ruta`,
+        en CSV o XLSX según la extensión, por bloques de filas leídos del servidor.
+        `al_progresar(escritas, total)` se llama tras cada bloque; si `cancelado()`
+        devuelve True se detiene y borra el archivo a medias.
+        """
+        if tipo not in EXPORTACIONES:
+            return {"success": False, "message": f"Exportación desconocida: {tipo}"}
+
+        extension = os.path.splitext(ruta)[1].lower()
+        if extension not in ESCRITORES:
+            return {"success": False, "message": "Formato no soportado: usa .csv o .xlsx"}
+
+        if tipo == 'reporte' and not self.resumen_model.disponible():
+            return {"success": False, "message": "El resumen financiero no está disponible"}
+
+        total = self.exportacion_model.contar(tipo, fecha_inicio, fecha_fin)
+        if total is None:
+            return {"success": False, "message": "Error al consultar los datos a exportar"}
+
+        try:
+            escritor = ESCRITORES[extension](ruta, self.exportacion_model.encabezados(tipo))
+        except ImportError:
+            return {"success": False, "message": "Para exportar a Excel instala openpyxl (pip install openpyxl)"}
+        except OSError as e:
+            return {"success": False, "message": f"No se pudo crear el archivo: {e}"}
+
+        escritas = 0
+        completo = False
+        try:
+            bloques = self.exportacion_model.iterar(tipo, fecha_inicio, fecha_fin, tamaño_bloque)
+            try:
+                for bloque in bloques:
+                    escritor.escribir(bloque)
+                    escritas += len(bloque)
+                    if al_progresar:
+                        al_progresar(escritas, total)
+                    if cancelado and cancelado():
+                        break
+                else:
+                    completo = True
+            finally:
+                bloques.close()
+            escritor.cerrar()
+
+        except Exception as e:
+            self._descartar(escritor, ruta)
+            return {"success": False, "message": f"Error al exportar {tipo}: {str(e)}"}
+
+        if not completo:
+            self._descartar(escritor, ruta)
+            return {"success": False, "cancelado": True, "message": "Exportación cancelada"}
+
+        return {
+            "success": True,
+            "message": f"{escritas} filas exportadas a {os.path.basename(ruta)}",
+            "filas": escritas,
+            "ruta": ruta
+        }
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _descartar(self, escritor, ruta):
+        """Cierra y borra un archivo incompleto"""
+        try:
+            escritor.cerrar()
+        except Exception:
+            pass
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
@@ -1,15 +1,20 @@
+import logging
 from models.plan_model import PlanModel
 from models.ingreso_model import IngresoModel
 from models.egreso_model import EgresoModel
 from models.usuario_model import UsuarioModel
-from decimal import Decimal
+from models.resumen_financiero_model import ResumenFinancieroModel
+from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 
 class FinanceController:
     def __init__(self):
         self.plan_model = PlanModel()
         self.ingreso_model = IngresoModel()
+        self.resumen_model = ResumenFinancieroModel()
         self.egreso_model = EgresoModel()
         self.usuario_model = UsuarioModel()
     
@@ -55,10 +60,9 @@ class FinanceController:
     def obtener_plan_por_id(self, plan_id):
         """Obtiene un plan específico por ID"""
         try:
-            planes = self.plan_model.read_planes()
-            for plan in planes:
-                if plan[0] == plan_id:
-                    return {"success": True, "plan": plan}
+            plan = self.plan_model.get_plan_by_id(plan_id)
+            if plan:
+                return {"success": True, "plan": plan}
             return {"success": False, "message": "Plan no encontrado"}
         except Exception as e:
             return {"success": False, "message": f"Error al obtener plan: {str(e)}"}
@@ -223,8 +227,7 @@ class FinanceController:
             if not self._tiene_permisos_financieros(operado_por_id):
                 return {"success": False, "message": "No tienes permisos para actualizar pagos"}
 
-            ingresos = self.ingreso_model.read_ingresos()
-            ingreso_actual = next((i for i in ingresos if i[0] == id_pago), None)
+            ingreso_actual = self.ingreso_model.get_ingreso_by_id(id_pago)
 
             if not ingreso_actual:
                 return {"success": False, "message": "El pago a actualizar no fue encontrado."}
@@ -254,8 +257,7 @@ class FinanceController:
     def obtener_ingresos_por_atleta(self, id_atleta):
         """Obtiene todos los ingresos de un atleta específico"""
         try:
-            ingresos = self.ingreso_model.read_ingresos()
-            ingresos_atleta = [i for i in ingresos if i[1] == id_atleta]
+            ingresos_atleta = self.ingreso_model.get_ingresos_by_atleta(id_atleta)
             return {"success": True, "ingresos": ingresos_atleta}
         except Exception as e:
             return {"success": False, "message": f"Error al obtener ingresos: {str(e)}"}
@@ -263,63 +265,57 @@ class FinanceController:
     def obtener_ingresos_por_fecha(self, fecha_inicio, fecha_fin):
         """Obtiene ingresos en un rango de fechas"""
         try:
-            resultado_detallado = self.obtener_ingresos_detallados()
-            if not resultado_detallado["success"]:
-                return resultado_detallado
-
-            ingresos_detallados = resultado_detallado["ingresos"]
-            ingresos_filtrados = []
-            
-            for ingreso in ingresos_detallados:
-                fecha_pago = ingreso['fecha_pago']
-                if fecha_inicio <= fecha_pago <= fecha_fin:
-                    ingresos_filtrados.append(ingreso)
+            filas = self.ingreso_model.get_ingresos_detallados(fecha_inicio=fecha_inicio, fecha_fin=fecha_fin)
+            if filas is None:
+                return {"success": False, "message": "Error al leer ingresos de la base de datos"}
             
-            return {"success": True, "ingresos": ingresos_filtrados}
+            return {"success": True, "ingresos": [self._ingreso_detallado(fila) for fila in filas]}
         except Exception as e:
             return {"success": False, "message": f"Error al filtrar ingresos: {str(e)}"}
 
     def obtener_ingresos_detallados(self):
         """
-        Obtiene todos los ingresos y enriquece los datos con nombres
-        de atleta, plan y procesador para mostrarlos en la vista.
+        Obtiene todos los ingresos con nombres de atleta, plan y procesador
+        para mostrarlos en la vista (más recientes primero).
         """
         try:
-            ingresos_raw = self.ingreso_model.read_ingresos()
-            usuarios = self.usuario_model.read_usuarios()
-            planes = self.plan_model.read_planes()
-
-            mapa_usuarios = {u[0]: f"{u[1]} {u[2]}" for u in usuarios}
-            mapa_planes = {p[0]: p[1] for p in planes}
+            filas = self.ingreso_model.get_ingresos_detallados()
+            if filas is None:
+                return {"success": False, "message": "Error al leer ingresos de la base de datos"}
             
-            ingresos_detallados = []
-            for ingreso in ingresos_raw:
-                id_pago, id_atleta, id_plan, monto, tipo_pago, metodo_pago, descripcion, fecha_pago, _, _, procesado_por = ingreso
+            return {"success": True, "ingresos": [self._ingreso_detallado(fila) for fila in filas]}
 
-                nombre_atleta = mapa_usuarios.get(id_atleta, f"Atleta ID: {id_atleta}")
-                nombre_plan = mapa_planes.get(id_plan, "N/A")
-                nombre_procesador = mapa_usuarios.get(procesado_por, f"Usuario ID: {procesado_por}")
-
-                ingresos_detallados.append({
-                    "id_pago": id_pago,
-                    "fecha_pago": fecha_pago,
-                    "nombre_atleta": nombre_atleta,
-                    "nombre_plan": nombre_plan,
-                    "monto": float(monto),
-                    "tipo_pago": tipo_pago.replace('_', ' ').title(),
-                    "metodo_pago": metodo_pago.title(),
-                    "descripcion": descripcion,
-                    "nombre_procesador": nombre_procesador
-                })
-            
-            ingresos_detallados.sort(key=lambda x: x['fecha_pago'], reverse=True)
+        except Exception as e:
+            logger.exception("Error al obtener ingresos detallados: %s", e)
+            return {"success": False, "message": f"Error al obtener ingresos detallados: {str(e)}"}
 
-            return {"success": True, "ingresos": ingresos_detallados}
+    def obtener_ingresos_pagina(self, tamaño_pagina=100, despues_de=None, fecha_inicio=None, fecha_fin=None, tipo_pago=None, texto=None):
+        """
+        Una página de ingresos detallados con los filtros aplicados en la BD.
+        `siguiente` es el cursor para pedir la página siguiente (None si no hay más).
+        """
+        try:
+            filas = self.ingreso_model.get_ingresos_detallados(
+                limite=tamaño_pagina + 1,
+                despues_de=despues_de,
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin,
+                tipo_pago=tipo_pago,
+                texto=texto
+            )
+            if filas is None:
+                return {"success": False, "message": "Error al leer ingresos de la base de datos"}
+            
+            # Se pide una fila de más solo para saber si existe otra página
+            hay_mas = len(filas) > tamaño_pagina
+            filas = filas[:tamaño_pagina]
+            ingresos = [self._ingreso_detallado(fila) for fila in filas]
+            siguiente = (ingresos[-1]['fecha_pago'], ingresos[-1]['id_pago']) if hay_mas else None
+            
+            return {"success": True, "ingresos": ingresos, "siguiente": siguiente}
 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return {"success": False, "message": f"Error al obtener ingresos detallados: {str(e)}"}
+            return {"success": False, "message": f"Error al obtener página de ingresos: {str(e)}"}
     
     # ==================== GESTIÓN DE EGRESOS ====================
     
@@ -368,8 +364,7 @@ class FinanceController:
     def obtener_egresos_por_tipo(self, tipo_egreso):
         """Obtiene egresos filtrados por tipo"""
         try:
-            egresos = self.egreso_model.read_egresos()
-            egresos_filtrados = [e for e in egresos if e[2] == tipo_egreso]
+            egresos_filtrados = self.egreso_model.get_egresos_by_tipo(tipo_egreso)
             return {"success": True, "egresos": egresos_filtrados}
         except Exception as e:
             return {"success": False, "message": f"Error al filtrar egresos: {str(e)}"}
@@ -377,14 +372,7 @@ class FinanceController:
     def obtener_egresos_por_fecha(self, fecha_inicio, fecha_fin):
         """Obtiene egresos en un rango de fechas"""
         try:
-            egresos = self.egreso_model.read_egresos()
-            egresos_filtrados = []
-            
-            for egreso in egresos:
-                fecha_egreso = egreso[6]
-                if fecha_inicio <= fecha_egreso <= fecha_fin:
-                    egresos_filtrados.append(egreso)
-            
+            egresos_filtrados = self.egreso_model.get_egresos_by_fecha(fecha_inicio, fecha_fin)
             return {"success": True, "egresos": egresos_filtrados}
         except Exception as e:
             return {"success": False, "message": f"Error al filtrar egresos: {str(e)}"}
@@ -392,33 +380,29 @@ class FinanceController:
     # ==================== REPORTES FINANCIEROS ====================
     
     def generar_reporte_financiero(self, fecha_inicio, fecha_fin):
-        """Genera un reporte financiero completo"""
+        """Genera un reporte financiero completo (totales agregados en la BD, montos Decimal)"""
         try:
-            ingresos_raw = self.ingreso_model.read_ingresos()
-            ingresos_periodo = [i for i in ingresos_raw if fecha_inicio <= i[7] <= fecha_fin]
+            # Resumen diario si está disponible; si no, agregados sobre las tablas crudas
+            if self.resumen_model.disponible():
+                totales_ingresos = self.resumen_model.get_totales_por_tipo('ingreso', fecha_inicio, fecha_fin)
+                totales_egresos = self.resumen_model.get_totales_por_tipo('egreso', fecha_inicio, fecha_fin)
+            else:
+                totales_ingresos = self.ingreso_model.get_totales_por_tipo(fecha_inicio, fecha_fin)
+                totales_egresos = self.egreso_model.get_totales_por_tipo(fecha_inicio, fecha_fin)
             
-            egresos_result = self.obtener_egresos_por_fecha(fecha_inicio, fecha_fin)
-            if not egresos_result["success"]:
+            if totales_ingresos is None:
+                return {"success": False, "message": "Error al obtener datos de ingresos"}
+            if totales_egresos is None:
                 return {"success": False, "message": "Error al obtener datos de egresos"}
             
-            egresos = egresos_result["egresos"]
+            # (tipo, cantidad, suma) por cada tipo_pago / tipo_egreso
+            ingresos_por_tipo = {tipo: self._a_decimal(suma) for tipo, _, suma in totales_ingresos}
+            egresos_por_tipo = {tipo: self._a_decimal(suma) for tipo, _, suma in totales_egresos}
             
-            total_ingresos = sum([float(i[3]) for i in ingresos_periodo])
-            total_egresos = sum([float(e[1]) for e in egresos])
+            total_ingresos = sum(ingresos_por_tipo.values(), Decimal('0'))
+            total_egresos = sum(egresos_por_tipo.values(), Decimal('0'))
             balance = total_ingresos - total_egresos
             
-            ingresos_por_tipo = {}
-            for ingreso in ingresos_periodo:
-                tipo = ingreso[4]
-                monto = float(ingreso[3])
-                ingresos_por_tipo[tipo] = ingresos_por_tipo.get(tipo, 0) + monto
-            
-            egresos_por_tipo = {}
-            for egreso in egresos:
-                tipo = egreso[2]
-                monto = float(egreso[1])
-                egresos_por_tipo[tipo] = egresos_por_tipo.get(tipo, 0) + monto
-            
             return {
                 "success": True,
                 "reporte": {
@@ -427,14 +411,16 @@ class FinanceController:
                         "fecha_fin": fecha_fin
                     },
                     "resumen": {
-                        "total_ingresos": round(total_ingresos, 2),
-                        "total_egresos": round(total_egresos, 2),
-                        "balance": round(balance, 2),
-                        "cantidad_ingresos": len(ingresos_periodo),
-                        "cantidad_egresos": len(egresos)
+                        "total_ingresos": self._redondear(total_ingresos),
+                        "total_egresos": self._redondear(total_egresos),
+                        "balance": self._redondear(balance),
+                        "cantidad_ingresos": sum(cantidad for _, cantidad, _ in totales_ingresos),
+                        "cantidad_egresos": sum(cantidad for _, cantidad, _ in totales_egresos)
                     },
-                    "desglose_ingresos": {k: round(v, 2) for k, v in ingresos_por_tipo.items()},
-                    "desglose_egresos": {k: round(v, 2) for k, v in egresos_por_tipo.items()}
+                    "desglose_ingresos": {k: self._redondear(v) for k, v in ingresos_por_tipo.items()},
+                    "desglose_egresos": {k: self._redondear(v) for k, v in egresos_por_tipo.items()},
+                    "cantidades_ingresos": {tipo: cantidad for tipo, cantidad, _ in totales_ingresos},
+                    "cantidades_egresos": {tipo: cantidad for tipo, cantidad, _ in totales_egresos}
                 }
             }
             
@@ -454,16 +440,51 @@ class FinanceController:
         except Exception as e:
             return {"success": False, "message": f"Error al obtener resumen mensual: {str(e)}"}
     
+    def reconstruir_resumen_diario(self):
+        """Recalcula el resumen financiero diario desde ingresos y egresos"""
+        try:
+            if not self.resumen_model.asegurar_tabla() or not self.resumen_model.reconstruir():
+                return {"success": False, "message": "No se pudo reconstruir el resumen financiero"}
+            return {"success": True, "message": "Resumen financiero reconstruido correctamente"}
+        except Exception as e:
+            return {"success": False, "message": f"Error al reconstruir resumen: {str(e)}"}
+    
     # ==================== MÉTODOS DE UTILIDAD ====================
     
+    def _ingreso_detallado(self, fila):
+        """Convierte una fila de get_ingresos_detallados al diccionario que usa la vista"""
+        (id_pago, id_atleta, id_plan, monto, tipo_pago, metodo_pago, descripcion,
+         fecha_pago, procesado_por, nombre_atleta, nombre_plan, nombre_procesador) = fila
+        
+        return {
+            "id_pago": id_pago,
+            "fecha_pago": fecha_pago,
+            "nombre_atleta": nombre_atleta or f"Atleta ID: {id_atleta}",
+            "nombre_plan": nombre_plan or "N/A",
+            "monto": float(monto),
+            "tipo_pago": tipo_pago.replace('_', ' ').title(),
+            "metodo_pago": metodo_pago.title(),
+            "descripcion": descripcion,
+            "nombre_procesador": nombre_procesador or f"Usuario ID: {procesado_por}"
+        }
+    
+    def _a_decimal(self, valor):
+        """Convierte montos de la BD a Decimal sin pasar por float"""
+        if isinstance(valor, Decimal):
+            return valor
+        return Decimal(str(valor)) if valor is not None else Decimal('0')
+    
+    def _redondear(self, monto):
+        """Redondea un monto Decimal a centavos"""
+        return monto.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    
     def _tiene_permisos_financieros(self, user_id):
         """Verifica si el usuario tiene permisos para operaciones financieras"""
         try:
-            usuarios = self.usuario_model.read_usuarios()
-            for usuario in usuarios:
-                if usuario[0] == user_id:
-                    rol = usuario[8]
-                    return rol in ['admin_principal', 'secretaria']
+            usuario = self.usuario_model.get_user_by_id(user_id)
+            if usuario:
+                rol = usuario[8]
+                return rol in ['admin_principal', 'secretaria']
             return False
         except Exception:
             return False
@@ -516,11 +537,7 @@ class FinanceController:
     
     def _nombre_plan_existe(self, nombre_plan):
         """Verifica si ya existe un plan con ese nombre"""
-        planes = self.plan_model.read_planes()
-        for plan in planes:
-            if plan[1].lower() == nombre_plan.lower():
-                return True
-        return False
+        return self.plan_model.get_plan_by_nombre(nombre_plan) is not None
     
     def calcular_fecha_vencimiento(self, plan_id, fecha_inicio=None):
         """Calcula la fecha de vencimiento basada en un plan"""
@@ -539,5 +556,5 @@ class FinanceController:
             return fecha_vencimiento
             
         except Exception as e:
-            print(f"Error al calcular fecha de vencimiento: {str(e)}")
+            logger.error("Error al calcular fecha de vencimiento: %s", e)
             return None
\ No newline at end of file
@@ -0,0 +1,330 @@
+# Controlador para importar atletas e ingresos históricos desde CSV
+import csv
+import time
+from datetime import datetime, date, timedelta
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from models.importacion_model import ImportacionModel
+from controllers.atleta_controller import AtletaController
+
+
+TIPOS_PAGO = ('inscripcion', 'renovacion', 'servicio_extra')
+ESTADOS_SOLVENCIA = ('solvente', 'vencido', 'suspendido')
+
+
+def _abrir_csv(ruta):
+    """Abre el CSV detectando el separador (coma, punto y coma o tabulador)"""
+    archivo = open(ruta, newline='', encoding='utf-8-sig')
+    muestra = archivo.read(4096)
+    archivo.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+    except csv.Error:
+        dialecto = csv.excel
+    return archivo, csv.DictReader(archivo, dialect=dialecto)
+
+
+def _estimar_filas(ruta):
+    """Filas de datos según los saltos de línea (de más si hay campos con saltos entre comillas)"""
+    lineas = 0
+    ultimo = b'\n'
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            lineas += bloque.count(b'\n')
+            ultimo = bloque[-1:]
+    if ultimo != b'\n':
+        lineas += 1  # última línea sin salto final
+    return max(0, lineas - 1)
+
+
+def _texto(fila, campo):
+    valor = fila.get(campo)
+    return valor.strip() if isinstance(valor, str) else ''
+
+
+def _fecha(valor):
+    """Acepta AAAA-MM-DD o DD/MM/AAAA; '' -> None"""
+    if not valor:
+        return None
+    for formato in ('%Y-%m-%d', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(valor[:10], formato).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Fecha inválida: {valor}")
+
+
+def _numero(valor, tipo=Decimal):
+    if not valor:
+        return None
+    try:
+        return tipo(valor.replace(',', '.')) if tipo is Decimal else tipo(valor)
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Número inválido: {valor}")
+
+
+class ImportController:
+    """
+    Importa archivos CSV grandes leyéndolos fila a fila: valida cada fila con las
+    reglas del registro manual contra datos de referencia cargados una sola vez, y
+    escribe por lotes de `tamaño_lote` filas, cada lote en su propia transacción.
+    Un lote que falla se revierte completo y sus filas se reportan como rechazadas.
+    `al_progresar(leidas, total_estimado)` se llama tras cada lote; si `cancelado()`
+    devuelve True se detiene antes del lote siguiente (los ya guardados quedan).
+    """
+
+    def __init__(self):
+        self.importacion_model = ImportacionModel()
+        self.atleta_controller = AtletaController()
+
+    def importar_atletas(self, ruta, importado_por_id, tamaño_lote=1000, al_progresar=None, cancelado=None):
+        """
+        Columnas: nombre, apellido, cedula y plan (nombre) o id_plan son obligatorias;
+        opcionales email, telefono, direccion, edad, fecha_nacimiento, peso, id_coach,
+        fecha_inscripcion, fecha_vencimiento, estado_solvencia, meta_largo_plazo y
+        valoracion_especiales. Crea el usuario (rol atleta) y el perfil de cada fila.
+        """
+        if not self.atleta_controller._puede_gestionar_atletas(importado_por_id):
+            return {"success": False, "message": "No tienes permisos para importar atletas"}
+
+        cedulas = self.importacion_model.get_cedulas_usuarios()
+        emails = self.importacion_model.get_emails()
+        planes = self._planes_por_clave()
+        coaches = self.importacion_model.get_ids_coaches()
+        if cedulas is None or emails is None or planes is None or coaches is None:
+            return {"success": False, "message": "Error al leer los datos existentes"}
+
+        # Cédulas y emails del lote en curso: se suman a los registrados solo si el
+        # lote se guarda, para que un lote revertido no rechace filas corregidas después
+        pendientes = (set(), set())
+
+        def preparar(fila):
+            return self._preparar_atleta(fila, planes, coaches, cedulas, emails, pendientes)
+
+        def descartar():
+            for valores in pendientes:
+                valores.clear()
+
+        def guardar(lote):
+            guardado = self.importacion_model.insertar_atletas(lote, importado_por_id) is not None
+            if guardado:
+                cedulas.update(dict.fromkeys(pendientes[0]))
+                emails.update(pendientes[1])
+            descartar()
+            return guardado
+
+        return self._importar(ruta, preparar, guardar, tamaño_lote, al_progresar, cancelado, descartar)
+
+    def importar_ingresos(self, ruta, importado_por_id, tamaño_lote=1000, al_progresar=None, cancelado=None):
+        """
+        Columnas: cedula, metodo_pago y fecha_pago son obligatorias; opcionales plan o
+        id_plan, monto (por defecto el precio del plan), tipo_pago (por defecto
+        renovacion), descripcion, fecha_vencimiento_anterior y fecha_vencimiento_nueva.
+        El atleta debe existir (p. ej. importado antes con importar_atletas).
+        """
+        if not self.atleta_controller.finance_controller._tiene_permisos_financieros(importado_por_id):
+            return {"success": False, "message": "No tienes permisos para importar pagos"}
+
+        cedulas = self.importacion_model.get_cedulas_usuarios()
+        planes = self._planes_por_clave()
+        if cedulas is None or planes is None:
+            return {"success": False, "message": "Error al leer los datos existentes"}
+
+        def preparar(fila):
+            return self._preparar_ingreso(fila, planes, cedulas, importado_por_id)
+
+        return self._importar(ruta, preparar, self.importacion_model.insertar_ingresos, tamaño_lote,
+                              al_progresar, cancelado)
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _importar(self, ruta, preparar, guardar, tamaño_lote, al_progresar, cancelado, descartar=None):
+        """
+        Recorre el CSV por lotes; `preparar` devuelve la fila lista o lanza ValueError.
+        `descartar()` se llama cuando todas las filas de un lote fueron rechazadas
+        (no hay nada que guardar, pero sí estado del lote que olvidar).
+        """
+        inicio = time.perf_counter()
+        leidas = 0
+        importadas = 0
+        rechazadas = []
+        interrumpida = False
+
+        try:
+            total = _estimar_filas(ruta) if al_progresar else 0
+            archivo, lector = _abrir_csv(ruta)
+        except OSError as e:
+            return {"success": False, "message": f"No se pudo abrir el archivo: {e}"}
+
+        with archivo:
+            while True:
+                if cancelado and cancelado():
+                    interrumpida = True
+                    break
+                bloque = list(islice(lector, tamaño_lote))
+                if not bloque:
+                    break
+
+                lote = []
+                lineas = []
+                for fila in bloque:
+                    leidas += 1
+                    linea = leidas + 1  # la línea 1 es el encabezado
+                    try:
+                        lote.append(preparar(fila))
+                        lineas.append(linea)
+                    except ValueError as e:
+                        rechazadas.append({"linea": linea, "motivo": str(e)})
+
+                if lote:
+                    if guardar(lote):
+                        importadas += len(lote)
+                    else:
+                        rechazadas.extend({"linea": linea, "motivo": "Error al guardar el lote"} for linea in lineas)
+                elif descartar:
+                    descartar()
+
+                if al_progresar:
+                    al_progresar(leidas, max(total, leidas))
+
+        segundos = time.perf_counter() - inicio
+        filas_por_segundo = leidas / segundos if segundos > 0 else 0
+        rechazadas.sort(key=lambda rechazo: rechazo["linea"])
+
+        return {
+            "success": True,
+            "cancelado": interrumpida,
+            "message": (("Importación cancelada: " if interrumpida else "")
+                        + f"{importadas} de {leidas} filas importadas en {segundos:.1f} s "
+                        f"({filas_por_segundo:.0f} filas/s), {len(rechazadas)} rechazadas"),
+            "leidas": leidas,
+            "importadas": importadas,
+            "rechazadas": rechazadas,
+            "segundos": segundos,
+            "filas_por_segundo": filas_por_segundo
+        }
+
+    def _planes_por_clave(self):
+        """{nombre en minúsculas o id en texto: (id_plan, precio, duracion_dias)}"""
+        filas = self.importacion_model.get_planes()
+        if filas is None:
+            return None
+        planes = {}
+        for id_plan, nombre_plan, precio, duracion_dias in filas:
+            planes[str(id_plan)] = (id_plan, precio, duracion_dias)
+            planes[str(nombre_plan).strip().lower()] = (id_plan, precio, duracion_dias)
+        return planes
+
+    def _resolver_plan(self, fila, planes, requerido):
+        clave = _texto(fila, 'id_plan') or _texto(fila, 'plan').lower()
+        if not clave:
+            if requerido:
+                raise ValueError("Campo requerido: plan")
+            return None
+        plan = planes.get(clave)
+        if plan is None:
+            raise ValueError(f"Plan no encontrado: {clave}")
+        return plan
+
+    def _preparar_atleta(self, fila, planes, coaches, cedulas, emails, pendientes):
+        plan = self._resolver_plan(fila, planes, requerido=True)
+        id_plan, _, duracion_dias = plan
+
+        cedula = _texto(fila, 'cedula')
+        email = _texto(fila, 'email') or f"{cedula}@sinemail.com"
+        fecha_nacimiento = _fecha(_texto(fila, 'fecha_nacimiento'))
+
+        datos = {
+            'nombre': _texto(fila, 'nombre'),
+            'apellido': _texto(fila, 'apellido'),
+            'cedula': cedula,
+            'email': email,
+            'id_plan': id_plan,
+            'fecha_nacimiento': fecha_nacimiento.isoformat() if fecha_nacimiento else None
+        }
+        validacion = self.atleta_controller._validar_campos_atleta(datos)
+        if not validacion["success"]:
+            raise ValueError(validacion["message"])
+
+        # Unicidad contra la BD, los lotes ya guardados y las filas anteriores del lote
+        cedulas_lote, emails_lote = pendientes
+        if cedula in cedulas or cedula in cedulas_lote:
+            raise ValueError("La cédula ya está registrada")
+        if email.lower() in emails or email.lower() in emails_lote:
+            raise ValueError("El email ya está registrado")
+
+        # Un id_coach inexistente haría fallar el INSERT de todo el lote
+        id_coach = _numero(_texto(fila, 'id_coach'), int)
+        if id_coach is not None and id_coach not in coaches:
+            raise ValueError(f"Coach no encontrado: {id_coach}")
+
+        fecha_inscripcion = _fecha(_texto(fila, 'fecha_inscripcion')) or date.today()
+        fecha_vencimiento = (_fecha(_texto(fila, 'fecha_vencimiento'))
+                             or fecha_inscripcion + timedelta(days=duracion_dias or 0))
+        estado = _texto(fila, 'estado_solvencia').lower()
+        if not estado:
+            estado = 'solvente' if fecha_vencimiento >= date.today() else 'vencido'
+        elif estado not in ESTADOS_SOLVENCIA:
+            raise ValueError(f"Estado de solvencia inválido: {estado}")
+
+        datos.update({
+            'edad': _numero(_texto(fila, 'edad'), int),
+            'direccion': _texto(fila, 'direccion') or None,
+            'telefono': _texto(fila, 'telefono') or None,
+            'fecha_nacimiento': fecha_nacimiento,
+            'peso': _numero(_texto(fila, 'peso')),
+            'id_coach': id_coach,
+            'fecha_inscripcion': fecha_inscripcion,
+            'fecha_vencimiento': fecha_vencimiento,
+            'estado_solvencia': estado,
+            'meta_largo_plazo': _texto(fila, 'meta_largo_plazo'),
+            'valoracion_especiales': _texto(fila, 'valoracion_especiales')
+        })
+
+        # Solo una fila que ya no puede rechazarse reserva su cédula y su email
+        cedulas_lote.add(cedula)
+        emails_lote.add(email.lower())
+        return datos
+
+    def _preparar_ingreso(self, fila, planes, cedulas, procesado_por):
+        cedula = _texto(fila, 'cedula')
+        if not cedula:
+            raise ValueError("Campo requerido: cedula")
+        if cedula not in cedulas:
+            raise ValueError(f"Atleta no encontrado: {cedula}")
+
+        metodo_pago = _texto(fila, 'metodo_pago').lower()
+        if not metodo_pago:
+            raise ValueError("Campo requerido: metodo_pago")
+
+        fecha_pago = _fecha(_texto(fila, 'fecha_pago'))
+        if not fecha_pago:
+            raise ValueError("Campo requerido: fecha_pago")
+
+        tipo_pago = _texto(fila, 'tipo_pago').lower() or 'renovacion'
+        if tipo_pago not in TIPOS_PAGO:
+            raise ValueError(f"Tipo de pago inválido: {tipo_pago}")
+
+        plan = self._resolver_plan(fila, planes, requerido=False)
+        monto = _numero(_texto(fila, 'monto'))
+        if monto is None:
+            if plan is None:
+                raise ValueError("Se requiere monto o plan")
+            monto = Decimal(str(plan[1]))
+        if monto <= 0:
+            raise ValueError("El monto debe ser mayor a 0")
+
+        return {
+            # Como en registrar_atleta_completo, el ingreso se vincula al ID de usuario
+            'id_atleta': cedulas[cedula],
+            'id_plan': plan[0] if plan else None,
+            'monto': monto,
+            'tipo_pago': tipo_pago,
+            'metodo_pago': metodo_pago,
+            'descripcion': _texto(fila, 'descripcion') or 'Pago histórico importado',
+            'fecha_pago': fecha_pago,
+            'fecha_vencimiento_anterior': _fecha(_texto(fila, 'fecha_vencimiento_anterior')),
+            'fecha_vencimiento_nueva': _fecha(_texto(fila, 'fecha_vencimiento_nueva')),
+            'procesado_por': procesado_por
+        }
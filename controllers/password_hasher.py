@@ -0,0 +1,139 @@
+# Cifrado de contraseñas con KDF de costo configurable
+import base64
+import hashlib
+import hmac
+import secrets
+
+
+# Algoritmo y costo para los hashes nuevos; los existentes guardan sus propios parámetros
+HASH_CONFIG = {
+    'algoritmo': 'scrypt' if hasattr(hashlib, 'scrypt') else 'pbkdf2_sha256',
+    'scrypt': {'n': 2 ** 14, 'r': 8, 'p': 1},
+    'pbkdf2_sha256': {'iteraciones': 600000}
+}
+
+
+def _b64(datos):
+    return base64.b64encode(datos).decode('ascii').rstrip('=')
+
+
+def _desde_b64(texto):
+    return base64.b64decode(texto + '=' * (-len(texto) % 4))
+
+
+class ScryptKDF:
+    """Formato: scrypt$n$r$p$sal$hash"""
+
+    nombre = 'scrypt'
+
+    def __init__(self, n=2 ** 14, r=8, p=1):
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def cifrar(self, password, sal):
+        clave = self._derivar(password, sal, self.n, self.r, self.p)
+        return f"{self.nombre}${self.n}${self.r}${self.p}${_b64(sal)}${_b64(clave)}"
+
+    def verificar(self, password, partes):
+        n, r, p, sal, esperado = partes
+        clave = self._derivar(password, _desde_b64(sal), int(n), int(r), int(p))
+        return hmac.compare_digest(clave, _desde_b64(esperado))
+
+    def parametros_vigentes(self, partes):
+        return partes[:3] == [str(self.n), str(self.r), str(self.p)]
+
+    def _derivar(self, password, sal, n, r, p):
+        # maxmem holgado: 128 * r * n bytes más margen
+        return hashlib.scrypt(password.encode(), salt=sal, n=n, r=r, p=p,
+                              maxmem=256 * r * n, dklen=32)
+
+
+class Pbkdf2KDF:
+    """Formato: pbkdf2_sha256$iteraciones$sal$hash"""
+
+    nombre = 'pbkdf2_sha256'
+
+    def __init__(self, iteraciones=600000):
+        self.iteraciones = iteraciones
+
+    def cifrar(self, password, sal):
+        clave = hashlib.pbkdf2_hmac('sha256', password.encode(), sal, self.iteraciones)
+        return f"{self.nombre}${self.iteraciones}${_b64(sal)}${_b64(clave)}"
+
+    def verificar(self, password, partes):
+        iteraciones, sal, esperado = partes
+        clave = hashlib.pbkdf2_hmac('sha256', password.encode(), _desde_b64(sal), int(iteraciones))
+        return hmac.compare_digest(clave, _desde_b64(esperado))
+
+    def parametros_vigentes(self, partes):
+        return partes[0] == str(self.iteraciones)
+
+
+class LegacySha256:
+    """Hashes heredados: SHA-256 en hexadecimal, sin sal. Solo se verifican"""
+
+    nombre = 'sha256'
+
+    def verificar(self, password, partes):
+        calculado = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(calculado, partes[0])
+
+
+class PasswordHasher:
+    """
+    Cifra con el algoritmo configurado y verifica cualquier formato registrado.
+    `necesita_rehash` indica cuándo un hash guardado debe reemplazarse (algoritmo
+    heredado o costo distinto al actual) tras un login correcto.
+    """
+
+    algoritmos = {
+        ScryptKDF.nombre: ScryptKDF,
+        Pbkdf2KDF.nombre: Pbkdf2KDF
+    }
+
+    def __init__(self, algoritmo=None, **parametros):
+        algoritmo = algoritmo or HASH_CONFIG['algoritmo']
+        if not parametros:
+            parametros = HASH_CONFIG.get(algoritmo, {})
+        self.kdf = self.algoritmos[algoritmo](**parametros)
+
+    @classmethod
+    def registrar_algoritmo(cls, clase):
+        """Permite agregar otro KDF (debe exponer nombre, cifrar, verificar y parametros_vigentes)"""
+        cls.algoritmos[clase.nombre] = clase
+
+    def cifrar(self, password):
+        return self.kdf.cifrar(password, secrets.token_bytes(16))
+
+    def verificar(self, password, almacenado):
+        if not almacenado:
+            return False
+        kdf, partes = self._identificar(almacenado)
+        if kdf is None:
+            return False
+        try:
+            return kdf.verificar(password, partes)
+        except (ValueError, TypeError):
+            # Hash mal formado
+            return False
+
+    def necesita_rehash(self, almacenado):
+        kdf, partes = self._identificar(almacenado)
+        if kdf is None or kdf.nombre != self.kdf.nombre:
+            return True
+        return not self.kdf.parametros_vigentes(partes)
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _identificar(self, almacenado):
+        partes = str(almacenado).split('$')
+        if len(partes) == 1:
+            return LegacySha256(), partes
+
+        clase = self.algoritmos.get(partes[0])
+        if clase is None:
+            return None, partes
+        if clase is type(self.kdf):
+            return self.kdf, partes[1:]
+        return clase(), partes[1:]
@@ -10,6 +10,9 @@ class RutinaController:
     def obtener_rutinas(self):
         return self.model.read_rutinas()
     
+    def obtener_rutinas_resumen(self):
+        return self.model.read_rutinas_resumen()
+    
     def actualizar_rutina(self, id_rutina, nombre_rutina, nivel, descripcion):
         return self.model.update_rutina(id_rutina, nombre_rutina, nivel, descripcion)
     
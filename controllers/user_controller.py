@@ -1,21 +1,43 @@
 # Controlador para gestión de usuarios
-import hashlib
 from models.usuario_model import UsuarioModel
+from .password_hasher import PasswordHasher
+import logging
 import secrets
 import string
 
+logger = logging.getLogger(__name__)
+
 
 class UserController:
     def __init__(self):
         self.usuario_model = UsuarioModel()
+        self.hasher = PasswordHasher()
     
     def _hash_password(self, password):
-        """Cifra la contraseña usando SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Cifra la contraseña con el KDF configurado (ver password_hasher.HASH_CONFIG)"""
+        return self.hasher.cifrar(password)
     
     def _verify_password(self, password, hashed_password):
-        """Verifica si la contraseña coincide con el hash"""
-        return self._hash_password(password) == hashed_password
+        """Verifica si la contraseña coincide con el hash (acepta hashes SHA-256 heredados)"""
+        return self.hasher.verificar(password, hashed_password)
+
+    def verificar_password_usuario(self, usuario, password):
+        """
+        Verifica la contraseña de la tupla `usuario` y, si es correcta y su hash es
+        heredado o de costo desactualizado, lo reemplaza por uno nuevo.
+        """
+        if not self._verify_password(password, usuario[7]):  # contraseña
+            return False
+
+        if self.hasher.necesita_rehash(usuario[7]):
+            nuevo = self._hash_password(password)
+            if self.usuario_model.admite_contraseña(nuevo):
+                self.usuario_model.update_password(usuario[0], nuevo)
+            else:
+                # Se conserva el hash actual hasta aplicar las migraciones (--migrar)
+                logger.warning("usuarios.contraseña es muy angosta para el hash nuevo: no se actualiza")
+        return True
+
     def generar_password_seguro(self, longitud=12):
         """
         Genera una contraseña segura con letras mayúsculas, minúsculas y números.
@@ -57,8 +79,7 @@ class UserController:
                 creado_por_id
             )
 
-            print(f"Usuario creado con ID: {usuario_id}")
-            print(f"Usuario creado con ID: {datos_usuario}")
+            logger.info("Usuario creado con ID: %s (rol %s)", usuario_id, datos_usuario['rol'])
 
             if usuario_id:
                 if datos_usuario['rol'] == 'coach':
@@ -132,11 +153,7 @@ class UserController:
     
     def _email_existe(self, email):
         """Verifica si el email ya existe en la base de datos"""
-        usuarios = self.usuario_model.read_usuarios()
-        for usuario in usuarios:
-            if usuario[6] == email:  # email está en posición 6
-                return True
-        return False
+        return self.usuario_model.get_user_by_email(email) is not None
     
     def obtener_todos_usuarios(self):
         """Obtiene todos los usuarios"""
@@ -149,20 +166,15 @@ class UserController:
     def obtener_usuario_por_id(self, user_id):
         """Obtiene un usuario específico por ID"""
         try:
-            usuarios = self.usuario_model.read_usuarios()
-            for usuario in usuarios:
-                if usuario[0] == user_id:  # ID está en posición 0
-                    return usuario
-            return None
+            return self.usuario_model.get_user_by_id(user_id)
         except Exception as e:
-            print(f"Error al obtener usuario: {str(e)}")
+            logger.error("Error al obtener usuario: %s", e)
             return None
     
     def obtener_usuarios_por_rol(self, rol):
         """Obtiene usuarios filtrados por rol"""
         try:
-            usuarios = self.usuario_model.read_usuarios()
-            usuarios_filtrados = [u for u in usuarios if u[8] == rol]  # rol en posición 8
+            usuarios_filtrados = self.usuario_model.get_users_by_rol(rol)
             return {"success": True, "usuarios": usuarios_filtrados}
         except Exception as e:
             return {"success": False, "message": f"Error al filtrar usuarios: {str(e)}"}
@@ -272,20 +284,19 @@ class UserController:
     def validar_credenciales(self, email, password):
         """Valida las credenciales de login"""
         try:
-            usuarios = self.usuario_model.read_usuarios()
-            for usuario in usuarios:
-                if usuario[6] == email and usuario[9]:  # email y estado_activo (posición 9 CORRECTA)
-                    if self._verify_password(password, usuario[7]):  # contraseña
-                        return {
-                            "success": True,
-                            "usuario": {
-                                "id": usuario[0],
-                                "nombre": usuario[1],
-                                "apellido": usuario[2],
-                                "email": usuario[6],
-                                "rol": usuario[8]
-                            }
+            usuario = self.usuario_model.buscar_por_email(email)
+            if usuario and usuario[9]:  # estado_activo (posición 9 CORRECTA)
+                if self.verificar_password_usuario(usuario, password):
+                    return {
+                        "success": True,
+                        "usuario": {
+                            "id": usuario[0],
+                            "nombre": usuario[1],
+                            "apellido": usuario[2],
+                            "email": usuario[6],
+                            "rol": usuario[8]
                         }
+                    }
             
             return {"success": False, "message": "Credenciales incorrectas"}
             
@@ -1,5 +1,8 @@
+import argparse
+import logging
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
 
 import tkfontawesome as tkfa
@@ -11,8 +14,21 @@ from controllers.user_controller import UserController
 from controllers.atleta_controller import AtletaController
 from controllers.finance_controller import FinanceController 
 from controllers.coach_controller import CoachController
+from controllers.import_controller import ImportController
+from controllers.export_controller import ExportController
 from views.login_view import LoginView
-from models.database import Database
+from views.lazy_table import LazyTable
+from views.task_executor import TaskExecutor
+from views.search_index import SearchIndex, normalizar, unir
+from views.debouncer import Debouncer
+from views.progress_dialog import ProgressDialog
+from views.debug_consultas import PanelConsultas, instrumentar_callbacks_tk
+from models.database import Database, BACKEND_CONFIG
+from models.instrumentacion import instrumentacion, INSTRUMENTACION_CONFIG
+from models.registro import configurar_registro
+from models.migraciones import Migrador, MIGRACION_CONFIG, MIGRACIONES
+
+logger = logging.getLogger(__name__)
 
 
 class GimnasioApp:
@@ -29,8 +45,17 @@ class GimnasioApp:
         self.finance_controller = FinanceController() 
         self.coach_controller = CoachController()
         self.rutina_controller = RutinaController()
+        self.import_controller = ImportController()
+        self.export_controller = ExportController()
         self.db = Database()
         
+        # Consultas a la BD fuera del hilo de Tk
+        self.tareas = TaskExecutor(self.root, contexto=instrumentacion.accion)
+        
+        # Barrido periódico de membresías vencidas (ms)
+        self.intervalo_vencimientos = 60 * 60 * 1000
+        self._barrido_vencimientos = None
+        
         self.usuario_actual = None
         self.token_sesion = None
         
@@ -40,6 +65,8 @@ class GimnasioApp:
 
         self.iconos_cache = {}
         
+        self.barrer_vencimientos()
+        
     def crear_icono(self, nombre_icono, tamaño=16, color="black"):
         """
         Crea un icono de Font Awesome con cache para mejor rendimiento
@@ -51,7 +78,7 @@ class GimnasioApp:
                 icono = tkfa.icon_to_image(nombre_icono, scale_to_width=tamaño, fill=color)
                 self.iconos_cache[cache_key] = icono
             except Exception as e:
-                print(f"⚠️ Error creando icono '{nombre_icono}': {e}")
+                logger.warning("Error creando icono '%s': %s", nombre_icono, e)
                 return None
                 
         return self.iconos_cache[cache_key] 
@@ -285,15 +312,15 @@ class GimnasioApp:
         
     def inicializar_aplicacion(self):
         """Inicializa la aplicación verificando la conexión a BD"""
-        print("🏋️ === INICIANDO GIMNASIO ATHENAS ===")
+        logger.info("=== INICIANDO GIMNASIO ATHENAS ===")
         
         # Verificar conexión a base de datos
         if not self.verificar_conexion_bd():
             self.mostrar_error_conexion()
             return
         
-        print("✅ Conexión a BD establecida")
-        print("🔐 Cargando sistema de autenticación...")
+        logger.info("Conexión a BD establecida")
+        logger.info("Cargando sistema de autenticación...")
         
         # Cargar vista de login
         self.mostrar_login()
@@ -306,7 +333,7 @@ class GimnasioApp:
                 return True
             return False
         except Exception as e:
-            print(f"❌ Error de conexión BD: {e}")
+            logger.error("Error de conexión BD: %s", e)
             return False
     
     def mostrar_error_conexion(self):
@@ -377,11 +404,11 @@ class GimnasioApp:
             self.on_login_exitoso
         )
         
-        print("🔐 Vista de login cargada")
+        logger.info("Vista de login cargada")
     
     def on_login_exitoso(self, resultado_login):
         """Callback cuando el login es exitoso"""
-        print(f"✅ Login exitoso: {resultado_login['usuario']['nombre']}")
+        logger.info("Login exitoso: %s", resultado_login['usuario']['nombre'])
         
         # Guardar datos de sesión
         self.usuario_actual = resultado_login['usuario']
@@ -390,9 +417,47 @@ class GimnasioApp:
         # Cargar dashboard según el rol
         self.cargar_dashboard()
     
+    def barrer_vencimientos(self):
+        """
+        Revisa la cola de vencimientos en segundo plano. El barrido siguiente se
+        programa para cuando vence la cabeza de la cola (el inicio del día posterior
+        a su fecha), o dentro de `intervalo_vencimientos` si es antes, para ver los
+        cambios hechos desde otros puestos.
+        """
+        # El siguiente queda programado ya: si la tarea se descarta al cambiar de
+        # módulo (cancelar_todas), el barrido no se pierde
+        self._programar_barrido_vencimientos(self.intervalo_vencimientos)
+        self.tareas.ejecutar(
+            self.atleta_controller.actualizar_vencidos,
+            self._barrido_vencimientos_terminado,
+            lambda error: logger.error("Error en barrido de vencimientos: %s", error)
+        )
+    
+    def _barrido_vencimientos_terminado(self, resultado):
+        if not resultado["success"]:
+            logger.error("%s", resultado['message'])
+            return
+        if resultado["actualizados"]:
+            logger.info("%s", resultado['message'])
+        
+        proximo = resultado["proximo_vencimiento"]
+        if proximo is not None:
+            vence = datetime.combine(proximo + timedelta(days=1), datetime.min.time())
+            espera = int((vence - datetime.now()).total_seconds() * 1000)
+            if espera < self.intervalo_vencimientos:
+                self._programar_barrido_vencimientos(max(1000, espera))
+    
+    def _programar_barrido_vencimientos(self, espera):
+        if self._barrido_vencimientos is not None:
+            self.root.after_cancel(self._barrido_vencimientos)
+        self._barrido_vencimientos = self.root.after(espera, self.barrer_vencimientos)
+    
     def cargar_dashboard(self):
         """Carga el dashboard principal según el rol del usuario"""
-        print(f"📊 Cargando dashboard para rol: {self.usuario_actual['rol']}")
+        logger.info("Cargando dashboard para rol: %s", self.usuario_actual['rol'])
+        
+        # Descartar cargas pendientes de la vista anterior
+        self.tareas.cancelar_todas()
         
         # Limpiar ventana
         for widget in self.root.winfo_children():
@@ -468,7 +533,7 @@ class GimnasioApp:
             logo_label.pack()
             
         except Exception as e:
-            print(f"⚠️ No se pudo cargar el logo: {e}")
+            logger.warning("No se pudo cargar el logo: %s", e)
             logo_label = tk.Label(
                 logo_frame,
                 text="🏋️",
@@ -634,6 +699,21 @@ class GimnasioApp:
         spacer_frame = tk.Frame(self.menu_frame, bg='#FFFFFF')
         spacer_frame.pack(fill='both', expand=True)
 
+        if INSTRUMENTACION_CONFIG['activa']:
+            consultas_btn = ctk.CTkButton(
+                self.menu_frame,
+                text="Consultas (debug)",
+                anchor='center',
+                corner_radius=3,
+                fg_color='#555555',
+                hover_color='#777777',
+                text_color='white',
+                font=('Segoe UI', 12),
+                height=35,
+                command=lambda: PanelConsultas(self.root)
+            )
+            consultas_btn.pack(fill='x', pady=(15, 0))
+
         logout_icono = self.crear_icono("sign-out-alt", tamaño=16, color="white")
 
         logout_btn = ctk.CTkButton( 
@@ -754,6 +834,8 @@ class GimnasioApp:
     
     def limpiar_area_trabajo(self):
         """Limpia el área de trabajo de forma segura"""
+        # Las cargas del módulo anterior ya no tienen dónde mostrarse
+        self.tareas.cancelar_todas()
         try:
             if hasattr(self, 'work_frame') and self.work_frame and self.work_frame.winfo_exists():
                 for widget in self.work_frame.winfo_children():
@@ -778,6 +860,7 @@ class GimnasioApp:
         self.limpiar_area_trabajo()
         
         self.usuarios_data = []
+        self.usuarios_indice = SearchIndex([], str)
         self.usuario_seleccionado = None
         
         title_frame = ttk.Frame(self.work_frame)
@@ -824,7 +907,7 @@ class GimnasioApp:
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
         self.search_entry.pack(side='left', padx=(0, 10))
-        self.search_var.trace('w', self.filtrar_usuarios)
+        self.search_var.trace('w', Debouncer(self.search_entry, 150, self.filtrar_usuarios))
 
         filter_icon = self.crear_icono("filter", tamaño=16, color="#1F0E45")
         if filter_icon:
@@ -924,7 +1007,7 @@ class GimnasioApp:
         
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.usuarios_tree.yview)
-        self.usuarios_tree.configure(yscrollcommand=v_scrollbar.set)
+        self.usuarios_tabla = LazyTable(self.usuarios_tree, v_scrollbar, self._formatear_fila_usuario)
         
         # Empaquetar
         self.usuarios_tree.pack(side='left', fill='both', expand=True)
@@ -935,78 +1018,62 @@ class GimnasioApp:
         self.usuarios_tree.bind('<Double-1>', self.editar_usuario)
 
     def cargar_usuarios(self):
-        """Carga los usuarios desde la base de datos"""
-        try:
-            print("🔄 Cargando usuarios...")
-            
-            # Obtener usuarios del modelo
-            usuarios = self.auth_controller.usuario_model.read_usuarios()
-            
-            # Filtrar usuarios que NO sean atletas
-            usuarios_filtrados = [usuario for usuario in usuarios if usuario[8] != 'atleta']
-            
-            self.usuarios_data = usuarios_filtrados
-        
-            self.actualizar_tabla_usuarios()
-            
-        except Exception as e:
-            print(f"❌ Error cargando usuarios: {e}")
-            messagebox.showerror("Error", f"Error al cargar usuarios:\n{e}")
+        """Carga los usuarios desde la base de datos en segundo plano"""
+        logger.info("Cargando usuarios...")
+        self.tareas.ejecutar(
+            self.auth_controller.usuario_model.read_usuarios,
+            self._mostrar_usuarios_cargados,
+            lambda e: self._mostrar_error_carga("usuarios", e),
+            grupo='usuarios'
+        )
+
+    def _mostrar_usuarios_cargados(self, usuarios):
+        """Recibe los usuarios en el hilo de Tk y actualiza la tabla"""
+        # Filtrar usuarios que NO sean atletas
+        self.usuarios_data = [usuario for usuario in usuarios if usuario[8] != 'atleta']
+        self.usuarios_indice = SearchIndex(self.usuarios_data, lambda u: f"{u[1]} {u[2]} {u[6]}")
+        self.actualizar_tabla_usuarios()
+
+    def _mostrar_error_carga(self, modulo, error):
+        """Informa un error ocurrido al cargar datos en segundo plano"""
+        logger.error("Error cargando %s: %s", modulo, error)
+        messagebox.showerror("Error", f"Error al cargar {modulo}:\n{error}")
 
     def actualizar_tabla_usuarios(self, usuarios_filtrados=None):
-        """Actualiza la tabla con los usuarios"""
-        for item in self.usuarios_tree.get_children():
-            self.usuarios_tree.delete(item)
-        
+        """Actualiza la tabla con los usuarios (las filas se materializan al hacer scroll)"""
         usuarios = usuarios_filtrados if usuarios_filtrados is not None else self.usuarios_data
-        
-        
-        # Llenar tabla
-        for usuario in usuarios:
-            user_id = usuario[0]
-            nombre = usuario[1]
-            apellido = usuario[2]
-            email = usuario[6]
-            rol = usuario[8].replace('_', ' ').title()
-            estado = "Activo" if usuario[9] else "Inactivo"
-            try:
-                if usuario[12]:
-                    fecha_str = str(usuario[12])
-                    fecha = fecha_str[:10]  
-                else:
-                    fecha = "N/A"
-            except:
-                fecha = "N/A"
-            
-            item = self.usuarios_tree.insert('', 'end', values=(
-                user_id, nombre, apellido, email, rol, estado, fecha
-            ))
-
-            
-            
-            if not usuario[9]:
-                self.usuarios_tree.set(item, 'Estado', 'Inactivo')
+        self.usuarios_tabla.mostrar(usuarios)
+
+    def _formatear_fila_usuario(self, usuario):
+        """Valores de la fila de un usuario en la tabla"""
+        user_id = usuario[0]
+        nombre = usuario[1]
+        apellido = usuario[2]
+        email = usuario[6]
+        rol = usuario[8].replace('_', ' ').title()
+        estado = "Activo" if usuario[9] else "Inactivo"
+        try:
+            if usuario[12]:
+                fecha_str = str(usuario[12])
+                fecha = fecha_str[:10]  
             else:
-                self.usuarios_tree.set(item, 'Estado', 'Activo')
+                fecha = "N/A"
+        except:
+            fecha = "N/A"
+        
+        return (user_id, nombre, apellido, email, rol, estado, fecha)
 
     def filtrar_usuarios(self, *args):
         """Filtra usuarios según búsqueda y rol"""
-        search_text = self.search_var.get().lower()
+        search_text = self.search_var.get()
         rol_filter = self.rol_filter_var.get()
         
-        usuarios_filtrados = []
+        # Filtro de texto con el índice de la última carga
+        usuarios_filtrados = self.usuarios_indice.buscar(search_text)
         
-        for usuario in self.usuarios_data:
-            # Filtro de texto
-            texto_busqueda = f"{usuario[1]} {usuario[2]} {usuario[6]}".lower()
-            if search_text and search_text not in texto_busqueda:
-                continue
-            
-            # Filtro de rol
-            if rol_filter != "Todos" and usuario[8] != rol_filter:
-                continue
-            
-            usuarios_filtrados.append(usuario)
+        # Filtro de rol
+        if rol_filter != "Todos":
+            usuarios_filtrados = [usuario for usuario in usuarios_filtrados if usuario[8] == rol_filter]
         
         self.actualizar_tabla_usuarios(usuarios_filtrados)
 
@@ -1043,7 +1110,7 @@ class GimnasioApp:
         """Abre el formulario para editar el usuario seleccionado"""
 
         if not self.usuario_seleccionado:
-            print(self.usuario_seleccionado)
+            logger.debug("%s", self.usuario_seleccionado)
             messagebox.showwarning("Advertencia", "Selecciona un usuario para editar")
             return
         
@@ -1056,7 +1123,7 @@ class GimnasioApp:
         item = self.usuarios_tree.item(selection[0])
         user_id = item['values'][0]
 
-        print(f"id del USUARIOS {user_id}")
+        logger.debug("Cambiando estado del usuario %s", user_id)
 
         confirmar = messagebox.askyesno(
             "Confirmar Eliminación","¿Está seguro que desea eliminar el usuario seleccionado, esta acción es irreversible"
@@ -1323,6 +1390,8 @@ class GimnasioApp:
         self.limpiar_area_trabajo()
         
         self.atletas_data = []
+        self.atletas_indice = SearchIndex([], str)
+        self.coaches_nombres = {}
         self.atleta_seleccionado = None
         
         title_frame = tk.Frame(self.work_frame, bg='#FFFFFF')
@@ -1378,7 +1447,7 @@ class GimnasioApp:
         self.search_atletas_var = tk.StringVar()
         self.search_atletas_entry = ttk.Entry(search_frame, textvariable=self.search_atletas_var, width=25)
         self.search_atletas_entry.pack(side='left', padx=(0, 10))
-        self.search_atletas_var.trace('w', self.filtrar_atletas)
+        self.search_atletas_var.trace('w', Debouncer(self.search_atletas_entry, 150, self.filtrar_atletas))
         
         money_icon = self.crear_icono("dollar-sign", tamaño=14, color="black")
         if money_icon:
@@ -1461,6 +1530,24 @@ class GimnasioApp:
             state='disabled'
         )
         self.assign_coach_btn.pack(side='left', padx=2)
+        
+        import_icon = self.crear_icono("file-import", tamaño=16, color="black")
+        ttk.Button(
+            buttons_frame,
+            text="Importar CSV",
+            image=import_icon,
+            compound='left',
+            command=self.importar_atletas_csv
+        ).pack(side='left', padx=2)
+        
+        export_icon = self.crear_icono("file-export", tamaño=16, color="black")
+        ttk.Button(
+            buttons_frame,
+            text="Exportar",
+            image=export_icon,
+            compound='left',
+            command=lambda: self.exportar('atletas')
+        ).pack(side='left', padx=2)
 
     def crear_tabla_atletas(self):
         """Crea la tabla de atletas con Treeview"""
@@ -1495,7 +1582,7 @@ class GimnasioApp:
         self.atletas_tree.column('Vencimiento', width=100, anchor='center')
         
         v_scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.atletas_tree.yview)
-        self.atletas_tree.configure(yscrollcommand=v_scrollbar.set)
+        self.atletas_tabla = LazyTable(self.atletas_tree, v_scrollbar, self._formatear_fila_atleta)
         
         self.atletas_tree.pack(side='left', fill='both', expand=True)
         v_scrollbar.pack(side='right', fill='y')
@@ -1503,137 +1590,136 @@ class GimnasioApp:
         self.atletas_tree.bind('<<TreeviewSelect>>', self.on_atleta_selected)
 
     def cargar_atletas(self):
-        """Carga los atletas desde la base de datos"""
-        try:
-            print("🔄 Cargando atletas...")
-            
-            # Obtener atletas del controlador
-            resultado = self.atleta_controller.obtener_todos_atletas()
-            if not resultado["success"]:
-                messagebox.showerror("Error", resultado["message"])
-                return
-            
-            self.atletas_data = resultado["atletas"]
-            print(f"✅ Cargados {len(self.atletas_data)} atletas")
-            
-            # Cargar coaches para el filtro
-            self.cargar_coaches_filtro()
-            
-            # Actualizar tabla
-            self.actualizar_tabla_atletas()
-            
-        except Exception as e:
-            print(f"❌ Error cargando atletas: {e}")
-            messagebox.showerror("Error", f"Error al cargar atletas:\n{e}")
+        """Carga los atletas desde la base de datos en segundo plano"""
+        logger.info("Cargando atletas...")
+        self.tareas.ejecutar(
+            self._consultar_atletas,
+            self._mostrar_atletas_cargados,
+            lambda e: self._mostrar_error_carga("atletas", e),
+            grupo='atletas'
+        )
 
-    def cargar_coaches_filtro(self):
-        """Carga la lista de coaches para el filtro"""
-        try:
-            # Obtener coaches del user controller
-            resultado = self.user_controller.obtener_usuarios_por_rol('coach')
-            if resultado["success"]:
-                coaches = ["Todos", "Sin Coach"]
-                for coach in resultado["usuarios"]:
-                    coaches.append(f"{coach[1]} {coach[2]}")  # nombre apellido
-                self.coach_combo['values'] = coaches
-            else:
-                self.coach_combo['values'] = ["Todos", "Sin Coach"]
-        except Exception as e:
-            print(f"Error cargando coaches: {e}")
-            self.coach_combo['values'] = ["Todos", "Sin Coach"]
+    def _consultar_atletas(self):
+        """Atletas y mapa de coaches (se ejecuta fuera del hilo de Tk)"""
+        return self.atleta_controller.obtener_todos_atletas(), self._obtener_nombres_coaches()
 
+    def _mostrar_atletas_cargados(self, datos):
+        """Recibe los atletas en el hilo de Tk y actualiza filtro y tabla"""
+        resultado, coaches_nombres = datos
+        if not resultado["success"]:
+            messagebox.showerror("Error", resultado["message"])
+            return
+        
+        self.atletas_data = resultado["atletas"]
+        self.atletas_indice = SearchIndex(self.atletas_data, self._texto_busqueda_atleta)
+        logger.info("Cargados %s atletas", len(self.atletas_data))
+        
+        # Mapa id -> nombre de coaches (una sola consulta por recarga) y filtro
+        self.coaches_nombres = coaches_nombres
+        self.cargar_coaches_filtro()
+        
+        # Actualizar tabla
+        self.actualizar_tabla_atletas()
 
-    def _obtener_nombre_coach(self, coach_id):
-        """Obtiene el nombre del coach por su ID"""
+    def _obtener_nombres_coaches(self):
+        """Mapa id_coach -> nombre completo de los coaches activos"""
+        coaches_nombres = {}
         try:
             resultado = self.coach_controller.obtener_todos_coaches()
             if resultado["success"]:
                 for coach_completo in resultado["coaches"]:
-                    if coach_completo['coach_data'][0] == coach_id:
-                        usuario_data = coach_completo['usuario_data']
-                        return f"{usuario_data[1]} {usuario_data[2]}"  # nombre + apellido
-            return f"Coach ID: {coach_id}"
+                    coaches_nombres[coach_completo['coach_data'][0]] = coach_completo['nombre_completo']
         except Exception as e:
-            print(f"Error obteniendo nombre coach: {e}")
-            return f"Coach ID: {coach_id}"
+            logger.error("Error cargando coaches: %s", e)
+        return coaches_nombres
+
+    def cargar_coaches_filtro(self):
+        """Carga la lista de coaches del filtro a partir del mapa precalculado"""
+        coaches = ["Todos", "Sin Coach"]
+        coaches.extend(sorted(set(self.coaches_nombres.values())))
+        self.coach_combo['values'] = coaches
+
+
+    def _obtener_nombre_coach(self, coach_id, atleta_completo=None):
+        """Obtiene el nombre del coach por su ID desde el mapa precalculado"""
+        nombre = self.coaches_nombres.get(coach_id)
+        if nombre:
+            return nombre
+        # Coaches inactivos no están en el mapa: usar el nombre que trae la consulta de atletas
+        if atleta_completo and atleta_completo.get('nombre_coach'):
+            return atleta_completo['nombre_coach']
+        return f"Coach ID: {coach_id}"
 
     def actualizar_tabla_atletas(self, atletas_filtrados=None):
-        """Actualiza la tabla con los atletas"""
-        # Limpiar tabla
-        for item in self.atletas_tree.get_children():
-            self.atletas_tree.delete(item)
-        
+        """Actualiza la tabla con los atletas (las filas se materializan al hacer scroll)"""
         # Usar atletas filtrados o todos
         atletas = atletas_filtrados if atletas_filtrados is not None else self.atletas_data
+        self.atletas_tabla.mostrar(atletas)
+
+    def _formatear_fila_atleta(self, atleta_completo):
+        """Valores de la fila de un atleta en la tabla"""
+        atleta_data = atleta_completo['atleta_data']
+        usuario_data = atleta_completo['usuario_data']
         
-        # Llenar tabla
-        for atleta_completo in atletas:
-            try:
-                atleta_data = atleta_completo['atleta_data']
-                usuario_data = atleta_completo['usuario_data']
-                
-                atleta_id = atleta_data[0]
-                nombre = usuario_data[1]
-                apellido = usuario_data[2]
-                cedula = atleta_data[2] if len(atleta_data) > 2 else "N/A"
-                email = usuario_data[6]
-                
-                plan = f"Plan {atleta_data[5]}" if len(atleta_data) > 5 else "N/A"
-                
-                plan = f"Plan {atleta_data[7]}" if len(atleta_data) > 7 else "N/A"
+        atleta_id = atleta_data[0]
+        nombre = usuario_data[1]
+        apellido = usuario_data[2]
+        cedula = atleta_data[2] if len(atleta_data) > 2 else "N/A"
+        email = usuario_data[6]
+        
+        plan = atleta_completo.get('nombre_plan') or (f"Plan {atleta_data[7]}" if len(atleta_data) > 7 else "N/A")
 
-                coach_id = atleta_data[8] if len(atleta_data) > 8 else None 
-                coach_nombre = self._obtener_nombre_coach(coach_id) if coach_id else "Sin Coach"
+        coach_id = atleta_data[8] if len(atleta_data) > 8 else None 
+        coach_nombre = self._obtener_nombre_coach(coach_id, atleta_completo) if coach_id else "Sin Coach"
 
-                # Estado de solvencia
-                estado = atleta_data[9] if len(atleta_data) > 9 else "N/A"
-                
-                # Fecha de vencimiento
-                try:
-                    if len(atleta_data) > 7 and atleta_data[7]:
-                        if isinstance(atleta_data[7], str):
-                            vencimiento = atleta_data[7][:10]
-                        else:
-                            vencimiento = str(atleta_data[7])[:10]
-                    else:
-                        vencimiento = "N/A"
-                except:
-                    vencimiento = "N/A"
-                
-                # Insertar fila
-                item = self.atletas_tree.insert('', 'end', values=(
-                    atleta_id, nombre, apellido, cedula, email, plan, coach_nombre, estado, vencimiento
-                ))
-                
-                # Colorear según estado
-                if estado == 'vencido':
-                    self.atletas_tree.set(item, 'Estado', '🔴 Vencido')
-                elif estado == 'suspendido':
-                    self.atletas_tree.set(item, 'Estado', '⏸️ Suspendido')
+        # Estado de solvencia
+        estado = atleta_data[9] if len(atleta_data) > 9 else "N/A"
+        
+        # Fecha de vencimiento
+        try:
+            if len(atleta_data) > 7 and atleta_data[7]:
+                if isinstance(atleta_data[7], str):
+                    vencimiento = atleta_data[7][:10]
                 else:
-                    self.atletas_tree.set(item, 'Estado', '🟢 Solvente')
-                    
-            except Exception as e:
-                print(f"Error procesando atleta: {e}")
-                continue
+                    vencimiento = str(atleta_data[7])[:10]
+            else:
+                vencimiento = "N/A"
+        except:
+            vencimiento = "N/A"
+        
+        # Estado legible
+        if estado == 'vencido':
+            estado = '🔴 Vencido'
+        elif estado == 'suspendido':
+            estado = '⏸️ Suspendido'
+        else:
+            estado = '🟢 Solvente'
+        
+        return (atleta_id, nombre, apellido, cedula, email, plan, coach_nombre, estado, vencimiento)
+
+    def _texto_busqueda_atleta(self, atleta_completo):
+        """Texto buscable de un atleta: nombre, apellido, cédula y email"""
+        atleta_data = atleta_completo['atleta_data']
+        usuario_data = atleta_completo['usuario_data']
+        return unir(usuario_data[1], usuario_data[2], atleta_data[2], usuario_data[6])
 
     def filtrar_atletas(self, *args):
         """Filtra atletas según búsqueda y filtros"""
-        search_text = self.search_atletas_var.get().lower()
+        search_text = self.search_atletas_var.get()
         estado_filter = self.estado_filter_var.get()
         coach_filter = self.coach_filter_var.get()
         
+        # Filtro de texto con el índice de la última carga
+        candidatos = self.atletas_indice.buscar(search_text)
+        if estado_filter == "Todos" and coach_filter == "Todos":
+            self.actualizar_tabla_atletas(candidatos)
+            return
+        
         atletas_filtrados = []
         
-        for atleta_completo in self.atletas_data:
+        for atleta_completo in candidatos:
             try:
                 atleta_data = atleta_completo['atleta_data']
-                usuario_data = atleta_completo['usuario_data']
-                
-                # Filtro de texto
-                texto_busqueda = f"{usuario_data[1]} {usuario_data[2]} {atleta_data[2]} {usuario_data[6]}".lower()
-                if search_text and search_text not in texto_busqueda:
-                    continue
                 
                 # Filtro de estado
                 if estado_filter != "Todos":
@@ -1644,15 +1730,16 @@ class GimnasioApp:
                 # Filtro de coach
                 if coach_filter != "Todos":
                     coach_id = atleta_data[8] if len(atleta_data) > 8 else None
-                    if coach_filter == "Sin Coach" and coach_id:
-                        continue
-                    elif coach_filter != "Sin Coach" and not coach_id:
+                    if coach_filter == "Sin Coach":
+                        if coach_id:
+                            continue
+                    elif not coach_id or self._obtener_nombre_coach(coach_id, atleta_completo) != coach_filter:
                         continue
                 
                 atletas_filtrados.append(atleta_completo)
                 
             except Exception as e:
-                print(f"Error filtrando atleta: {e}")
+                logger.error("Error filtrando atleta: %s", e)
                 continue
         
         self.actualizar_tabla_atletas(atletas_filtrados)
@@ -1682,6 +1769,126 @@ class GimnasioApp:
             self.assign_coach_btn.config(state='disabled')
             self.atleta_seleccionado = None
 
+    def importar_atletas_csv(self):
+        """Importa atletas desde un CSV (columnas en ImportController.importar_atletas)"""
+        self._importar_csv("atletas", self.import_controller.importar_atletas,
+                           lambda: self.atletas_tree.winfo_exists() and self.cargar_atletas())
+
+    def importar_pagos_csv(self):
+        """Importa pagos históricos desde un CSV (columnas en ImportController.importar_ingresos)"""
+        self._importar_csv("pagos", self.import_controller.importar_ingresos,
+                           lambda: self.pagos_tree.winfo_exists() and self.cargar_pagos())
+
+    def _importar_csv(self, modulo, importar, recargar):
+        ruta = filedialog.askopenfilename(
+            title=f"Importar {modulo}",
+            filetypes=[("Archivos CSV", "*.csv"), ("Todos los archivos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        usuario_id = self.usuario_actual['id']
+        logger.info("Importando %s desde %s...", modulo, ruta)
+        # Modal como la exportación: no se puede cambiar de módulo (cancelar_todas
+        # descartaría el informe) y el botón Cancelar detiene antes del lote siguiente
+        dialogo = ProgressDialog(self.root, f"Importando {modulo}")
+        
+        def al_fallar(error):
+            dialogo.cerrar()
+            self._mostrar_error_carga(f"la importación de {modulo}", error)
+        
+        self.tareas.ejecutar(
+            lambda: importar(ruta, usuario_id, al_progresar=dialogo.progreso, cancelado=dialogo.cancelado),
+            lambda resultado: self._mostrar_resultado_importacion(dialogo, modulo, resultado, recargar),
+            al_fallar
+        )
+
+    def _mostrar_resultado_importacion(self, dialogo, modulo, resultado, recargar):
+        dialogo.cerrar()
+        if not resultado["success"]:
+            messagebox.showerror("Error", resultado["message"])
+            return
+        
+        logger.info("%s", resultado['message'])
+        detalle = resultado["message"]
+        rechazadas = resultado["rechazadas"]
+        if rechazadas:
+            lineas = [f"Línea {r['linea']}: {r['motivo']}" for r in rechazadas[:10]]
+            if len(rechazadas) > 10:
+                lineas.append(f"... y {len(rechazadas) - 10} más")
+            detalle += "\n\nFilas rechazadas:\n" + "\n".join(lineas)
+        messagebox.showinfo(f"Importación de {modulo}", detalle)
+        
+        try:
+            recargar()
+        except tk.TclError:
+            # El usuario ya cambió de módulo
+            pass
+
+    def _exportar_pagos_action(self):
+        filtros = self._obtener_filtros_pagos()
+        self.exportar('pagos', filtros.get('fecha_inicio'), filtros.get('fecha_fin'))
+
+    def _exportar_egresos_action(self):
+        rango = self._leer_rango_fechas(self.egresos_desde_var, self.egresos_hasta_var)
+        if rango:
+            self.exportar('egresos', *rango)
+
+    def _exportar_reporte_action(self):
+        rango = self._leer_rango_fechas(self.reporte_fecha_desde_var, self.reporte_fecha_hasta_var)
+        if rango:
+            self.exportar('reporte', *rango)
+
+    def _leer_rango_fechas(self, desde_var, hasta_var):
+        """(desde, hasta) como fechas (None si el campo está vacío), o None si son inválidas"""
+        try:
+            desde = desde_var.get().strip()
+            hasta = hasta_var.get().strip()
+            desde = datetime.strptime(desde, '%Y-%m-%d').date() if desde else None
+            hasta = datetime.strptime(hasta, '%Y-%m-%d').date() if hasta else None
+        except ValueError:
+            messagebox.showerror("Error de Formato", "Formato de fecha inválido. Use YYYY-MM-DD")
+            return None
+        
+        if desde and hasta and desde > hasta:
+            messagebox.showerror("Error de Fechas", "La fecha 'Desde' no puede ser posterior a la fecha 'Hasta'.")
+            return None
+        return desde, hasta
+
+    def exportar(self, tipo, fecha_inicio=None, fecha_fin=None):
+        """Exporta a CSV o XLSX en segundo plano mostrando el progreso"""
+        ruta = filedialog.asksaveasfilename(
+            title=f"Exportar {tipo}",
+            defaultextension='.csv',
+            initialfile=f"{tipo}_{datetime.now().strftime('%Y%m%d')}.csv",
+            filetypes=[("Archivos CSV", "*.csv"), ("Libro de Excel", "*.xlsx")]
+        )
+        if not ruta:
+            return
+        
+        dialogo = ProgressDialog(self.root, f"Exportando {tipo}")
+        
+        def al_fallar(error):
+            dialogo.cerrar()
+            self._mostrar_error_carga(f"la exportación de {tipo}", error)
+        
+        self.tareas.ejecutar(
+            lambda: self.export_controller.exportar(
+                tipo, ruta, fecha_inicio, fecha_fin,
+                al_progresar=dialogo.progreso, cancelado=dialogo.cancelado
+            ),
+            lambda resultado: self._exportacion_terminada(dialogo, resultado),
+            al_fallar
+        )
+
+    def _exportacion_terminada(self, dialogo, resultado):
+        dialogo.cerrar()
+        if resultado["success"]:
+            logger.info("%s", resultado['message'])
+            messagebox.showinfo("Exportación", resultado["message"])
+        elif not resultado.get("cancelado"):
+            messagebox.showerror("Error", resultado["message"])
+
     def registrar_atleta(self):
         """Abre el formulario para registrar un nuevo atleta"""
         self.abrir_formulario_atleta(modo='registrar')
@@ -2314,6 +2521,7 @@ class GimnasioApp:
         self.limpiar_area_trabajo()
         
         self.coaches_data = []
+        self.atletas_por_coach = {}
         self.coach_seleccionado = None
         
         title_frame = ttk.Frame(self.work_frame)
@@ -2681,33 +2889,39 @@ class GimnasioApp:
             messagebox.showerror("Error", resultado["message"])
 
     def cargar_coaches(self):
-        """Carga los coaches desde la base de datos"""
-        try:
-            print("🔄 Cargando coaches...")
-            
-            # Obtener coaches del controlador
-            resultado = self.coach_controller.obtener_todos_coaches()
-            if not resultado["success"]:
-                messagebox.showerror("Error", resultado["message"])
-                return
-            
-            self.coaches_data = resultado["coaches"]
-            print(f"✅ Cargados {len(self.coaches_data)} coaches")
-            
-            # Actualizar tabla
-            self.actualizar_tabla_coaches()
-            
-        except Exception as e:
-            print(f"❌ Error cargando coaches: {e}")
-            messagebox.showerror("Error", f"Error al cargar coaches:\n{e}")
+        """Carga los coaches desde la base de datos en segundo plano"""
+        logger.info("Cargando coaches...")
+        self.tareas.ejecutar(
+            self._consultar_coaches,
+            self._mostrar_coaches_cargados,
+            lambda e: self._mostrar_error_carga("coaches", e),
+            grupo='coaches'
+        )
+
+    def _consultar_coaches(self):
+        """Coaches y atletas asignados a cada uno (se ejecuta fuera del hilo de Tk)"""
+        resultado = self.coach_controller.obtener_todos_coaches()
+        atletas_por_coach = self.coach_controller.contar_atletas_por_coach()
+        return resultado, atletas_por_coach
+
+    def _mostrar_coaches_cargados(self, datos):
+        """Recibe los coaches en el hilo de Tk y actualiza la tabla"""
+        resultado, atletas_por_coach = datos
+        if not resultado["success"]:
+            messagebox.showerror("Error", resultado["message"])
+            return
+        
+        self.coaches_data = resultado["coaches"]
+        self.atletas_por_coach = atletas_por_coach
+        logger.info("Cargados %s coaches", len(self.coaches_data))
+        
+        # Actualizar tabla
+        self.actualizar_tabla_coaches()
 
     def _obtener_atletas_por_coach_directo(self, coach_id):
         """Obtiene atletas asignados a un coach específico"""
         try:
-            from controllers.atleta_controller import AtletaController
-            atleta_controller = AtletaController()
-            
-            resultado = atleta_controller.obtener_todos_atletas()
+            resultado = self.atleta_controller.obtener_atletas_completos_por_coach(coach_id)
             if not resultado["success"]:
                 return {"success": False, "atletas": []}
             
@@ -2717,24 +2931,21 @@ class GimnasioApp:
                 atleta_data = atleta_completo['atleta_data']
                 usuario_data = atleta_completo['usuario_data']
                 
-                coach_atleta_id = atleta_data[8] if len(atleta_data) > 8 else None
-                
-                if coach_atleta_id == coach_id:
-                    atletas_del_coach.append({
-                        'nombre_completo': f"{usuario_data[1]} {usuario_data[2]}",
-                        'email': usuario_data[6],
-                        'cedula': atleta_data[2] if len(atleta_data) > 2 else "N/A",
-                        'fecha_inscripcion': atleta_data[5] if len(atleta_data) > 5 else "N/A",  # fecha_inscripcion (índice 5)
-                        'meta_largo_plazo': atleta_data[9] if len(atleta_data) > 9 else "No especificada",
-                        'valoracion_especiales': atleta_data[10] if len(atleta_data) > 10 else "No especificada",
-                        'estado_solvencia': atleta_data[11] if len(atleta_data) > 11 else "N/A",
-                        'estado_activo': True
-                    })
+                atletas_del_coach.append({
+                    'nombre_completo': f"{usuario_data[1]} {usuario_data[2]}",
+                    'email': usuario_data[6],
+                    'cedula': atleta_data[2] if len(atleta_data) > 2 else "N/A",
+                    'fecha_inscripcion': atleta_data[5] if len(atleta_data) > 5 else "N/A",  # fecha_inscripcion (índice 5)
+                    'meta_largo_plazo': atleta_data[9] if len(atleta_data) > 9 else "No especificada",
+                    'valoracion_especiales': atleta_data[10] if len(atleta_data) > 10 else "No especificada",
+                    'estado_solvencia': atleta_data[11] if len(atleta_data) > 11 else "N/A",
+                    'estado_activo': True
+                })
             
             return {"success": True, "atletas": atletas_del_coach}
             
         except Exception as e:
-            print(f"Error: {e}")
+            logger.error("Error obteniendo atletas del coach: %s", e)
             return {"success": False, "atletas": []}
 
     def _generar_reporte_coach_directo(self, coach_id):
@@ -2815,8 +3026,8 @@ class GimnasioApp:
                 especialidades = coach_data[2] if coach_data[2] else "No especificado"
                 salario = f"${coach_data[5]:.2f}" if coach_data[5] else "$0.00"
                 
-                # Contar atletas asignados
-                atletas_asignados = self.contar_atletas_asignados(coach_id)
+                # Atletas asignados (contados al cargar los coaches)
+                atletas_asignados = self.atletas_por_coach.get(coach_id, 0)
                 
                 # Fecha de contratación
                 try:
@@ -2840,44 +3051,12 @@ class GimnasioApp:
                 ))
                     
             except Exception as e:
-                print(f"Error procesando coach: {e}")
+                logger.error("Error procesando coach: %s", e)
                 continue
 
     def contar_atletas_asignados(self, coach_id):
         """Cuenta cuántos atletas tiene asignados un coach"""
-        try:
-            print(f"🔍 DEBUG: Buscando atletas para coach_id: {coach_id} (tipo: {type(coach_id)})")
-            
-            # Obtener todos los atletas
-            resultado = self.atleta_controller.obtener_todos_atletas()
-            print(f"🔍 DEBUG: Resultado obtener_todos_atletas: {resultado['success']}")
-            
-            if not resultado["success"]:
-                return 0
-            
-            print(f"🔍 DEBUG: Total atletas encontrados: {len(resultado['atletas'])}")
-            
-            # Contar atletas con este coach
-            contador = 0
-            for i, atleta_completo in enumerate(resultado["atletas"]):
-                atleta_data = atleta_completo['atleta_data']
-                print(f"🔍 DEBUG: Atleta {i}: {atleta_data}")
-                
-                coach_atleta_id = atleta_data[8] if len(atleta_data) > 8 else None
-                print(f"🔍 DEBUG: coach_atleta_id: {coach_atleta_id} (tipo: {type(coach_atleta_id)})")
-                
-                if coach_atleta_id == coach_id:
-                    print(f"✅ MATCH: Atleta {i} pertenece al coach {coach_id}")
-                    contador += 1
-                else:
-                    print(f"❌ NO MATCH: {coach_atleta_id} != {coach_id}")
-            
-            print(f"🔍 DEBUG: Contador final: {contador}")
-            return contador
-            
-        except Exception as e:
-            print(f"Error contando atletas: {e}")
-            return 0
+        return self.coach_controller.contar_atletas_asignados(coach_id)
     
     def filtrar_coaches(self, *args):
         """Filtra coaches según búsqueda"""
@@ -2901,7 +3080,7 @@ class GimnasioApp:
                     coaches_filtrados.append(coach_completo)
                     
             except Exception as e:
-                print(f"Error filtrando coach: {e}")
+                logger.error("Error filtrando coach: %s", e)
                 continue
         
         self.actualizar_tabla_coaches(coaches_filtrados)
@@ -2922,6 +3101,10 @@ class GimnasioApp:
         self.limpiar_area_trabajo()
         
         self.pagos_data = []
+        self.pagos_filtros = {}
+        self.pagos_siguiente = None
+        self.pagos_por_pagina = 100
+        self.pagos_indice = None
         self.pago_seleccionado = None
         
         title_frame = ttk.Frame(self.work_frame)
@@ -2973,7 +3156,7 @@ class GimnasioApp:
         self.search_pagos_var = tk.StringVar()
         search_entry = ttk.Entry(filter_frame, textvariable=self.search_pagos_var, width=20)
         search_entry.pack(side='left', padx=(0, 15))
-        self.search_pagos_var.trace('w', self.filtrar_pagos)
+        self.search_pagos_var.trace('w', Debouncer(search_entry, 300, self.filtrar_pagos))
 
         ttk.Label(filter_frame, text="Tipo Pago:").pack(side='left', padx=(0, 5))
         self.tipo_pago_filter_var = tk.StringVar(value="Todos")
@@ -3020,15 +3203,29 @@ class GimnasioApp:
         delete_icon = self.crear_icono("trash-alt", tamaño=16, color="black")
         self.delete_pago_btn = ttk.Button(buttons_right, text="Eliminar", image=delete_icon, compound='left', command=self._eliminar_pago_action, state='disabled')
         self.delete_pago_btn.pack(side='left', padx=5)
+
+        import_icon = self.crear_icono("file-import", tamaño=16, color="black")
+        ttk.Button(buttons_right, text="Importar CSV", image=import_icon, compound='left', command=self.importar_pagos_csv).pack(side='left', padx=5)
+
+        export_icon = self.crear_icono("file-export", tamaño=16, color="black")
+        ttk.Button(buttons_right, text="Exportar", image=export_icon, compound='left', command=self._exportar_pagos_action).pack(side='left', padx=5)
    
     def cargar_pagos(self):
-        """Carga todos los pagos usando el controlador - VERSIÓN OPTIMIZADA"""
+        """Carga la primera página de pagos con los filtros actuales - VERSIÓN OPTIMIZADA"""
         try:
             # Mostrar indicador de carga
             self._mostrar_loading_pagos()
             
-            # Usar after para no bloquear la UI
-            self.root.after(50, self._cargar_pagos_async)
+            # Filtros y orden se resuelven en la BD; el resto de páginas llega al hacer scroll
+            self.pagos_filtros = self._obtener_filtros_pagos()
+            self.pagos_indice = None
+            filtros = self.pagos_filtros
+            self.tareas.ejecutar(
+                lambda: self.finance_controller.obtener_ingresos_pagina(self.pagos_por_pagina, **filtros),
+                self._mostrar_pagos_cargados,
+                self._mostrar_error_pagos,
+                grupo='pagos'
+            )
             
         except Exception as e:
             messagebox.showerror("Error", f"Error crítico al cargar pagos: {e}")
@@ -3051,7 +3248,7 @@ class GimnasioApp:
         self.pagos_tree.column('Monto', anchor='center')
 
         v_scroll = ttk.Scrollbar(table_frame, orient='vertical', command=self.pagos_tree.yview)
-        self.pagos_tree.configure(yscrollcommand=v_scroll.set)
+        self.pagos_tabla = LazyTable(self.pagos_tree, v_scroll, self._formatear_fila_pago)
         
         self.pagos_tree.pack(side='left', fill='both', expand=True)
         v_scroll.pack(side='right', fill='y')
@@ -3074,56 +3271,113 @@ class GimnasioApp:
     def _mostrar_loading_pagos(self):
         """Muestra indicador de carga en la tabla"""
         # Limpiar tabla
-        for item in self.pagos_tree.get_children():
-            self.pagos_tree.delete(item)
+        self.pagos_tabla.limpiar()
         
         # Mostrar mensaje de carga
         self.pagos_tree.insert('', 'end', values=("", "", "🔄 Cargando pagos...", "", "", "", "", "", ""))
 
-    def _cargar_pagos_async(self):
-        """Carga los pagos de forma asíncrona"""
-        try:
-            resultado = self.finance_controller.obtener_ingresos_detallados()
-            if resultado['success']:
-                self.pagos_data = resultado['ingresos']
-                self.actualizar_tabla_pagos()
-                print(f"✅ Cargados {len(self.pagos_data)} registros de pago.")
-            else:
-                # Limpiar tabla si hay error
-                for item in self.pagos_tree.get_children():
-                    self.pagos_tree.delete(item)
-                messagebox.showerror("Error", f"No se pudieron cargar los pagos: {resultado['message']}")
-        except Exception as e:
+    def _mostrar_pagos_cargados(self, resultado):
+        """Recibe la primera página de pagos en el hilo de Tk y actualiza la tabla"""
+        if resultado['success']:
+            self.pagos_data = resultado['ingresos']
+            self.pagos_siguiente = resultado['siguiente']
+            self._indexar_pagos()
+            self.actualizar_tabla_pagos()
+            logger.info("Cargados %s registros de pago.", len(self.pagos_data))
+        else:
             # Limpiar tabla si hay error
-            for item in self.pagos_tree.get_children():
-                self.pagos_tree.delete(item)
-            messagebox.showerror("Error", f"Error crítico al cargar pagos: {e}")
+            self.pagos_tabla.limpiar()
+            messagebox.showerror("Error", f"No se pudieron cargar los pagos: {resultado['message']}")
+
+    def _mostrar_error_pagos(self, error):
+        """Limpia la tabla e informa un error crítico al cargar pagos"""
+        self.pagos_tabla.limpiar()
+        messagebox.showerror("Error", f"Error crítico al cargar pagos: {error}")
 
     def actualizar_tabla_pagos(self, pagos_filtrados=None):
-        """Limpia y rellena la tabla de pagos con los datos proporcionados"""
-        for item in self.pagos_tree.get_children():
-            self.pagos_tree.delete(item)
-
-        pagos_a_mostrar = pagos_filtrados if pagos_filtrados is not None else self.pagos_data
-
-        for pago in pagos_a_mostrar:
-            monto_formateado = f"${pago['monto']:.2f}"
-            values = (
-                pago['id_pago'],
-                pago['fecha_pago'],
-                pago['nombre_atleta'],
-                pago['nombre_plan'],
-                monto_formateado,
-                pago['tipo_pago'],
-                pago['metodo_pago'],
-                pago['nombre_procesador'],
-                pago['descripcion']
-            )
-            self.pagos_tree.insert('', 'end', values=values)
+        """Limpia y rellena la tabla de pagos (las filas se materializan al hacer scroll)"""
+        if pagos_filtrados is not None:
+            self.pagos_tabla.mostrar(pagos_filtrados)
+            return
+        
+        # La tabla comparte la lista self.pagos_data y la amplía con cada página nueva
+        cargar_mas = self._pedir_pagina_pagos if self.pagos_siguiente else None
+        self.pagos_tabla.mostrar(self.pagos_data, cargar_mas=cargar_mas)
+
+    def _pedir_pagina_pagos(self):
+        """Pide en segundo plano la página siguiente de pagos (la tabla la recibe con agregar)"""
+        filtros = self.pagos_filtros
+        despues_de = self.pagos_siguiente
+        self.tareas.ejecutar(
+            lambda: self.finance_controller.obtener_ingresos_pagina(self.pagos_por_pagina, despues_de=despues_de, **filtros),
+            self._agregar_pagina_pagos,
+            self._mostrar_error_pagos,
+            grupo='pagos'
+        )
+        return None
+
+    def _agregar_pagina_pagos(self, resultado):
+        """Agrega a la tabla una página de pagos recibida en el hilo de Tk"""
+        if not resultado['success']:
+            self.pagos_tabla.agregar([], hay_mas=False)
+            messagebox.showerror("Error", f"No se pudieron cargar más pagos: {resultado['message']}")
+            return
+        
+        self.pagos_siguiente = resultado['siguiente']
+        self.pagos_tabla.agregar(resultado['ingresos'], hay_mas=self.pagos_siguiente is not None)
+        self.pagos_data = self.pagos_tabla.registros()
+        self._indexar_pagos()
+
+    def _indexar_pagos(self):
+        """Índice de búsqueda sobre los pagos cargados, solo si ya están todas las páginas"""
+        if self.pagos_siguiente is None:
+            self.pagos_indice = SearchIndex(self.pagos_data, lambda p: unir(p['nombre_atleta'], p['descripcion']))
+        else:
+            self.pagos_indice = None
+
+    def _formatear_fila_pago(self, pago):
+        """Valores de la fila de un pago en la tabla"""
+        monto_formateado = f"${pago['monto']:.2f}"
+        return (
+            pago['id_pago'],
+            pago['fecha_pago'],
+            pago['nombre_atleta'],
+            pago['nombre_plan'],
+            monto_formateado,
+            pago['tipo_pago'],
+            pago['metodo_pago'],
+            pago['nombre_procesador'],
+            pago['descripcion']
+        )
    
     def filtrar_pagos(self, *args):
         """Filtra los pagos según los criterios de búsqueda y filtros - VERSIÓN OPTIMIZADA"""
-        search_text = self.search_pagos_var.get().lower()
+        filtros = self._obtener_filtros_pagos()
+        
+        # Si solo se extendió el texto y ya están todos los pagos de la consulta anterior,
+        # se filtra ese resultado en memoria en lugar de volver a la BD
+        if self._puede_refinar_pagos(filtros):
+            self.actualizar_tabla_pagos(self.pagos_indice.buscar(filtros.get('texto', '')))
+            return
+        
+        # Los filtros se aplican en la consulta: se vuelve a pedir la primera página
+        self.cargar_pagos()
+
+    def _puede_refinar_pagos(self, filtros):
+        """True si `filtros` solo agrega texto a la búsqueda de los pagos ya cargados"""
+        if self.pagos_indice is None:
+            return False
+        
+        otros_actuales = {k: v for k, v in self.pagos_filtros.items() if k != 'texto'}
+        otros_nuevos = {k: v for k, v in filtros.items() if k != 'texto'}
+        if otros_actuales != otros_nuevos:
+            return False
+        
+        return normalizar(self.pagos_filtros.get('texto', '')) in normalizar(filtros.get('texto', ''))
+
+    def _obtener_filtros_pagos(self):
+        """Filtros de la vista de pagos en el formato de obtener_ingresos_pagina"""
+        search_text = self.search_pagos_var.get().strip()
         tipo_pago_filter = self.tipo_pago_filter_var.get()
         
         fecha_desde = None
@@ -3143,37 +3397,21 @@ class GimnasioApp:
         except (ValueError, AttributeError):
             fecha_hasta = None
 
-        pagos_filtrados = []
-        for pago in self.pagos_data:
-            # Filtro por fecha (solo si ambas fechas son válidas)
-            if fecha_desde and fecha_hasta:
-                try:
-                    if not (fecha_desde <= pago['fecha_pago'] <= fecha_hasta):
-                        continue
-                except (TypeError, KeyError):
-                    # Si hay problema con la fecha del pago, incluirlo
-                    pass
-            
-            # Filtro por tipo de pago
-            if tipo_pago_filter != "Todos":
-                try:
-                    if tipo_pago_filter.lower() not in pago['tipo_pago'].lower():
-                        continue
-                except (KeyError, AttributeError):
-                    continue
-
-            # Filtro por texto de búsqueda
-            if search_text:
-                try:
-                    texto_busqueda = f"{pago['nombre_atleta']} {pago['descripcion']}".lower()
-                    if search_text not in texto_busqueda:
-                        continue
-                except (KeyError, AttributeError):
-                    continue
-
-            pagos_filtrados.append(pago)
+        filtros = {}
+        # Filtro por fecha (solo si ambas fechas son válidas)
+        if fecha_desde and fecha_hasta:
+            filtros['fecha_inicio'] = fecha_desde
+            filtros['fecha_fin'] = fecha_hasta
+        
+        # Filtro por tipo de pago ("Servicio Extra" -> servicio_extra)
+        if tipo_pago_filter and tipo_pago_filter != "Todos":
+            filtros['tipo_pago'] = tipo_pago_filter.lower().replace(' ', '_')
+        
+        # Filtro por texto de búsqueda (atleta o descripción)
+        if search_text:
+            filtros['texto'] = search_text
         
-        self.actualizar_tabla_pagos(pagos_filtrados)
+        return filtros
 
     def on_pago_selected(self, event):
         """Maneja la selección de un pago en la tabla y activa/desactiva botones."""
@@ -3345,6 +3583,9 @@ class GimnasioApp:
         ttk.Button(dates_frame, text="📈 Generar Reporte", 
                 command=self._generar_y_mostrar_reporte_action).pack(side='left', padx=(20, 0))
 
+        ttk.Button(dates_frame, text="💾 Exportar", 
+                command=self._exportar_reporte_action).pack(side='left', padx=(10, 0))
+
        
 
         resumen_frame = tk.Frame(self.work_frame, bg='#dcdad5', relief='raised', bd=0)
@@ -3414,13 +3655,17 @@ class GimnasioApp:
 
         self._mostrar_loading_reporte()
         
-        self.root.after(50, lambda: self._ejecutar_reporte_async(fecha_inicio, fecha_fin))   
+        # El reporte se calcula en segundo plano; uno nuevo descarta al anterior
+        self.tareas.ejecutar(
+            lambda: self.finance_controller.generar_reporte_financiero(fecha_inicio, fecha_fin),
+            self._mostrar_reporte,
+            lambda e: messagebox.showerror("Error Crítico", f"Ocurrió un error al procesar el reporte: {e}"),
+            grupo='reporte'
+        )
 
-    def _ejecutar_reporte_async(self, fecha_inicio, fecha_fin):
-        """Ejecuta el reporte de forma asíncrona"""
+    def _mostrar_reporte(self, resultado):
+        """Recibe el reporte en el hilo de Tk y actualiza resumen y detalles"""
         try:
-            resultado = self.finance_controller.generar_reporte_financiero(fecha_inicio, fecha_fin)
-
             if not resultado['success']:
                 messagebox.showerror("Error al generar reporte", resultado['message'])
                 return
@@ -3448,9 +3693,8 @@ class GimnasioApp:
                 self.reporte_detalles_tree.insert('', 'end', values=("📉 EGRESO", tipo_legible, f"${monto:.2f}"))
 
         except Exception as e:
+            logger.exception("Error al procesar el reporte: %s", e)
             messagebox.showerror("Error Crítico", f"Ocurrió un error al procesar el reporte: {e}")
-            import traceback
-            traceback.print_exc()
     
      # ==================== OTRA GESTION ====================       
 
@@ -3470,7 +3714,7 @@ class GimnasioApp:
             self._mostrar_error_no_coach()
             return
         
-        print(f"✅ Coach ID: {self.coach_actual_id} - Cargando vista completa")
+        logger.info("Coach ID: %s - Cargando vista completa", self.coach_actual_id)
         
         # PASO 2: Título del módulo
         title_frame = ttk.Frame(self.work_frame)
@@ -3514,31 +3758,32 @@ class GimnasioApp:
                 messagebox.showerror("Error", "No se pudo identificar el coach")
                 return
                 
-            print(f"🔄 Cargando atletas del coach ID: {self.coach_actual_id}")
-            
-            # Obtener todos los atletas y filtrar
-            resultado = self.atleta_controller.obtener_todos_atletas()
-            if not resultado["success"]:
-                messagebox.showerror("Error", "No se pudieron cargar los atletas")
-                return
-            
-            # Filtrar solo mis atletas
-            self.mis_atletas_data = []
+            logger.info("Cargando atletas del coach ID: %s", self.coach_actual_id)
             
-            for atleta_completo in resultado["atletas"]:
-                atleta_data = atleta_completo['atleta_data']
-                coach_atleta_id = atleta_data[8] if len(atleta_data) > 8 else None
-                
-                if coach_atleta_id == self.coach_actual_id:
-                    self.mis_atletas_data.append(atleta_completo)
-            
-            print(f"✅ Cargados {len(self.mis_atletas_data)} atletas asignados")
-            self.actualizar_tabla_mis_atletas()
+            # Solo mis atletas, filtrados en la consulta (en segundo plano)
+            coach_id = self.coach_actual_id
+            self.tareas.ejecutar(
+                lambda: self.atleta_controller.obtener_atletas_completos_por_coach(coach_id),
+                self._mostrar_mis_atletas_cargados,
+                lambda e: self._mostrar_error_carga("atletas", e),
+                grupo='mis_atletas'
+            )
             
         except Exception as e:
-            print(f"❌ Error cargando mis atletas: {e}")
+            logger.error("Error cargando mis atletas: %s", e)
             messagebox.showerror("Error", f"Error al cargar atletas:\n{e}")
 
+    def _mostrar_mis_atletas_cargados(self, resultado):
+        """Recibe los atletas del coach en el hilo de Tk y actualiza la tabla"""
+        if not resultado["success"]:
+            messagebox.showerror("Error", "No se pudieron cargar los atletas")
+            return
+        
+        self.mis_atletas_data = resultado["atletas"]
+        
+        logger.info("Cargados %s atletas asignados", len(self.mis_atletas_data))
+        self.actualizar_tabla_mis_atletas()
+
 
 
     def ver_progreso_atleta(self):
@@ -3656,31 +3901,27 @@ class GimnasioApp:
     def _obtener_coach_id_usuario_actual(self):
         """Obtiene el coach_id del usuario actual - VERSIÓN CON MÁS DEBUG"""
         try:
-            print(f"🔍 DEBUG: Buscando coach_id para usuario: {self.usuario_actual['id']} ({self.usuario_actual['nombre']})")
+            logger.debug("Buscando coach_id para usuario: %s (%s)", self.usuario_actual['id'], self.usuario_actual['nombre'])
             
             # Obtener coaches directamente del modelo
             coaches = self.coach_controller.coach_model.read_coaches()
             
-            print(f"🔍 DEBUG: Total coaches en BD: {len(coaches) if coaches else 0}")
+            logger.debug("Total coaches en BD: %s", len(coaches) if coaches else 0)
             
             if coaches:
                 for coach in coaches:
                     coach_id = coach[0]      # id_coach
                     user_id = coach[1]       # id_usuario
                     
-                    print(f"🔍 DEBUG: Coach {coach_id} -> Usuario {user_id}")
-                    
                     if user_id == self.usuario_actual['id']:
-                        print(f"✅ MATCH: Coach ID {coach_id} para usuario {user_id}")
+                        logger.debug("MATCH: Coach ID %s para usuario %s", coach_id, user_id)
                         return coach_id
             
-            print(f"❌ NO MATCH: Usuario {self.usuario_actual['id']} no es coach o no está en la tabla coaches")
+            logger.debug("NO MATCH: Usuario %s no es coach o no está en la tabla coaches", self.usuario_actual['id'])
             return None
             
         except Exception as e:
-            print(f"❌ ERROR en _obtener_coach_id_usuario_actual: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error en _obtener_coach_id_usuario_actual: %s", e)
             return None
         
     def cargar_mis_atletas(self):
@@ -3818,9 +4059,9 @@ class GimnasioApp:
                 cedula = atleta_data[2] if len(atleta_data) > 2 else "N/A"
                 email = usuario_data[6]
                 
-                # Obtener nombre del plan (simplificado)
+                # Nombre del plan (viene en la misma consulta)
                 plan_id = atleta_data[7] if len(atleta_data) > 7 else None
-                plan_nombre = f"Plan {plan_id}" if plan_id else "Sin Plan"
+                plan_nombre = atleta_completo.get('nombre_plan') or (f"Plan {plan_id}" if plan_id else "Sin Plan")
                 
                 # Estado de solvencia
                 estado = atleta_data[11] if len(atleta_data) > 11 else "N/A"
@@ -3867,7 +4108,7 @@ class GimnasioApp:
                     self.mis_atletas_tree.set(item, 'Estado', '🟢 Solvente')
                     
             except Exception as e:
-                print(f"Error procesando atleta: {e}")
+                logger.error("Error procesando atleta: %s", e)
                 continue
 
     def filtrar_mis_atletas(self, *args):
@@ -3900,7 +4141,7 @@ class GimnasioApp:
                 atletas_filtrados.append(atleta_completo)
                 
             except Exception as e:
-                print(f"Error filtrando atleta: {e}")
+                logger.error("Error filtrando atleta: %s", e)
                 continue
         
         self.actualizar_tabla_mis_atletas(atletas_filtrados)
@@ -4246,21 +4487,25 @@ class GimnasioApp:
         self.rutinas_tree.bind('<<TreeviewSelect>>', self.on_rutina_selected)
 
     def cargar_rutinas(self):
-        """Carga las rutinas desde la base de datos"""
-        try:
-            print("🔄 Cargando rutinas...")
-            
-            rutinas = self.rutina_controller.obtener_rutinas()
-            self.rutinas_data = rutinas if rutinas else []
-            
-            print(f"✅ Cargadas {len(self.rutinas_data)} rutinas")
-            
-            # Actualizar tabla
-            self.actualizar_tabla_rutinas()
-            
-        except Exception as e:
-            print(f"❌ Error cargando rutinas: {e}")
-            messagebox.showerror("Error", f"Error al cargar rutinas:\n{e}")
+        """Carga las rutinas desde la base de datos en segundo plano"""
+        logger.info("Cargando rutinas...")
+        
+        # Rutinas con número de ejercicios y creador en una sola consulta
+        self.tareas.ejecutar(
+            self.rutina_controller.obtener_rutinas_resumen,
+            self._mostrar_rutinas_cargadas,
+            lambda e: self._mostrar_error_carga("rutinas", e),
+            grupo='rutinas'
+        )
+
+    def _mostrar_rutinas_cargadas(self, rutinas):
+        """Recibe las rutinas en el hilo de Tk y actualiza la tabla"""
+        self.rutinas_data = rutinas if rutinas else []
+        
+        logger.info("Cargadas %s rutinas", len(self.rutinas_data))
+        
+        # Actualizar tabla
+        self.actualizar_tabla_rutinas()
 
     def on_rutina_selected(self, event):
         """Maneja la selección de rutina en la tabla"""
@@ -4347,14 +4592,14 @@ class GimnasioApp:
         # Llenar tabla
         for rutina in rutinas:
             try:
-                # rutina = (id, nombre, nivel, descripcion, creado_por, fecha_creacion)
+                # rutina = (id, nombre, nivel, descripcion, creado_por, fecha_creacion, ..., num_ejercicios, creador)
                 rutina_id = rutina[0]
                 nombre = rutina[1]
                 nivel = rutina[2]
-                creado_por = f"Usuario {rutina[4]}"  # Por ahora ID, después puedes mapear a nombre
+                creado_por = rutina[-1] or f"Usuario {rutina[4]}"
                 
-                # Contar ejercicios de esta rutina
-                num_ejercicios = self.rutina_controller.contar_ejercicios_rutina(rutina_id)
+                # Número de ejercicios (ya viene calculado en la consulta)
+                num_ejercicios = rutina[-2]
                 
                 # Formatear fecha
                 try:
@@ -4371,7 +4616,7 @@ class GimnasioApp:
                 ))
                 
             except Exception as e:
-                print(f"Error procesando rutina: {e}")
+                logger.error("Error procesando rutina: %s", e)
                 continue
 
     def editar_rutina(self):
@@ -4964,7 +5209,7 @@ class GimnasioApp:
             # Cerrar sesión en el controlador
             if self.token_sesion:
                 resultado = self.auth_controller.cerrar_sesion(self.token_sesion)
-                print(f"🚪 {resultado['message']}")
+                logger.info("%s", resultado['message'])
             
             # Limpiar variables de sesión
             self.usuario_actual = None
@@ -5028,6 +5273,23 @@ class GimnasioApp:
         plus_icon = self.crear_icono("plus", tamaño=16, color="black")
         ttk.Button(buttons_container, text="Registrar Egreso", image=plus_icon, compound='left', command=self._registrar_nuevo_egreso_action).pack(side='left', padx=5)
 
+        # Rango de fechas para exportar
+        export_frame = ttk.Frame(self.work_frame)
+        export_frame.pack(fill='x', pady=(0, 10))
+
+        ttk.Label(export_frame, text="Desde:").pack(side='left', padx=(0, 5))
+        self.egresos_desde_var = tk.StringVar(value=(datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'))
+        ttk.Entry(export_frame, textvariable=self.egresos_desde_var, width=12).pack(side='left', padx=(0, 10))
+
+        ttk.Label(export_frame, text="Hasta:").pack(side='left', padx=(0, 5))
+        self.egresos_hasta_var = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))
+        ttk.Entry(export_frame, textvariable=self.egresos_hasta_var, width=12).pack(side='left', padx=(0, 10))
+
+        ttk.Label(export_frame, text="(YYYY-MM-DD, vacío = todo)", font=('Segoe UI', 8)).pack(side='left', padx=(0, 10))
+
+        export_icon = self.crear_icono("file-export", tamaño=16, color="black")
+        ttk.Button(export_frame, text="Exportar", image=export_icon, compound='left', command=self._exportar_egresos_action).pack(side='left')
+
         # Tabla de Egresos
         self.crear_tabla_egresos()
         
@@ -5051,47 +5313,53 @@ class GimnasioApp:
 
         v_scroll = ttk.Scrollbar(table_frame, orient='vertical', command=self.egresos_tree.yview)
         
-        self.egresos_tree.configure(yscrollcommand=v_scroll.set)
+        self.egresos_tabla = LazyTable(self.egresos_tree, v_scroll, self._formatear_fila_egreso)
         
         self.egresos_tree.pack(side='left', fill='both', expand=True)
         v_scroll.pack(side='right', fill='y')
        
 
     def cargar_egresos(self):
-        """Carga los datos de egresos desde el controlador y actualiza la tabla."""
-        try:
-            resultado = self.finance_controller.obtener_todos_los_egresos()
-            if resultado['success']:
-                self.egresos_data = resultado['egresos']
-                self.actualizar_tabla_egresos()
-            else:
-                messagebox.showerror("Error", f"No se pudieron cargar los egresos: {resultado['message']}")
-        except Exception as e:
-            messagebox.showerror("Error Crítico", f"Error al cargar egresos: {e}")
+        """Carga los datos de egresos en segundo plano y actualiza la tabla."""
+        self.tareas.ejecutar(
+            self.finance_controller.obtener_todos_los_egresos,
+            self._mostrar_egresos_cargados,
+            lambda e: messagebox.showerror("Error Crítico", f"Error al cargar egresos: {e}"),
+            grupo='egresos'
+        )
+
+    def _mostrar_egresos_cargados(self, resultado):
+        """Recibe los egresos en el hilo de Tk y actualiza la tabla."""
+        if resultado['success']:
+            self.egresos_data = resultado['egresos']
+            self.actualizar_tabla_egresos()
+        else:
+            messagebox.showerror("Error", f"No se pudieron cargar los egresos: {resultado['message']}")
 
     def actualizar_tabla_egresos(self):
-        """Limpia y rellena la tabla de egresos con los datos actuales."""
-        self.egresos_tree.delete(*self.egresos_tree.get_children())
-        for egreso in self.egresos_data:
-            monto_formateado = f"${egreso[1]:.2f}"
-            tipo_legible = egreso[2].replace('_', ' ').title()
-            
-            # Obtener nombre del registrador (asumiendo que tienes una forma de mapear ID a nombre)
-            registrado_por_id = egreso[7]
-            # Aquí podrías llamar a un método para obtener el nombre del usuario por ID
-            registrado_por_nombre = f"Usuario ID: {registrado_por_id}" 
-
-            values = (
-                egreso[0], # ID
-                egreso[6], # Fecha
-                tipo_legible, # Tipo
-                monto_formateado, # Monto
-                egreso[3], # Descripción
-                egreso[4], # Beneficiario
-                egreso[5], # Método
-                registrado_por_nombre
-            )
-            self.egresos_tree.insert('', 'end', values=values)
+        """Limpia y rellena la tabla de egresos (las filas se materializan al hacer scroll)."""
+        self.egresos_tabla.mostrar(self.egresos_data)
+
+    def _formatear_fila_egreso(self, egreso):
+        """Valores de la fila de un egreso en la tabla."""
+        monto_formateado = f"${egreso[1]:.2f}"
+        tipo_legible = egreso[2].replace('_', ' ').title()
+        
+        # Obtener nombre del registrador (asumiendo que tienes una forma de mapear ID a nombre)
+        registrado_por_id = egreso[7]
+        # Aquí podrías llamar a un método para obtener el nombre del usuario por ID
+        registrado_por_nombre = f"Usuario ID: {registrado_por_id}" 
+
+        return (
+            egreso[0], # ID
+            egreso[6], # Fecha
+            tipo_legible, # Tipo
+            monto_formateado, # Monto
+            egreso[3], # Descripción
+            egreso[4], # Beneficiario
+            egreso[5], # Método
+            registrado_por_nombre
+        )
             
     def _registrar_nuevo_egreso_action(self):
         """Abre el formulario para registrar un nuevo egreso."""
@@ -5194,26 +5462,121 @@ class GimnasioApp:
         try:
             self.root.mainloop()
         except KeyboardInterrupt:
-            print("\n🛑 Aplicación interrumpida por el usuario")
+            logger.info("Aplicación interrumpida por el usuario")
         except Exception as e:
-            print(f"❌ Error inesperado: {e}")
+            logger.error("Error inesperado: %s", e)
             messagebox.showerror("Error", f"Error inesperado en la aplicación:\n{e}")
         finally:
-            print("👋 Cerrando Gimnasio Athenas...")
+            self.tareas.cerrar()
+            logger.info("Cerrando Gimnasio Athenas...")
 
 
 # ==================== PUNTO DE ENTRADA ====================
 
+def migrar_esquema():
+    """Aplica las migraciones pendientes; True si el esquema quedó al día"""
+    aplicadas = Migrador().migrar()
+    if aplicadas is None:
+        return False
+    for version, descripcion in aplicadas:
+        logger.info("Migración %s aplicada: %s", version, descripcion)
+    return True
+
+
+def ejecutar_comando(args):
+    """Ejecuta una tarea de mantenimiento por línea de comandos sin abrir la interfaz"""
+    if args.migrar:
+        if not migrar_esquema():
+            print("❌ No se pudo actualizar el esquema")
+            return 1
+        print(f"✅ Esquema en la versión {len(MIGRACIONES)}")
+        return 0
+    if args.reconstruir_resumen:
+        resultado = FinanceController().reconstruir_resumen_diario()
+        print(("✅ " if resultado["success"] else "❌ ") + resultado["message"])
+        return 0 if resultado["success"] else 1
+    if args.importar_atletas or args.importar_ingresos:
+        if args.usuario_id is None:
+            print("❌ Indica con --usuario-id quién realiza la importación")
+            return 1
+        importador = ImportController()
+        codigo = 0
+        for ruta, importar in ((args.importar_atletas, importador.importar_atletas),
+                               (args.importar_ingresos, importador.importar_ingresos)):
+            if not ruta:
+                continue
+            resultado = importar(ruta, args.usuario_id)
+            print(("✅ " if resultado["success"] else "❌ ") + resultado["message"])
+            for rechazo in resultado.get("rechazadas", []):
+                print(f"   línea {rechazo['linea']}: {rechazo['motivo']}")
+            if not resultado["success"]:
+                codigo = 1
+        return codigo
+    if args.marcar_vencidos:
+        resultado = AtletaController().actualizar_vencidos()
+        print(("✅ " if resultado["success"] else "❌ ") + resultado["message"])
+        return 0 if resultado["success"] else 1
+    return None
+
+
 def main():
     """Función principal de la aplicación"""
+    parser = argparse.ArgumentParser(description="Gimnasio Athenas - Sistema de Gestión")
+    parser.add_argument('--sqlite', metavar='ARCHIVO',
+                        help="usa una base SQLite local (sin servidor MySQL); se crea si no existe")
+    parser.add_argument('--migrar', action='store_true',
+                        help="crea las tablas e índices que falten y registra la versión del esquema")
+    parser.add_argument('--reconstruir-resumen', action='store_true',
+                        help="recalcula el resumen financiero diario desde ingresos y egresos")
+    parser.add_argument('--marcar-vencidos', action='store_true',
+                        help="pasa a 'vencido' las membresías solventes cuya fecha ya pasó")
+    parser.add_argument('--importar-atletas', metavar='CSV',
+                        help="importa atletas (y sus usuarios) desde un archivo CSV")
+    parser.add_argument('--importar-ingresos', metavar='CSV',
+                        help="importa pagos históricos desde un archivo CSV")
+    parser.add_argument('--usuario-id', type=int,
+                        help="ID del administrador o secretaria que realiza la importación")
+    parser.add_argument('--instrumentar', metavar='ARCHIVO', nargs='?', const='',
+                        help="mide las consultas de cada acción (panel 'Consultas'); con ARCHIVO "
+                             "además las registra ahí, una línea JSON por acción")
+    parser.add_argument('--nivel-registro', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'), type=str.upper,
+                        help="detalle de los mensajes (DEBUG muestra el detalle fila por fila)")
+    parser.add_argument('--registro', metavar='ARCHIVO',
+                        help="guarda los mensajes en un archivo rotativo además de la consola")
+    parser.add_argument('--registro-json', action='store_true',
+                        help="escribe el archivo de registro como una línea JSON por mensaje")
+    args = parser.parse_args()
+    
+    cambios = {}
+    if args.registro_json:
+        cambios['json'] = True
+    if args.nivel_registro:
+        cambios['nivel'] = args.nivel_registro
+    if args.registro:
+        cambios['archivo'] = args.registro
+    configurar_registro(**cambios)
+    
+    if args.sqlite:
+        BACKEND_CONFIG.update(motor='sqlite', ruta_sqlite=args.sqlite)
+    
+    if args.instrumentar is not None:
+        INSTRUMENTACION_CONFIG.update(activa=True, archivo=args.instrumentar or None)
+        instrumentar_callbacks_tk()
+    
+    if MIGRACION_CONFIG['al_iniciar'] and not args.migrar:
+        migrar_esquema()
+    
+    with instrumentacion.accion("línea de comandos"):
+        codigo = ejecutar_comando(args)
+    if codigo is not None:
+        sys.exit(codigo)
+    
     try:
-        print("🏋️ Iniciando Gimnasio Athenas...")
+        logger.info("Iniciando Gimnasio Athenas...")
         app = GimnasioApp()
         app.run()
     except Exception as e:
-        print(f"💥 Error fatal: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fatal: %s", e)
 
 
 if __name__ == "__main__":
@@ -1,87 +1,141 @@
 # Modelo para gestión de asignaciones coach-atleta
+import logging
 import mysql.connector
 from mysql.connector import Error
 from .database import Database
 
+logger = logging.getLogger(__name__)
+
 class AsignacionModel:
     def __init__(self):
         self.db = Database()
 
     def insert_asignacion(self, id_coach, id_atleta, fecha_asignacion, fecha_fin, estado_activo, notas):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `asignaciones_coach_atleta`
-                (`id_coach`, `id_atleta`, `fecha_asignacion`, `fecha_fin`, `estado_activo`, `notas`)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (id_coach, id_atleta, fecha_asignacion, fecha_fin, estado_activo, notas))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return cursor.lastrowid
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `asignaciones_coach_atleta`
+                    (`id_coach`, `id_atleta`, `fecha_asignacion`, `fecha_fin`, `estado_activo`, `notas`)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, (id_coach, id_atleta, fecha_asignacion, fecha_fin, estado_activo, notas))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return cursor.lastrowid
 
         except mysql.connector.Error as error:
-            print(f"Error al insertar asignación: {error}")
+            logger.error("Error al insertar asignación: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def read_asignaciones(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `asignaciones_coach_atleta`")
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `asignaciones_coach_atleta`")
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al leer asignaciones: {error}")
+            logger.error("Error al leer asignaciones: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def get_asignacion_by_id(self, id_asignacion):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `asignaciones_coach_atleta` WHERE `id_asignacion`=%s", (id_asignacion,))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer asignación: %s", error)
+            return None
+
+    def get_asignaciones_by_coach(self, id_coach, solo_activas=False):
+        try:
+            with self.db.cursor() as cursor:
+                if solo_activas:
+                    cursor.execute("""
+                        SELECT * FROM `asignaciones_coach_atleta`
+                        WHERE `id_coach`=%s AND `estado_activo`=1
+                    """, (id_coach,))
+                else:
+                    cursor.execute("SELECT * FROM `asignaciones_coach_atleta` WHERE `id_coach`=%s", (id_coach,))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer asignaciones del coach: %s", error)
+            return []
+
+    def get_asignaciones_completas_by_coach(self, id_coach, solo_activas=False):
+        """
+        Asignaciones de un coach con el atleta y su usuario en una sola consulta, como
+        dicts {'asignacion_data', 'atleta_data', 'usuario_data'}; las columnas marcador
+        separan las tablas sin depender de cuántas columnas tenga cada una.
+        """
+        try:
+            with self.db.cursor() as cursor:
+                consulta = """
+                    SELECT s.*, NULL AS fin_asignacion, a.*, NULL AS fin_atleta, u.*
+                    FROM asignaciones_coach_atleta s
+                    INNER JOIN atletas a ON a.id_atleta = s.id_atleta
+                    INNER JOIN usuarios u ON u.id = a.id_usuario
+                    WHERE s.id_coach = %s
+                """
+                if solo_activas:
+                    consulta += " AND s.estado_activo = 1"
+                cursor.execute(consulta + " ORDER BY s.id_asignacion", (id_coach,))
+
+                columnas = [columna[0] for columna in cursor.description]
+                fin_asignacion = columnas.index('fin_asignacion')
+                fin_atleta = columnas.index('fin_atleta')
+
+                return [
+                    {
+                        'asignacion_data': fila[:fin_asignacion],
+                        'atleta_data': fila[fin_asignacion + 1:fin_atleta],
+                        'usuario_data': fila[fin_atleta + 1:]
+                    }
+                    for fila in cursor.fetchall()
+                ]
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer asignaciones completas del coach: %s", error)
+            return []
+
+    def get_asignaciones_by_atleta(self, id_atleta, solo_activas=False):
+        try:
+            with self.db.cursor() as cursor:
+                if solo_activas:
+                    cursor.execute("""
+                        SELECT * FROM `asignaciones_coach_atleta`
+                        WHERE `id_atleta`=%s AND `estado_activo`=1
+                    """, (id_atleta,))
+                else:
+                    cursor.execute("SELECT * FROM `asignaciones_coach_atleta` WHERE `id_atleta`=%s", (id_atleta,))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer asignaciones del atleta: %s", error)
+            return []
 
     def update_asignacion(self, id_asignacion, id_coach, id_atleta, fecha_asignacion, fecha_fin, estado_activo, notas):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                UPDATE `asignaciones_coach_atleta` SET 
-                    `id_coach`=%s, `id_atleta`=%s, `fecha_asignacion`=%s,
-                    `fecha_fin`=%s, `estado_activo`=%s, `notas`=%s
-                WHERE `id_asignacion`=%s
-            """, (id_coach, id_atleta, fecha_asignacion, fecha_fin, estado_activo, notas, id_asignacion))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    UPDATE `asignaciones_coach_atleta` SET 
+                        `id_coach`=%s, `id_atleta`=%s, `fecha_asignacion`=%s,
+                        `fecha_fin`=%s, `estado_activo`=%s, `notas`=%s
+                    WHERE `id_asignacion`=%s
+                """, (id_coach, id_atleta, fecha_asignacion, fecha_fin, estado_activo, notas, id_asignacion))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al actualizar asignación: {error}")
+            logger.error("Error al actualizar asignación: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def delete_asignacion(self, id_asignacion):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("DELETE FROM `asignaciones_coach_atleta` WHERE `id_asignacion`=%s", (id_asignacion,))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `asignaciones_coach_atleta` WHERE `id_asignacion`=%s", (id_asignacion,))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar asignación: {error}")
+            logger.error("Error al eliminar asignación: %s", error)
             return False
-
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
@@ -1,155 +1,307 @@
 # Modelo para gestión de atletas
+import logging
 import mysql.connector
 from mysql.connector import Error
 from .database import Database
 
+logger = logging.getLogger(__name__)
+
 class AtletaModel:
     def __init__(self):
         self.db = Database()
     
     def insert_atleta(self, id_usuario, cedula, peso, fecha_nacimiento, id_plan, id_coach, meta_largo_plazo, valoracion_especiales):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            
-            cursor.execute("SELECT duracion_dias FROM planes WHERE id_plan = %s", (id_plan,))
-            plan_result = cursor.fetchone()
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("SELECT duracion_dias FROM planes WHERE id_plan = %s", (id_plan,))
+                plan_result = cursor.fetchone()
             
-            if not plan_result:
-                print(f"Error: Plan {id_plan} no existe")
-                return None
+                if not plan_result:
+                    logger.error("Plan %s no existe", id_plan)
+                    return None
                 
-            duracion_dias = plan_result[0]
+                duracion_dias = plan_result[0]
             
-            from datetime import datetime, timedelta
-            fecha_inscripcion = datetime.now().date()
-            fecha_vencimiento = fecha_inscripcion + timedelta(days=duracion_dias)
+                from datetime import datetime, timedelta
+                fecha_inscripcion = datetime.now().date()
+                fecha_vencimiento = fecha_inscripcion + timedelta(days=duracion_dias)
             
-            cursor.execute("""
-                INSERT INTO `atletas`
-                (`id_usuario`, `cedula`, `peso`, `fecha_nacimiento`, `fecha_inscripcion`, `fecha_vencimiento`, `id_plan`, `id_coach`, `meta_largo_plazo`, `valoracion_especiales`) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (id_usuario, cedula, peso, fecha_nacimiento, fecha_inscripcion, fecha_vencimiento, id_plan, id_coach, meta_largo_plazo, valoracion_especiales))
+                cursor.execute("""
+                    INSERT INTO `atletas`
+                    (`id_usuario`, `cedula`, `peso`, `fecha_nacimiento`, `fecha_inscripcion`, `fecha_vencimiento`, `id_plan`, `id_coach`, `meta_largo_plazo`, `valoracion_especiales`) 
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (id_usuario, cedula, peso, fecha_nacimiento, fecha_inscripcion, fecha_vencimiento, id_plan, id_coach, meta_largo_plazo, valoracion_especiales))
             
-            self.db.connection.commit()
-            new_id = cursor.lastrowid
-            print(f"Nuevo atleta insertado con ID: {new_id}, vence: {fecha_vencimiento}")
-            return new_id
+                new_id = cursor.lastrowid
+                logger.debug("Nuevo atleta insertado con ID: %s, vence: %s", new_id, fecha_vencimiento)
+                return new_id
 
         except mysql.connector.Error as error:
-            print(f"Error al ingresar datos {error}")
+            logger.error("Error al ingresar datos %s", error)
             # Devolver None en caso de error para una mejor validación en el controlador
             return None
-
-        finally:
-            if 'cursor' in locals() and cursor:
-                cursor.close()
-            self.db.disconnect()
     
     def read_atletas(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `atletas` WHERE 1")
-            result = cursor.fetchall()
-            return result
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `atletas` WHERE 1")
+                result = cursor.fetchall()
+                return result
         
         except mysql.connector.Error as error:
-            print(f"Error al consultar datos {error}")
+            logger.error("Error al consultar datos %s", error)
             return []
 
-        finally:
-            if 'cursor' in locals() and cursor:
-                cursor.close()
-            self.db.disconnect()
+    def get_atletas_completos(self, id_coach=None):
+        """
+        Atletas con su usuario, nombre del plan y nombre del coach en una sola consulta.
+        Las columnas marcador separan las filas de atletas y usuarios sin depender
+        de cuántas columnas tenga cada tabla.
+        """
+        try:
+            with self.db.cursor() as cursor:
+                consulta = """
+                    SELECT a.*, NULL AS fin_atleta, u.*, NULL AS fin_usuario,
+                           p.nombre_plan,
+                           CONCAT(cu.nombre, ' ', cu.apellido) AS nombre_coach
+                    FROM atletas a
+                    INNER JOIN usuarios u ON u.id = a.id_usuario
+                    LEFT JOIN planes p ON p.id_plan = a.id_plan
+                    LEFT JOIN coaches c ON c.id_coach = a.id_coach
+                    LEFT JOIN usuarios cu ON cu.id = c.id_usuario
+                """
+                if id_coach is None:
+                    cursor.execute(consulta + " ORDER BY a.id_atleta")
+                else:
+                    cursor.execute(consulta + " WHERE a.id_coach = %s ORDER BY a.id_atleta", (id_coach,))
+
+                columnas = [columna[0] for columna in cursor.description]
+                fin_atleta = columnas.index('fin_atleta')
+                fin_usuario = columnas.index('fin_usuario')
+
+                return [
+                    {
+                        'atleta_data': fila[:fin_atleta],
+                        'usuario_data': fila[fin_atleta + 1:fin_usuario],
+                        'nombre_plan': fila[fin_usuario + 1],
+                        'nombre_coach': fila[fin_usuario + 2]
+                    }
+                    for fila in cursor.fetchall()
+                ]
+
+        except mysql.connector.Error as error:
+            logger.error("Error al consultar atletas completos: %s", error)
+            return []
+
+    def contar_por_coach(self, id_coach=None):
+        """Dict id_coach -> cantidad de atletas (solo ese coach si se indica); None si falla"""
+        try:
+            with self.db.cursor() as cursor:
+                if id_coach is None:
+                    cursor.execute("""
+                        SELECT `id_coach`, COUNT(*) FROM `atletas`
+                        WHERE `id_coach` IS NOT NULL
+                        GROUP BY `id_coach`
+                    """)
+                else:
+                    cursor.execute("""
+                        SELECT `id_coach`, COUNT(*) FROM `atletas`
+                        WHERE `id_coach` = %s
+                        GROUP BY `id_coach`
+                    """, (id_coach,))
+                return {coach: cantidad for coach, cantidad in cursor.fetchall()}
+
+        except mysql.connector.Error as error:
+            logger.error("Error al contar atletas por coach: %s", error)
+            return None
+
+    def get_atleta_by_id(self, id_atleta):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `atletas` WHERE `id_atleta`=%s", (id_atleta,))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al consultar atleta: %s", error)
+            return None
+
+    def get_atleta_by_usuario(self, id_usuario):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `atletas` WHERE `id_usuario`=%s", (id_usuario,))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al consultar atleta por usuario: %s", error)
+            return None
+
+    def get_atleta_by_cedula(self, cedula):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `atletas` WHERE `cedula`=%s", (cedula,))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al consultar atleta por cédula: %s", error)
+            return None
+
+    def get_atletas_by_coach(self, id_coach):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `atletas` WHERE `id_coach`=%s", (id_coach,))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al consultar atletas del coach: %s", error)
+            return []
+
+    def get_atletas_by_estado(self, estado_solvencia):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `atletas` WHERE `estado_solvencia`=%s", (estado_solvencia,))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al consultar atletas por estado: %s", error)
+            return []
+
+    def get_atletas_proximos_vencer(self, fecha_limite):
+        """Atletas solventes que vencen hasta `fecha_limite`, del más próximo al más lejano"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT * FROM `atletas`
+                    WHERE `estado_solvencia`='solvente' AND `fecha_vencimiento` <= %s
+                    ORDER BY `fecha_vencimiento`
+                """, (fecha_limite,))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al consultar atletas próximos a vencer: %s", error)
+            return []
+
+    def get_datos_renovacion(self, ids_atletas):
+        """
+        (id_atleta, id_plan, fecha_vencimiento, precio, duracion_dias) de varios atletas
+        con los datos de su plan, en una sola consulta.
+        """
+        if not ids_atletas:
+            return []
+        try:
+            marcadores = ', '.join(['%s'] * len(ids_atletas))
+            with self.db.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT a.`id_atleta`, a.`id_plan`, a.`fecha_vencimiento`, p.`precio`, p.`duracion_dias`
+                    FROM `atletas` a
+                    LEFT JOIN `planes` p ON p.`id_plan` = a.`id_plan`
+                    WHERE a.`id_atleta` IN ({marcadores})
+                """, tuple(ids_atletas))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al consultar datos de renovación: %s", error)
+            return None
+
+    def get_cabeza_vencimientos(self, limite=1):
+        """
+        Los `limite` solventes que vencen primero, como (id_atleta, fecha_vencimiento):
+        la cabeza de la cola de vencimientos que forma el índice
+        (estado_solvencia, fecha_vencimiento), leída sin recorrer el resto.
+        Lista vacía si no hay solventes, None si falla.
+        """
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT `id_atleta`, `fecha_vencimiento` FROM `atletas`
+                    WHERE `estado_solvencia`='solvente' AND `fecha_vencimiento` IS NOT NULL
+                    ORDER BY `fecha_vencimiento` LIMIT %s
+                """, (limite,))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer la cola de vencimientos: %s", error)
+            return None
+
+    def marcar_vencidos(self, fecha_corte):
+        """
+        Pasa a 'vencido' en un solo UPDATE a los solventes cuya fecha de vencimiento
+        es anterior a `fecha_corte`. Devuelve cuántos cambiaron, o None si falla.
+        """
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    UPDATE `atletas` SET `estado_solvencia`='vencido'
+                    WHERE `estado_solvencia`='solvente' AND `fecha_vencimiento` < %s
+                """, (fecha_corte,))
+                return cursor.rowcount
+
+        except mysql.connector.Error as error:
+            logger.error("Error al marcar atletas vencidos: %s", error)
+            return None
 
     def update_atleta(self, id_atleta, id_usuario, cedula, peso, fecha_nacimiento, id_plan, id_coach, meta_largo_plazo, valoracion_especiales):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            
-            cursor.execute("SELECT id_plan FROM atletas WHERE id_atleta = %s", (id_atleta,))
-            plan_actual = cursor.fetchone()
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("SELECT id_plan FROM atletas WHERE id_atleta = %s", (id_atleta,))
+                plan_actual = cursor.fetchone()
             
-            if plan_actual and plan_actual[0] != id_plan:
-                cursor.execute("SELECT duracion_dias FROM planes WHERE id_plan = %s", (id_plan,))
-                plan_result = cursor.fetchone()
+                if plan_actual and plan_actual[0] != id_plan:
+                    cursor.execute("SELECT duracion_dias FROM planes WHERE id_plan = %s", (id_plan,))
+                    plan_result = cursor.fetchone()
                 
-                if plan_result:
-                    from datetime import datetime, timedelta
-                    fecha_vencimiento = datetime.now().date() + timedelta(days=plan_result[0])
+                    if plan_result:
+                        from datetime import datetime, timedelta
+                        fecha_vencimiento = datetime.now().date() + timedelta(days=plan_result[0])
                     
+                        cursor.execute("""
+                            UPDATE `atletas` SET 
+                            `id_usuario`=%s, `cedula`=%s, `peso`=%s, `fecha_nacimiento`=%s, 
+                            `id_plan`=%s, `id_coach`=%s, `meta_largo_plazo`=%s, `valoracion_especiales`=%s,
+                            `fecha_vencimiento`=%s
+                            WHERE `id_atleta`=%s
+                        """, (id_usuario, cedula, peso, fecha_nacimiento, id_plan, id_coach, meta_largo_plazo, valoracion_especiales, fecha_vencimiento, id_atleta))
+                    else:
+                        logger.error("Plan %s no existe", id_plan)
+                        return False
+                else:
                     cursor.execute("""
                         UPDATE `atletas` SET 
                         `id_usuario`=%s, `cedula`=%s, `peso`=%s, `fecha_nacimiento`=%s, 
-                        `id_plan`=%s, `id_coach`=%s, `meta_largo_plazo`=%s, `valoracion_especiales`=%s,
-                        `fecha_vencimiento`=%s
+                        `id_plan`=%s, `id_coach`=%s, `meta_largo_plazo`=%s, `valoracion_especiales`=%s
                         WHERE `id_atleta`=%s
-                    """, (id_usuario, cedula, peso, fecha_nacimiento, id_plan, id_coach, meta_largo_plazo, valoracion_especiales, fecha_vencimiento, id_atleta))
-                else:
-                    print(f"Error: Plan {id_plan} no existe")
-                    return False
-            else:
-                cursor.execute("""
-                    UPDATE `atletas` SET 
-                    `id_usuario`=%s, `cedula`=%s, `peso`=%s, `fecha_nacimiento`=%s, 
-                    `id_plan`=%s, `id_coach`=%s, `meta_largo_plazo`=%s, `valoracion_especiales`=%s
-                    WHERE `id_atleta`=%s
-                """, (id_usuario, cedula, peso, fecha_nacimiento, id_plan, id_coach, meta_largo_plazo, valoracion_especiales, id_atleta))
+                    """, (id_usuario, cedula, peso, fecha_nacimiento, id_plan, id_coach, meta_largo_plazo, valoracion_especiales, id_atleta))
             
-            self.db.connection.commit()
-            print(f"Atleta {id_atleta} actualizado correctamente")
-            return True
+                logger.debug("Atleta %s actualizado correctamente", id_atleta)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al actualizar datos {error}")
+            logger.error("Error al actualizar datos %s", error)
             return False
 
-        finally:
-            if 'cursor' in locals() and cursor:
-                cursor.close()
-            self.db.disconnect()
-
-
     def actualizar_estado_membresia(self, id_atleta, fecha_vencimiento, estado_solvencia):
         """Actualiza solo el estado de membresía del atleta"""
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            
-            cursor.execute("""
-                UPDATE atletas 
-                SET fecha_vencimiento = %s, estado_solvencia = %s 
-                WHERE id_atleta = %s
-            """, (fecha_vencimiento, estado_solvencia, id_atleta))
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    UPDATE atletas 
+                    SET fecha_vencimiento = %s, estado_solvencia = %s 
+                    WHERE id_atleta = %s
+                """, (fecha_vencimiento, estado_solvencia, id_atleta))
             
-            self.db.connection.commit()
-            print(f"Estado de membresía actualizado para atleta {id_atleta}")
-            return cursor.rowcount > 0
+                logger.debug("Estado de membresía actualizado para atleta %s", id_atleta)
+                return cursor.rowcount > 0
             
         except mysql.connector.Error as error:
-            print(f"Error al actualizar estado de membresía: {error}")
+            logger.error("Error al actualizar estado de membresía: %s", error)
             return False
-            
-        finally:
-            if 'cursor' in locals() and cursor:
-                cursor.close()
-            self.db.disconnect()
 
     def delete_atleta(self, id_atleta):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("DELETE FROM `atletas` WHERE `id_atleta`=%s", (id_atleta,))
-            self.db.connection.commit()
-            # Verificar si la eliminación fue exitosa
-            return cursor.rowcount > 0
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `atletas` WHERE `id_atleta`=%s", (id_atleta,))
+                # Verificar si la eliminación fue exitosa
+                return cursor.rowcount > 0
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar datos {error}")
-            return False
-            
-        finally:
-            if 'cursor' in locals() and cursor:
-                cursor.close()
-            self.db.disconnect()
\ No newline at end of file
+            logger.error("Error al eliminar datos %s", error)
+            return False
\ No newline at end of file
@@ -0,0 +1,393 @@
+# Motores de base de datos para Database: MySQL (servidor) y SQLite (archivo local o memoria)
+import itertools
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+import mysql.connector
+from mysql.connector import errorcode, errors
+
+
+# ==================== DIALECTOS ====================
+
+class DialectoMySQL:
+    """SQL que cambia entre motores; los modelos escriben el resto en MySQL con %s"""
+
+    nombre = 'mysql'
+
+    def insertar_acumulando(self, tabla, columnas, valores, clave, sumar):
+        """
+        INSERT de una fila que, si ya existe otra con la misma `clave`, suma en las
+        columnas `sumar` los valores nuevos. `valores` son las expresiones de VALUES.
+        """
+        return (
+            f"INSERT INTO `{tabla}` ({', '.join(f'`{c}`' for c in columnas)}) "
+            f"VALUES ({', '.join(valores)}) ON DUPLICATE KEY UPDATE "
+            + ', '.join(f"`{c}` = `{c}` + VALUES(`{c}`)" for c in sumar)
+        )
+
+    def crear_tabla(self, cursor, sentencia):
+        cursor.execute(sentencia)
+
+    def existe_tabla(self, cursor, tabla):
+        cursor.execute("SHOW TABLES LIKE %s", (tabla,))
+        return cursor.fetchone() is not None
+
+    def indices(self, cursor, tabla):
+        """{nombre del índice: [columnas en orden]}"""
+        cursor.execute("""
+            SELECT `index_name`, `column_name` FROM `information_schema`.`statistics`
+            WHERE `table_schema` = DATABASE() AND `table_name` = %s
+            ORDER BY `index_name`, `seq_in_index`
+        """, (tabla,))
+        indices = {}
+        for indice, columna in cursor.fetchall():
+            indices.setdefault(indice, []).append(columna)
+        return indices
+
+    def ancho_columna(self, cursor, tabla, columna):
+        """Largo máximo de una columna de texto (None si no tiene o no existe)"""
+        cursor.execute("""
+            SELECT `character_maximum_length` FROM `information_schema`.`columns`
+            WHERE `table_schema` = DATABASE() AND `table_name` = %s AND `column_name` = %s
+        """, (tabla, columna))
+        fila = cursor.fetchone()
+        return fila[0] if fila else None
+
+    def bloquear(self, cursor, nombre, espera):
+        """Bloqueo con nombre entre procesos; True si se obtuvo"""
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (nombre, espera))
+        return cursor.fetchone()[0] == 1
+
+    def desbloquear(self, cursor, nombre):
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (nombre,))
+        cursor.fetchall()
+
+
+class DialectoSQLite:
+    nombre = 'sqlite'
+
+    def insertar_acumulando(self, tabla, columnas, valores, clave, sumar):
+        return (
+            f"INSERT INTO `{tabla}` ({', '.join(f'`{c}`' for c in columnas)}) "
+            f"VALUES ({', '.join(valores)}) "
+            f"ON CONFLICT ({', '.join(f'`{c}`' for c in clave)}) DO UPDATE SET "
+            + ', '.join(f"`{c}` = `{tabla}`.`{c}` + excluded.`{c}`" for c in sumar)
+        )
+
+    def crear_tabla(self, cursor, sentencia):
+        for traducida in _traducir_create_table(sentencia):
+            cursor.execute(traducida)
+
+    def existe_tabla(self, cursor, tabla):
+        cursor.execute("SELECT 1 FROM `sqlite_master` WHERE `type` = 'table' AND `name` = %s", (tabla,))
+        return cursor.fetchone() is not None
+
+    def indices(self, cursor, tabla):
+        cursor.execute(f"PRAGMA index_list(`{tabla}`)")
+        nombres = [fila[1] for fila in cursor.fetchall()]
+        indices = {}
+        for nombre in nombres:
+            cursor.execute(f"PRAGMA index_info(`{nombre}`)")
+            indices[nombre] = [columna for _, _, columna in sorted(cursor.fetchall())]
+        return indices
+
+    def ancho_columna(self, cursor, tabla, columna):
+        # SQLite no limita el largo de VARCHAR
+        return None
+
+    def bloquear(self, cursor, nombre, espera):
+        # SQLite ya serializa a los escritores con el bloqueo del archivo
+        return True
+
+    def desbloquear(self, cursor, nombre):
+        pass
+
+
+_CLAVE_AUTOINCREMENTAL = re.compile(r'\bINT\s+NOT\s+NULL\s+AUTO_INCREMENT\s+PRIMARY\s+KEY', re.I)
+_INDICE_EN_TABLA = re.compile(r'^(UNIQUE\s+)?KEY\s+`(\w+)`\s*\((.*)\)$', re.I | re.S)
+
+
+def _traducir_create_table(sentencia):
+    """
+    Un CREATE TABLE de MySQL como lo entiende SQLite: AUTO_INCREMENT pasa a
+    INTEGER PRIMARY KEY, ENUM a TEXT, se quitan las opciones de tabla y
+    ON UPDATE, y los KEY internos pasan a CREATE INDEX aparte.
+    """
+    apertura = sentencia.index('(')
+    cierre = sentencia.rindex(')')
+    encabezado = sentencia[:apertura]
+    tabla = re.search(r'`(\w+)`', encabezado).group(1)
+
+    definiciones = []
+    indices = []
+    for elemento in _separar_nivel_superior(sentencia[apertura + 1:cierre]):
+        indice = _INDICE_EN_TABLA.match(elemento)
+        if indice:
+            unico, nombre, columnas = indice.groups()
+            indices.append(
+                f"CREATE {'UNIQUE ' if unico else ''}INDEX IF NOT EXISTS `{nombre}` ON `{tabla}` ({columnas})"
+            )
+            continue
+        elemento = _CLAVE_AUTOINCREMENTAL.sub('INTEGER PRIMARY KEY AUTOINCREMENT', elemento)
+        elemento = re.sub(r'\bENUM\s*\([^)]*\)', 'TEXT', elemento, flags=re.I)
+        elemento = re.sub(r'\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP', '', elemento, flags=re.I)
+        definiciones.append(elemento)
+
+    return [f"{encabezado}(\n    " + ",\n    ".join(definiciones) + "\n)"] + indices
+
+
+def _separar_nivel_superior(cuerpo):
+    """Parte las definiciones de un CREATE TABLE por las comas fuera de paréntesis"""
+    elementos = []
+    actual = []
+    profundidad = 0
+    for caracter in cuerpo:
+        if caracter == '(':
+            profundidad += 1
+        elif caracter == ')':
+            profundidad -= 1
+        elif caracter == ',' and profundidad == 0:
+            elementos.append(''.join(actual).strip())
+            actual = []
+            continue
+        actual.append(caracter)
+    if ''.join(actual).strip():
+        elementos.append(''.join(actual).strip())
+    return elementos
+
+
+# ==================== MOTORES ====================
+
+class MySQLBackend:
+    """Conexiones de mysql.connector al servidor de `config`"""
+
+    dialecto = DialectoMySQL()
+
+    def __init__(self, config):
+        self.config = config
+
+    def conectar(self):
+        return mysql.connector.connect(**self.config)
+
+    def cerrar(self):
+        pass
+
+
+class SQLiteBackend:
+    """
+    Base SQLite en `ruta` (un archivo, o ':memory:' para una base que vive mientras
+    dure el proceso). Las conexiones imitan a las de mysql.connector: aceptan %s,
+    devuelven fechas y decimales como los tipos de Python y sus errores son los
+    de mysql.connector, así los modelos funcionan sin cambios.
+    """
+
+    dialecto = DialectoSQLite()
+    _memorias = itertools.count(1)
+
+    def __init__(self, ruta, tiempo_espera=10):
+        self.tiempo_espera = tiempo_espera
+        self._ancla = None
+        self._escritura = None
+        if ruta == ':memory:':
+            # Caché compartida: todas las conexiones del pool ven la misma base, que
+            # existe mientras quede una abierta (la del ancla). En ese modo SQLite no
+            # espera a otro escritor sino que falla enseguida, así que las
+            # transacciones de escritura se turnan con un lock propio
+            self.destino = f"file:gimnasio_{next(SQLiteBackend._memorias)}?mode=memory&cache=shared"
+            self.en_memoria = True
+            self._ancla = self._abrir()
+            self._escritura = threading.Lock()
+        else:
+            self.destino = ruta
+            self.en_memoria = False
+
+    def conectar(self):
+        return ConexionSQLite(self._abrir(), self)
+
+    def cerrar(self):
+        """Suelta la conexión ancla: una base ':memory:' deja de existir al cerrar el pool"""
+        if self._ancla is not None:
+            self._ancla.close()
+            self._ancla = None
+
+    def _abrir(self):
+        try:
+            conexion = sqlite3.connect(
+                self.destino, uri=self.en_memoria, timeout=self.tiempo_espera,
+                detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False
+            )
+            conexion.execute("PRAGMA foreign_keys = ON")
+            if self.en_memoria:
+                # Sin bloqueos de lectura entre conexiones de la misma caché
+                conexion.execute("PRAGMA read_uncommitted = 1")
+            else:
+                conexion.execute("PRAGMA journal_mode = WAL")
+            conexion.create_function('CONCAT', -1, _concat, deterministic=True)
+            return conexion
+        except sqlite3.Error as error:
+            raise _traducir_error(error) from error
+
+
+def _concat(*partes):
+    # Como en MySQL, NULL si alguna parte es NULL
+    if any(parte is None for parte in partes):
+        return None
+    return ''.join(str(parte) for parte in partes)
+
+
+def _convertir_fecha(valor):
+    texto = valor.decode()
+    return datetime.fromisoformat(texto).date() if len(texto) > 10 else date.fromisoformat(texto)
+
+
+def _convertir_fecha_hora(valor):
+    return datetime.fromisoformat(valor.decode())
+
+
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(' '))
+sqlite3.register_converter('DATE', _convertir_fecha)
+sqlite3.register_converter('DATETIME', _convertir_fecha_hora)
+sqlite3.register_converter('TIMESTAMP', _convertir_fecha_hora)
+sqlite3.register_converter('DECIMAL', lambda valor: Decimal(valor.decode()))
+
+
+@lru_cache(maxsize=512)
+def _traducir_consulta(consulta, con_parametros):
+    """Marcadores %s -> ? y sin FOR UPDATE (SQLite bloquea la base entera al escribir)"""
+    consulta = re.sub(r'\s+FOR\s+UPDATE\b', '', consulta, flags=re.I)
+    if con_parametros:
+        consulta = re.sub(r'%([s%])', lambda m: '?' if m.group(1) == 's' else '%', consulta)
+    return consulta
+
+
+def _traducir_error(error):
+    mensaje = str(error)
+    if isinstance(error, sqlite3.IntegrityError):
+        errno = errorcode.ER_DUP_ENTRY if 'UNIQUE' in mensaje else None
+        return errors.IntegrityError(msg=mensaje, errno=errno)
+    if isinstance(error, sqlite3.OperationalError):
+        return errors.OperationalError(msg=mensaje)
+    return errors.DatabaseError(msg=mensaje)
+
+
+class CursorSQLite:
+    def __init__(self, conexion, cursor):
+        self._conexion = conexion
+        self._cursor = cursor
+
+    def execute(self, consulta, parametros=()):
+        consulta = _traducir_consulta(consulta, bool(parametros))
+        self._conexion._ejecutar(lambda: self._cursor.execute(consulta, tuple(parametros or ())), consulta)
+
+    def executemany(self, consulta, filas):
+        consulta = _traducir_consulta(consulta, True)
+        self._conexion._ejecutar(lambda: self._cursor.executemany(consulta, [tuple(fila) for fila in filas]), consulta)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, cantidad):
+        return self._cursor.fetchmany(cantidad)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexionSQLite:
+    """Lo que ConnectionPool y Database usan de una conexión de mysql.connector"""
+
+    unread_result = False
+
+    def __init__(self, conexion, backend):
+        self._conexion = conexion
+        self._backend = backend
+        self._abierta = True
+        self._escritura = backend._escritura
+        self._escribiendo = False
+
+    def cursor(self, buffered=True, **kwargs):
+        return CursorSQLite(self, self._conexion.cursor())
+
+    @property
+    def in_transaction(self):
+        return self._conexion.in_transaction
+
+    def start_transaction(self):
+        if not self._conexion.in_transaction:
+            self._ejecutar(lambda: self._conexion.execute("BEGIN"), "BEGIN")
+
+    def commit(self):
+        try:
+            self._ejecutar(self._conexion.commit)
+        finally:
+            self._soltar_escritura()
+
+    def rollback(self):
+        try:
+            self._ejecutar(self._conexion.rollback)
+        finally:
+            self._soltar_escritura()
+
+    def consume_results(self):
+        pass
+
+    def is_connected(self):
+        return self._abierta
+
+    def ping(self, reconnect=False, **kwargs):
+        if not self._abierta:
+            raise errors.OperationalError(msg="Conexión SQLite cerrada")
+        self._ejecutar(lambda: self._conexion.execute("SELECT 1"))
+
+    def close(self):
+        self._abierta = False
+        self._conexion.close()
+        self._soltar_escritura()
+
+    def _ejecutar(self, operacion, consulta=None):
+        if consulta is not None and self._escritura is not None and not self._escribiendo \
+                and consulta.lstrip()[:6].upper() not in ('SELECT', 'PRAGMA'):
+            if not self._escritura.acquire(timeout=self._backend.tiempo_espera):
+                raise errors.OperationalError(msg="Tiempo de espera agotado: otra transacción está escribiendo")
+            self._escribiendo = True
+        try:
+            operacion()
+        except sqlite3.Error as error:
+            raise _traducir_error(error) from error
+        finally:
+            if not self._conexion.in_transaction:
+                self._soltar_escritura()
+
+    def _soltar_escritura(self):
+        if self._escribiendo:
+            self._escribiendo = False
+            self._escritura.release()
+
+
+def crear_backend(motor, config, ruta_sqlite):
+    if motor == 'sqlite':
+        return SQLiteBackend(ruta_sqlite)
+    if motor == 'mysql':
+        return MySQLBackend(config)
+    raise ValueError(f"Motor de base de datos desconocido: {motor}")
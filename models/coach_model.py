@@ -1,121 +1,166 @@
 # Modelo para gestión de coaches
+import logging
 import mysql.connector
 from mysql.connector import Error
 from .database import Database
 
+logger = logging.getLogger(__name__)
+
 class CoachModel:
     def __init__(self):
         self.db = Database()
 
     def insert_coach(self, id_usuario, especialidades, horario_disponible, fecha_contratacion, salario):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `coaches`
-                (`id_usuario`, `especialidades`, `horario_disponible`, `fecha_contratacion`, `salario`)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (id_usuario, especialidades, horario_disponible, fecha_contratacion, salario))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return cursor.lastrowid  # Opcional: retornar ID del coach
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `coaches`
+                    (`id_usuario`, `especialidades`, `horario_disponible`, `fecha_contratacion`, `salario`)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (id_usuario, especialidades, horario_disponible, fecha_contratacion, salario))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return cursor.lastrowid  # Opcional: retornar ID del coach
 
         except mysql.connector.Error as error:
-            print(f"Error al insertar coach: {error}")
+            logger.error("Error al insertar coach: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def read_coaches(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `coaches`")
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `coaches`")
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al leer coaches: {error}")
+            logger.error("Error al leer coaches: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def get_coach_by_id(self, id_coach):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `coaches` WHERE `id_coach`=%s", (id_coach,))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer coach: %s", error)
+            return None
 
     def update_coach(self, id_coach, id_usuario, especialidades, horario_disponible, fecha_contratacion, salario):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                UPDATE `coaches` SET 
-                    `id_usuario`=%s, 
-                    `especialidades`=%s, 
-                    `horario_disponible`=%s, 
-                    `fecha_contratacion`=%s, 
-                    `salario`=%s 
-                WHERE `id_coach`=%s
-            """, (id_usuario, especialidades, horario_disponible, fecha_contratacion, salario, id_coach))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    UPDATE `coaches` SET 
+                        `id_usuario`=%s, 
+                        `especialidades`=%s, 
+                        `horario_disponible`=%s, 
+                        `fecha_contratacion`=%s, 
+                        `salario`=%s 
+                    WHERE `id_coach`=%s
+                """, (id_usuario, especialidades, horario_disponible, fecha_contratacion, salario, id_coach))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al actualizar coach: {error}")
+            logger.error("Error al actualizar coach: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def delete_coach(self, id_coach):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("DELETE FROM `coaches` WHERE `id_coach`=%s", (id_coach,))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `coaches` WHERE `id_coach`=%s", (id_coach,))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar coach: {error}")
+            logger.error("Error al eliminar coach: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def get_coaches_con_usuario(self):
+        """
+        Coaches con usuario activo y su fila de usuarios en una sola consulta, como
+        dicts {'coach_data', 'usuario_data'}; la columna marcador separa ambas tablas
+        sin depender de cuántas columnas tengan. None si falla.
+        """
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT c.*, NULL AS fin_coach, u.*
+                    FROM coaches c
+                    INNER JOIN usuarios u ON u.id = c.id_usuario
+                    WHERE u.estado_activo = 1
+                    ORDER BY c.id_coach
+                """)
+                columnas = [columna[0] for columna in cursor.description]
+                fin_coach = columnas.index('fin_coach')
+
+                return [
+                    {'coach_data': fila[:fin_coach], 'usuario_data': fila[fin_coach + 1:]}
+                    for fila in cursor.fetchall()
+                ]
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer coaches con usuario: %s", error)
+            return None
+
+    def get_resumen_por_coach(self):
+        """
+        Una fila por coach con usuario activo: (id_coach, nombre_completo, especialidades,
+        salario, atletas, asignaciones_activas), con los conteos agrupados en la misma
+        consulta. None si falla.
+        """
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT c.id_coach,
+                           CONCAT(u.nombre, ' ', u.apellido) AS nombre_completo,
+                           c.especialidades,
+                           c.salario,
+                           COALESCE(a.atletas, 0) AS atletas,
+                           COALESCE(s.asignaciones, 0) AS asignaciones_activas
+                    FROM coaches c
+                    INNER JOIN usuarios u ON u.id = c.id_usuario
+                    LEFT JOIN (
+                        SELECT id_coach, COUNT(*) AS atletas
+                        FROM atletas
+                        WHERE id_coach IS NOT NULL
+                        GROUP BY id_coach
+                    ) a ON a.id_coach = c.id_coach
+                    LEFT JOIN (
+                        SELECT id_coach, COUNT(*) AS asignaciones
+                        FROM asignaciones_coach_atleta
+                        WHERE estado_activo = 1
+                        GROUP BY id_coach
+                    ) s ON s.id_coach = c.id_coach
+                    WHERE u.estado_activo = 1
+                    ORDER BY c.id_coach
+                """)
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer resumen de coaches: %s", error)
+            return None
 
     def get_coaches_disponibles(self):
         """Obtiene coaches con información completa para asignaciones"""
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                SELECT 
-                    c.id_coach,
-                    c.id_usuario,
-                    u.nombre,
-                    u.apellido,
-                    CONCAT(u.nombre, ' ', u.apellido) as nombre_completo,
-                    c.especialidades,
-                    c.horario_disponible,
-                    u.estado_activo
-                FROM coaches c
-                INNER JOIN usuarios u ON c.id_usuario = u.id
-                WHERE u.estado_activo = 1
-                ORDER BY u.nombre, u.apellido
-            """)
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT 
+                        c.id_coach,
+                        c.id_usuario,
+                        u.nombre,
+                        u.apellido,
+                        CONCAT(u.nombre, ' ', u.apellido) as nombre_completo,
+                        c.especialidades,
+                        c.horario_disponible,
+                        u.estado_activo
+                    FROM coaches c
+                    INNER JOIN usuarios u ON c.id_usuario = u.id
+                    WHERE u.estado_activo = 1
+                    ORDER BY u.nombre, u.apellido
+                """)
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al obtener coaches disponibles: {error}")
-            return []
-
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
\ No newline at end of file
+            logger.error("Error al obtener coaches disponibles: %s", error)
+            return []
\ No newline at end of file
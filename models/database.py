@@ -1,33 +1,382 @@
-import mysql.connector
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
 from mysql.connector import Error
+from .backends import crear_backend
+from .instrumentacion import instrumentacion
+
+logger = logging.getLogger(__name__)
+
+
+# Parámetros del pool compartido por todos los modelos
+POOL_CONFIG = {
+    'tamaño': 5,                # conexiones simultáneas como máximo
+    'tiempo_espera': 10,        # segundos esperando una conexión libre
+    'tiempo_inactividad': 300,  # segundos antes de cerrar una conexión ociosa
+    'vida_maxima': 1800         # segundos antes de reciclar una conexión
+}
+
+# 'mysql' usa el servidor de Database.config; 'sqlite' un archivo local (o ':memory:')
+# sin servidor, para trabajar sin conexión, pruebas y benchmarks
+BACKEND_CONFIG = {
+    'motor': 'mysql',
+    'ruta_sqlite': 'gimnasio.db'
+}
+
+
+class PoolAgotadoError(Error):
+    """No se obtuvo una conexión libre dentro del tiempo de espera"""
+
+
+class UnidadDeTrabajo:
+    """Transacción abierta por Database.transaccion() en el hilo actual"""
+
+    def __init__(self, pool, conexion):
+        self.pool = pool
+        self.conexion = conexion
+        self.cancelada = False
+        self._al_finalizar = []
+
+    def cancelar(self):
+        """Descarta todo lo escrito en la transacción al salir del bloque"""
+        self.cancelada = True
+
+
+class _EntradaPool:
+    __slots__ = ('conexion', 'creada', 'ultimo_uso')
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.creada = time.monotonic()
+        self.ultimo_uso = self.creada
+
+
+class ConnectionPool:
+    """Pool acotado de conexiones reutilizables, abiertas con `backend.conectar()`"""
+
+    def __init__(self, backend, tamaño=5, tiempo_espera=10, tiempo_inactividad=300, vida_maxima=1800):
+        self.backend = backend
+        self.tamaño = tamaño
+        self.tiempo_espera = tiempo_espera
+        self.tiempo_inactividad = tiempo_inactividad
+        self.vida_maxima = vida_maxima
+
+        self._libres = []
+        self._prestadas = {}
+        self._reservadas = 0
+        self._condicion = threading.Condition()
+        self._estadisticas = {
+            'prestamos': 0,
+            'esperas': 0,
+            'tiempo_espera_total': 0.0,
+            'tiempo_espera_max': 0.0,
+            'reconexiones': 0,
+            'recicladas': 0,
+            'desalojadas': 0,
+            'creadas': 0,
+            'cerradas': 0
+        }
+
+    # ==================== PRÉSTAMO Y DEVOLUCIÓN ====================
+
+    def obtener(self):
+        """Presta una conexión sana del pool, esperando si está lleno"""
+        inicio = time.monotonic()
+        espero = False
+        entrada = None
+
+        with self._condicion:
+            while True:
+                self._desalojar_inactivas()
+                if self._libres:
+                    entrada = self._libres.pop()
+                    break
+                if self._total() < self.tamaño:
+                    break
+                espero = True
+                restante = self.tiempo_espera - (time.monotonic() - inicio)
+                if restante <= 0:
+                    raise PoolAgotadoError(msg=f"Pool agotado: {self.tamaño} conexiones en uso")
+                self._condicion.wait(restante)
+            self._reservadas += 1
+
+        try:
+            if entrada is None:
+                entrada = self._crear_entrada()
+            else:
+                entrada = self._validar_entrada(entrada)
+        except Exception:
+            with self._condicion:
+                self._reservadas -= 1
+                self._condicion.notify()
+            raise
+
+        espera = time.monotonic() - inicio
+        with self._condicion:
+            self._reservadas -= 1
+            self._prestadas[id(entrada.conexion)] = entrada
+            self._estadisticas['prestamos'] += 1
+            if espero:
+                self._estadisticas['esperas'] += 1
+                self._estadisticas['tiempo_espera_total'] += espera
+                self._estadisticas['tiempo_espera_max'] = max(self._estadisticas['tiempo_espera_max'], espera)
+
+        return entrada.conexion
+
+    def liberar(self, conexion):
+        """Devuelve una conexión al pool dejando la sesión limpia"""
+        with self._condicion:
+            entrada = self._prestadas.pop(id(conexion), None)
+        if entrada is None:
+            return
+
+        try:
+            if conexion.unread_result:
+                conexion.consume_results()
+            if conexion.in_transaction:
+                conexion.rollback()
+            reutilizable = conexion.is_connected()
+        except Error:
+            reutilizable = False
+
+        with self._condicion:
+            if reutilizable:
+                entrada.ultimo_uso = time.monotonic()
+                self._libres.append(entrada)
+            else:
+                self._cerrar(entrada)
+            self._condicion.notify()
+
+    def cerrar_todas(self):
+        """Cierra las conexiones libres (las prestadas se cierran al devolverse)"""
+        with self._condicion:
+            while self._libres:
+                self._cerrar(self._libres.pop())
+
+    def estadisticas(self):
+        """Copia de los contadores del pool para monitoreo"""
+        with self._condicion:
+            datos = dict(self._estadisticas)
+            datos['en_uso'] = len(self._prestadas)
+            datos['libres'] = len(self._libres)
+            datos['tamaño'] = self.tamaño
+        if datos['esperas']:
+            datos['tiempo_espera_promedio'] = datos['tiempo_espera_total'] / datos['esperas']
+        else:
+            datos['tiempo_espera_promedio'] = 0.0
+        return datos
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _total(self):
+        return len(self._libres) + len(self._prestadas) + self._reservadas
+
+    def _crear_entrada(self):
+        conexion = self.backend.conectar()
+        with self._condicion:
+            self._estadisticas['creadas'] += 1
+        return _EntradaPool(conexion)
+
+    def _validar_entrada(self, entrada):
+        """Health-check al prestar: recicla por antigüedad y reconecta si no responde"""
+        if time.monotonic() - entrada.creada > self.vida_maxima:
+            with self._condicion:
+                self._cerrar(entrada)
+                self._estadisticas['recicladas'] += 1
+            return self._crear_entrada()
+
+        try:
+            entrada.conexion.ping(reconnect=False)
+            return entrada
+        except Error:
+            with self._condicion:
+                self._cerrar(entrada)
+                self._estadisticas['reconexiones'] += 1
+            return self._crear_entrada()
+
+    def _desalojar_inactivas(self):
+        ahora = time.monotonic()
+        vigentes = []
+        for entrada in self._libres:
+            if ahora - entrada.ultimo_uso > self.tiempo_inactividad:
+                self._cerrar(entrada)
+                self._estadisticas['desalojadas'] += 1
+            else:
+                vigentes.append(entrada)
+        self._libres = vigentes
+
+    def _cerrar(self, entrada):
+        try:
+            entrada.conexion.close()
+        except Error:
+            pass
+        self._estadisticas['cerradas'] += 1
+
 
 class Database:
+    _pools = {}
+    _lock_pools = threading.Lock()
+    _hilo = threading.local()  # unidad de trabajo activa en cada hilo
+
     def __init__(self):
         self.config = {
             'host': 'localhost',
             'user': 'root',
-            'password': '', 
+            'password': '',
             'database': 'ahenas',
             'port': 3306
         }
         self.connection = None
-    
+        self.pool = self._obtener_pool(self.config)
+
+    @property
+    def dialecto(self):
+        """SQL propio del motor en uso (upsert, DDL, índices, bloqueos)"""
+        return self.pool.backend.dialecto
+
+    @classmethod
+    def _obtener_pool(cls, config):
+        """Un único pool por motor y configuración, compartido por todos los modelos"""
+        motor = BACKEND_CONFIG['motor']
+        if motor == 'sqlite':
+            clave = (motor, BACKEND_CONFIG['ruta_sqlite'])
+        else:
+            clave = (motor,) + tuple(sorted(config.items()))
+        with cls._lock_pools:
+            if clave not in cls._pools:
+                backend = crear_backend(motor, config, BACKEND_CONFIG['ruta_sqlite'])
+                cls._pools[clave] = ConnectionPool(backend, **POOL_CONFIG)
+            return cls._pools[clave]
+
+    @classmethod
+    def cerrar_pools(cls):
+        """
+        Cierra y olvida todos los pools: los Database creados después usan la
+        BACKEND_CONFIG vigente (benchmarks y pruebas que cambian de base)
+        """
+        with cls._lock_pools:
+            for pool in cls._pools.values():
+                pool.cerrar_todas()
+                pool.backend.cerrar()
+            cls._pools.clear()
+
+    @contextmanager
+    def conexion(self):
+        """Presta una conexión del pool y la devuelve al salir del bloque"""
+        if instrumentacion.activa:
+            inicio = time.perf_counter()
+            conexion = self.pool.obtener()
+            instrumentacion.registrar_conexion(time.perf_counter() - inicio)
+        else:
+            conexion = self.pool.obtener()
+        try:
+            yield conexion
+        finally:
+            self.pool.liberar(conexion)
+
+    @contextmanager
+    def cursor(self, commit=False, buffered=True):
+        """
+        Cursor sobre una conexión del pool; con commit=True confirma al salir sin errores.
+        Dentro de una transacción() usa su conexión y deja la confirmación para el final.
+        Con buffered=False las filas quedan en el servidor y se leen con fetchmany
+        (consultas grandes en memoria constante).
+        Con la instrumentación activa el cursor mide cada consulta.
+        """
+        unidad = self._unidad_activa()
+        if unidad is not None:
+            cursor = self._nuevo_cursor(unidad.conexion, buffered)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+
+        with self.conexion() as conexion:
+            cursor = self._nuevo_cursor(conexion, buffered)
+            try:
+                yield cursor
+                if commit:
+                    conexion.commit()
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Unidad de trabajo: todos los modelos que usen cursor() en este hilo dentro del
+        bloque escriben sobre una misma conexión, y se confirma una sola vez al salir.
+        Se revierte si el bloque lanza una excepción o llama a `cancelar()`. Un bloque
+        anidado se suma a la transacción exterior.
+        """
+        unidad = self._unidad_activa()
+        if unidad is not None:
+            yield unidad
+            return
+
+        with self.conexion() as conexion:
+            unidad = UnidadDeTrabajo(self.pool, conexion)
+            Database._hilo.unidad = unidad
+            try:
+                conexion.start_transaction()
+                yield unidad
+                if unidad.cancelada:
+                    conexion.rollback()
+                else:
+                    conexion.commit()
+            except BaseException:
+                conexion.rollback()
+                raise
+            finally:
+                Database._hilo.unidad = None
+                for funcion in unidad._al_finalizar:
+                    funcion()
+
+    def al_finalizar(self, funcion):
+        """
+        Ejecuta `funcion` cuando termina la transacción en curso (confirmada o no), o
+        enseguida si no hay ninguna. Sirve para invalidar caches sin exponer datos que
+        todavía podrían revertirse.
+        """
+        unidad = self._unidad_activa()
+        if unidad is None:
+            funcion()
+        else:
+            unidad._al_finalizar.append(funcion)
+
+    def _nuevo_cursor(self, conexion, buffered):
+        cursor = conexion.cursor(buffered=buffered)
+        return instrumentacion.envolver(cursor) if instrumentacion.activa else cursor
+
+    def _unidad_activa(self):
+        unidad = getattr(Database._hilo, 'unidad', None)
+        if unidad is not None and unidad.pool is self.pool:
+            return unidad
+        return None
+
+    def estadisticas_pool(self):
+        """Contadores del pool (préstamos, esperas, tiempo de espera, reconexiones)"""
+        return self.pool.estadisticas()
+
     def connect(self):
         """Conectar a la base de datos"""
         try:
-            self.connection = mysql.connector.connect(**self.config)
-            
+            self.connection = self.pool.obtener()
+
             if self.connection.is_connected():
-                print("✅ Conexión exitosa a la base de datos")
-                print(f"📊 Base de datos: {self.config['database']}")
+                logger.info("Conexión exitosa a la base de datos")
+                logger.debug("Base de datos: %s", self.config['database'])
                 return True
-                
+
         except Error as e:
-            print(f"❌ Error conectando: {e}")
+            logger.error("Error conectando: %s", e)
             return False
-    
+
     def disconnect(self):
-        """Desconectar"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            print("🔌 Conexión cerrada")
+        """Devolver la conexión al pool"""
+        if self.connection:
+            self.pool.liberar(self.connection)
+            self.connection = None
+            logger.info("Conexión cerrada")
@@ -1,88 +1,127 @@
 # Modelo para gestión de egresos
+import logging
 import mysql.connector
 from mysql.connector import Error
 from .database import Database
+from .resumen_financiero_model import ResumenFinancieroModel
+
+logger = logging.getLogger(__name__)
 
 class EgresoModel:
     def __init__(self):
         self.db = Database()
+        self.resumen = ResumenFinancieroModel()
     
     # Aquí van los métodos para egresos
     def insert_egreso(self, monto, tipo_egreso, descripcion, beneficiario, metodo_pago, fecha_egreso, registrado_por, comprobante):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `egresos`
-                (`monto`, `tipo_egreso`, `descripcion`, `beneficiario`, `metodo_pago`, `fecha_egreso`, `registrado_por`, `comprobante`)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (monto, tipo_egreso, descripcion, beneficiario, metodo_pago, fecha_egreso, registrado_por, comprobante))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return cursor.lastrowid  # útil para seguimiento/logs
+            actualizar_resumen = self.resumen.disponible()
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `egresos`
+                    (`monto`, `tipo_egreso`, `descripcion`, `beneficiario`, `metodo_pago`, `fecha_egreso`, `registrado_por`, `comprobante`)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """, (monto, tipo_egreso, descripcion, beneficiario, metodo_pago, fecha_egreso, registrado_por, comprobante))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                nuevo_id = cursor.lastrowid  # útil para seguimiento/logs
+                if actualizar_resumen:
+                    self.resumen.aplicar(cursor, 'egreso', fecha_egreso, tipo_egreso, metodo_pago, monto)
+                return nuevo_id
 
         except mysql.connector.Error as error:
-            print(f"Error al insertar egreso: {error}")
+            logger.error("Error al insertar egreso: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def read_egresos(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `egresos`")
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `egresos`")
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al leer egresos: {error}")
+            logger.error("Error al leer egresos: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def get_egresos_by_tipo(self, tipo_egreso):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `egresos` WHERE `tipo_egreso`=%s", (tipo_egreso,))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer egresos por tipo: %s", error)
+            return []
+
+    def get_egresos_by_fecha(self, fecha_inicio, fecha_fin):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT * FROM `egresos`
+                    WHERE `fecha_egreso` BETWEEN %s AND %s
+                    ORDER BY `fecha_egreso` DESC
+                """, (fecha_inicio, fecha_fin))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer egresos por fecha: %s", error)
+            return []
+
+    def get_totales_por_tipo(self, fecha_inicio, fecha_fin):
+        """Cantidad y suma de egresos por tipo_egreso dentro del periodo (agregado en la BD)"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT `tipo_egreso`, COUNT(*), COALESCE(SUM(`monto`), 0)
+                    FROM `egresos`
+                    WHERE `fecha_egreso` BETWEEN %s AND %s
+                    GROUP BY `tipo_egreso`
+                """, (fecha_inicio, fecha_fin))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al totalizar egresos: %s", error)
+            return None
 
     def update_egreso(self, id_egreso, monto, tipo_egreso, descripcion, beneficiario, metodo_pago, fecha_egreso, registrado_por, comprobante):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                UPDATE `egresos` SET 
-                    `monto`=%s, `tipo_egreso`=%s, `descripcion`=%s, `beneficiario`=%s, 
-                    `metodo_pago`=%s, `fecha_egreso`=%s, `registrado_por`=%s, `comprobante`=%s 
-                WHERE `id_egreso`=%s
-            """, (monto, tipo_egreso, descripcion, beneficiario, metodo_pago, fecha_egreso, registrado_por, comprobante, id_egreso))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            actualizar_resumen = self.resumen.disponible()
+            with self.db.cursor(commit=True) as cursor:
+                anterior = self._movimiento_resumen(cursor, id_egreso) if actualizar_resumen else None
+                cursor.execute("""
+                    UPDATE `egresos` SET 
+                        `monto`=%s, `tipo_egreso`=%s, `descripcion`=%s, `beneficiario`=%s, 
+                        `metodo_pago`=%s, `fecha_egreso`=%s, `registrado_por`=%s, `comprobante`=%s 
+                    WHERE `id_egreso`=%s
+                """, (monto, tipo_egreso, descripcion, beneficiario, metodo_pago, fecha_egreso, registrado_por, comprobante, id_egreso))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                if anterior:
+                    self.resumen.aplicar(cursor, 'egreso', *anterior, signo=-1)
+                    self.resumen.aplicar(cursor, 'egreso', fecha_egreso, tipo_egreso, metodo_pago, monto)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al actualizar egreso: {error}")
+            logger.error("Error al actualizar egreso: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def delete_egreso(self, id_egreso):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("DELETE FROM `egresos` WHERE `id_egreso`=%s", (id_egreso,))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            actualizar_resumen = self.resumen.disponible()
+            with self.db.cursor(commit=True) as cursor:
+                anterior = self._movimiento_resumen(cursor, id_egreso) if actualizar_resumen else None
+                cursor.execute("DELETE FROM `egresos` WHERE `id_egreso`=%s", (id_egreso,))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                if anterior:
+                    self.resumen.aplicar(cursor, 'egreso', *anterior, signo=-1)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar egreso: {error}")
+            logger.error("Error al eliminar egreso: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
\ No newline at end of file
+    def _movimiento_resumen(self, cursor, id_egreso):
+        """(fecha, tipo, metodo, monto) actuales del egreso, bloqueado hasta el commit"""
+        cursor.execute("""
+            SELECT `fecha_egreso`, `tipo_egreso`, `metodo_pago`, `monto`
+            FROM `egresos` WHERE `id_egreso`=%s FOR UPDATE
+        """, (id_egreso,))
+        return cursor.fetchone()
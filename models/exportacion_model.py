@@ -0,0 +1,130 @@
+# Modelo para exportar tablas grandes leyéndolas por bloques desde el servidor
+import logging
+import mysql.connector
+from mysql.connector import Error
+from .database import Database
+from .resumen_financiero_model import TABLA_RESUMEN
+
+logger = logging.getLogger(__name__)
+
+
+# Por tipo de exportación: encabezados, SELECT/FROM, columna de fecha para el rango y orden
+EXPORTACIONES = {
+    'pagos': {
+        'encabezados': ('ID', 'Fecha', 'Atleta', 'Plan', 'Monto', 'Tipo', 'Método', 'Descripción', 'Procesado por'),
+        'consulta': """
+            SELECT i.`id_pago`, i.`fecha_pago`, CONCAT(ua.`nombre`, ' ', ua.`apellido`), p.`nombre_plan`,
+                   i.`monto`, i.`tipo_pago`, i.`metodo_pago`, i.`descripcion`,
+                   CONCAT(up.`nombre`, ' ', up.`apellido`)
+            FROM `ingresos` i
+            LEFT JOIN `usuarios` ua ON ua.`id` = i.`id_atleta`
+            LEFT JOIN `planes` p ON p.`id_plan` = i.`id_plan`
+            LEFT JOIN `usuarios` up ON up.`id` = i.`procesado_por`
+        """,
+        'tabla': "`ingresos` i",
+        'fecha': "i.`fecha_pago`",
+        'orden': "i.`fecha_pago`, i.`id_pago`"
+    },
+    'egresos': {
+        'encabezados': ('ID', 'Fecha', 'Tipo', 'Descripción', 'Beneficiario', 'Método', 'Monto',
+                        'Registrado por', 'Comprobante'),
+        'consulta': """
+            SELECT e.`id_egreso`, e.`fecha_egreso`, e.`tipo_egreso`, e.`descripcion`, e.`beneficiario`,
+                   e.`metodo_pago`, e.`monto`, CONCAT(u.`nombre`, ' ', u.`apellido`), e.`comprobante`
+            FROM `egresos` e
+            LEFT JOIN `usuarios` u ON u.`id` = e.`registrado_por`
+        """,
+        'tabla': "`egresos` e",
+        'fecha': "e.`fecha_egreso`",
+        'orden': "e.`fecha_egreso`, e.`id_egreso`"
+    },
+    'atletas': {
+        'encabezados': ('ID', 'Nombre', 'Apellido', 'Cédula', 'Email', 'Teléfono', 'Plan', 'Coach',
+                        'Estado', 'Inscripción', 'Vencimiento'),
+        'consulta': """
+            SELECT a.`id_atleta`, u.`nombre`, u.`apellido`, a.`cedula`, u.`email`, u.`telefono`,
+                   p.`nombre_plan`, CONCAT(cu.`nombre`, ' ', cu.`apellido`), a.`estado_solvencia`,
+                   a.`fecha_inscripcion`, a.`fecha_vencimiento`
+            FROM `atletas` a
+            INNER JOIN `usuarios` u ON u.`id` = a.`id_usuario`
+            LEFT JOIN `planes` p ON p.`id_plan` = a.`id_plan`
+            LEFT JOIN `coaches` c ON c.`id_coach` = a.`id_coach`
+            LEFT JOIN `usuarios` cu ON cu.`id` = c.`id_usuario`
+        """,
+        'tabla': "`atletas` a",
+        'fecha': "a.`fecha_inscripcion`",
+        'orden': "a.`id_atleta`"
+    },
+    'reporte': {
+        'encabezados': ('Fecha', 'Movimiento', 'Tipo', 'Método de pago', 'Cantidad', 'Total'),
+        'consulta': f"""
+            SELECT r.`fecha`, r.`movimiento`, r.`tipo`, r.`metodo_pago`, r.`cantidad`, r.`total`
+            FROM `{TABLA_RESUMEN}` r
+        """,
+        'tabla': f"`{TABLA_RESUMEN}` r",
+        'fecha': "r.`fecha`",
+        'orden': "r.`fecha`, r.`movimiento`, r.`tipo`, r.`metodo_pago`"
+    }
+}
+
+
+class ExportacionModel:
+    """
+    Lee una exportación con un cursor sin buffer: el servidor entrega las filas a
+    medida que se piden con fetchmany, así nunca hay más de un bloque en memoria.
+    """
+
+    def __init__(self):
+        self.db = Database()
+
+    def contar(self, tipo, fecha_inicio=None, fecha_fin=None):
+        """Cantidad de filas que exportará `iterar` (para la barra de progreso), o None"""
+        definicion = EXPORTACIONES[tipo]
+        condicion, parametros = self._rango(definicion, fecha_inicio, fecha_fin)
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM {definicion['tabla']}{condicion}", parametros)
+                return cursor.fetchone()[0]
+
+        except mysql.connector.Error as error:
+            logger.error("Error al contar filas de %s: %s", tipo, error)
+            return None
+
+    def iterar(self, tipo, fecha_inicio=None, fecha_fin=None, tamaño_bloque=1000):
+        """
+        Genera bloques de hasta `tamaño_bloque` filas. Los errores de la BD se propagan:
+        un archivo a medias no debe darse por completo.
+        """
+        definicion = EXPORTACIONES[tipo]
+        condicion, parametros = self._rango(definicion, fecha_inicio, fecha_fin)
+
+        with self.db.cursor(buffered=False) as cursor:
+            cursor.execute(f"{definicion['consulta']}{condicion} ORDER BY {definicion['orden']}", parametros)
+            try:
+                while True:
+                    bloque = cursor.fetchmany(tamaño_bloque)
+                    if not bloque:
+                        return
+                    yield bloque
+            except GeneratorExit:
+                # Exportación cancelada: descartar lo pendiente por bloques antes de cerrar
+                while cursor.fetchmany(tamaño_bloque):
+                    pass
+                raise
+
+    def encabezados(self, tipo):
+        return EXPORTACIONES[tipo]['encabezados']
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _rango(self, definicion, fecha_inicio, fecha_fin):
+        condiciones = []
+        parametros = []
+        if fecha_inicio is not None:
+            condiciones.append(f"{definicion['fecha']} >= %s")
+            parametros.append(fecha_inicio)
+        if fecha_fin is not None:
+            condiciones.append(f"{definicion['fecha']} <= %s")
+            parametros.append(fecha_fin)
+        condicion = " WHERE " + " AND ".join(condiciones) if condiciones else ""
+        return condicion, tuple(parametros)
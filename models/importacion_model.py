@@ -0,0 +1,161 @@
+# Modelo para la importación masiva de atletas e ingresos históricos
+import logging
+from collections import defaultdict
+
+import mysql.connector
+from mysql.connector import Error
+from .database import Database
+from .resumen_financiero_model import ResumenFinancieroModel
+from .usuario_model import directorio
+
+logger = logging.getLogger(__name__)
+
+
+# Contraseña que ningún hash acepta: los usuarios importados no pueden iniciar
+# sesión hasta que se les asigne una (igual que los creados al registrar un atleta,
+# cuya contraseña aleatoria no se comunica)
+CONTRASEÑA_BLOQUEADA = '!'
+
+
+def _insert_multiple(cursor, tabla, columnas, filas):
+    """Un solo INSERT con una tupla de VALUES por fila"""
+    if not filas:
+        return
+    marcadores = '(' + ', '.join(['%s'] * len(columnas)) + ')'
+    cursor.execute(
+        f"INSERT INTO `{tabla}` ({', '.join(f'`{c}`' for c in columnas)}) VALUES "
+        + ', '.join([marcadores] * len(filas)),
+        tuple(valor for fila in filas for valor in fila)
+    )
+
+
+class ImportacionModel:
+    """
+    Lecturas de referencia (cédulas, emails y planes existentes) que se hacen una vez
+    por importación, y escrituras por lote: cada lote es una transacción con
+    INSERT de varias filas por tabla.
+    """
+
+    def __init__(self):
+        self.db = Database()
+        self.resumen = ResumenFinancieroModel()
+
+    # ==================== DATOS DE REFERENCIA ====================
+
+    def get_cedulas_usuarios(self):
+        """{cédula: id_usuario} de los atletas existentes, o None si falla"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT `cedula`, `id_usuario` FROM `atletas`")
+                return {str(cedula).strip(): id_usuario for cedula, id_usuario in cursor.fetchall()}
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer cédulas: %s", error)
+            return None
+
+    def get_emails(self):
+        """Emails registrados en minúsculas, o None si falla"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT `email` FROM `usuarios`")
+                return {str(email).strip().lower() for (email,) in cursor.fetchall() if email}
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer emails: %s", error)
+            return None
+
+    def get_planes(self):
+        """Planes como (id_plan, nombre_plan, precio, duracion_dias), o None si falla"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT `id_plan`, `nombre_plan`, `precio`, `duracion_dias` FROM `planes`")
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer planes: %s", error)
+            return None
+
+    def get_ids_coaches(self):
+        """IDs de los coaches existentes, o None si falla"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT `id_coach` FROM `coaches`")
+                return {id_coach for (id_coach,) in cursor.fetchall()}
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer coaches: %s", error)
+            return None
+
+    # ==================== ESCRITURA POR LOTES ====================
+
+    def insertar_atletas(self, filas, creado_por):
+        """
+        Inserta un lote de atletas con su usuario. Cada fila es un dict con los datos
+        del usuario (nombre, apellido, edad, direccion, telefono, email) y del atleta
+        (cedula, peso, fecha_nacimiento, fecha_inscripcion, fecha_vencimiento, id_plan,
+        id_coach, meta_largo_plazo, valoracion_especiales, estado_solvencia).
+        Devuelve {cédula: id_usuario} de lo insertado, o None si el lote se revirtió.
+        """
+        try:
+            with self.db.transaccion():
+                with self.db.cursor() as cursor:
+                    _insert_multiple(cursor, 'usuarios', (
+                        'nombre', 'apellido', 'edad', 'direccion', 'telefono', 'email',
+                        'contraseña', 'rol', 'creado_por'
+                    ), [(f['nombre'], f['apellido'], f['edad'], f['direccion'], f['telefono'], f['email'],
+                         CONTRASEÑA_BLOQUEADA, 'atleta', creado_por) for f in filas])
+
+                    marcadores = ', '.join(['%s'] * len(filas))
+                    cursor.execute(
+                        f"SELECT `id`, `email` FROM `usuarios` WHERE `email` IN ({marcadores})",
+                        tuple(f['email'] for f in filas)
+                    )
+                    ids_por_email = {str(email).lower(): id_usuario for id_usuario, email in cursor.fetchall()}
+
+                    _insert_multiple(cursor, 'atletas', (
+                        'id_usuario', 'cedula', 'peso', 'fecha_nacimiento', 'fecha_inscripcion',
+                        'fecha_vencimiento', 'id_plan', 'id_coach', 'meta_largo_plazo',
+                        'valoracion_especiales', 'estado_solvencia'
+                    ), [(ids_por_email[f['email'].lower()], f['cedula'], f['peso'], f['fecha_nacimiento'],
+                         f['fecha_inscripcion'], f['fecha_vencimiento'], f['id_plan'], f['id_coach'],
+                         f['meta_largo_plazo'], f['valoracion_especiales'], f['estado_solvencia'])
+                        for f in filas])
+
+                self.db.al_finalizar(directorio.invalidar)
+
+            return {f['cedula']: ids_por_email[f['email'].lower()] for f in filas}
+
+        except mysql.connector.Error as error:
+            logger.error("Error al importar lote de atletas: %s", error)
+            return None
+
+    def insertar_ingresos(self, filas):
+        """
+        Inserta un lote de ingresos históricos y los suma al resumen diario agrupados.
+        Cada fila es un dict con las columnas de `ingresos`. Devuelve True o False.
+        """
+        try:
+            actualizar_resumen = self.resumen.disponible()
+            with self.db.transaccion():
+                with self.db.cursor() as cursor:
+                    _insert_multiple(cursor, 'ingresos', (
+                        'id_atleta', 'id_plan', 'monto', 'tipo_pago', 'metodo_pago', 'descripcion',
+                        'fecha_pago', 'fecha_vencimiento_anterior', 'fecha_vencimiento_nueva', 'procesado_por'
+                    ), [(f['id_atleta'], f['id_plan'], f['monto'], f['tipo_pago'], f['metodo_pago'],
+                         f['descripcion'], f['fecha_pago'], f['fecha_vencimiento_anterior'],
+                         f['fecha_vencimiento_nueva'], f['procesado_por']) for f in filas])
+
+                    if actualizar_resumen:
+                        grupos = defaultdict(lambda: [0, 0])
+                        for f in filas:
+                            grupo = grupos[(f['fecha_pago'], f['tipo_pago'], f['metodo_pago'])]
+                            grupo[0] += 1
+                            grupo[1] += f['monto']
+                        for (fecha_pago, tipo_pago, metodo_pago), (cantidad, total) in grupos.items():
+                            self.resumen.aplicar(cursor, 'ingreso', fecha_pago, tipo_pago, metodo_pago,
+                                                 total, cantidad=cantidad)
+            return True
+
+        except mysql.connector.Error as error:
+            logger.error("Error al importar lote de ingresos: %s", error)
+            return False
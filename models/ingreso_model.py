@@ -1,88 +1,235 @@
 # Modelo para gestión de ingresos
+import logging
 import mysql.connector
 from mysql.connector import Error
 from .database import Database
+from .resumen_financiero_model import ResumenFinancieroModel
+
+logger = logging.getLogger(__name__)
 
 class IngresoModel:
     def __init__(self):
         self.db = Database()
+        self.resumen = ResumenFinancieroModel()
 
     def insert_ingreso(self, id_atleta, id_plan, monto, tipo_pago, metodo_pago, descripcion, fecha_pago, fecha_vencimiento_anterior, fecha_vencimiento_nueva, procesado_por):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `ingresos`
-                (`id_atleta`, `id_plan`, `monto`, `tipo_pago`, `metodo_pago`, `descripcion`, `fecha_pago`, `fecha_vencimiento_anterior`, `fecha_vencimiento_nueva`, `procesado_por`)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (id_atleta, id_plan, monto, tipo_pago, metodo_pago, descripcion, fecha_pago, fecha_vencimiento_anterior, fecha_vencimiento_nueva, procesado_por))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return cursor.lastrowid  # Útil para seguimiento
+            actualizar_resumen = self.resumen.disponible()
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `ingresos`
+                    (`id_atleta`, `id_plan`, `monto`, `tipo_pago`, `metodo_pago`, `descripcion`, `fecha_pago`, `fecha_vencimiento_anterior`, `fecha_vencimiento_nueva`, `procesado_por`)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (id_atleta, id_plan, monto, tipo_pago, metodo_pago, descripcion, fecha_pago, fecha_vencimiento_anterior, fecha_vencimiento_nueva, procesado_por))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                nuevo_id = cursor.lastrowid  # Útil para seguimiento
+                if actualizar_resumen:
+                    self.resumen.aplicar(cursor, 'ingreso', fecha_pago, tipo_pago, metodo_pago, monto)
+                return nuevo_id
 
         except mysql.connector.Error as error:
-            print(f"Error al insertar ingreso: {error}")
+            logger.error("Error al insertar ingreso: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def insert_renovaciones(self, renovaciones):
+        """
+        Registra varias renovaciones en una sola transacción: los ingresos, la nueva
+        fecha de vencimiento de cada atleta y el resumen diario. Cada renovación es un
+        dict con id_atleta, id_plan, monto, metodo_pago, descripcion, fecha_pago,
+        fecha_vencimiento_anterior, fecha_vencimiento_nueva y procesado_por.
+        Devuelve True si se confirmó todo, False si no se guardó nada.
+        """
+        if not renovaciones:
+            return True
+        try:
+            actualizar_resumen = self.resumen.disponible()
+            with self.db.cursor(commit=True) as cursor:
+                cursor.executemany("""
+                    INSERT INTO `ingresos`
+                    (`id_atleta`, `id_plan`, `monto`, `tipo_pago`, `metodo_pago`, `descripcion`, `fecha_pago`, `fecha_vencimiento_anterior`, `fecha_vencimiento_nueva`, `procesado_por`)
+                    VALUES (%s, %s, %s, 'renovacion', %s, %s, %s, %s, %s, %s)
+                """, [(r['id_atleta'], r['id_plan'], r['monto'], r['metodo_pago'], r['descripcion'], r['fecha_pago'],
+                       r['fecha_vencimiento_anterior'], r['fecha_vencimiento_nueva'], r['procesado_por'])
+                      for r in renovaciones])
+
+                cursor.executemany("""
+                    UPDATE `atletas` SET `fecha_vencimiento`=%s, `estado_solvencia`='solvente'
+                    WHERE `id_atleta`=%s
+                """, [(r['fecha_vencimiento_nueva'], r['id_atleta']) for r in renovaciones])
+
+                if actualizar_resumen:
+                    grupos = {}
+                    for r in renovaciones:
+                        clave = (r['fecha_pago'], r['metodo_pago'])
+                        cantidad, total = grupos.get(clave, (0, 0))
+                        grupos[clave] = (cantidad + 1, total + r['monto'])
+                    for (fecha_pago, metodo_pago), (cantidad, total) in grupos.items():
+                        self.resumen.aplicar(cursor, 'ingreso', fecha_pago, 'renovacion', metodo_pago,
+                                             total, cantidad=cantidad)
+            return True
+
+        except mysql.connector.Error as error:
+            logger.error("Error al registrar renovaciones: %s", error)
+            return False
 
     def read_ingresos(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `ingresos`")
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `ingresos`")
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer ingresos: %s", error)
+            return []
+
+    def get_ingreso_by_id(self, id_pago):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `ingresos` WHERE `id_pago`=%s", (id_pago,))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer ingreso: %s", error)
+            return None
+
+    def get_ingresos_by_atleta(self, id_atleta):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `ingresos` WHERE `id_atleta`=%s ORDER BY `fecha_pago` DESC", (id_atleta,))
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al leer ingresos: {error}")
+            logger.error("Error al leer ingresos del atleta: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def get_ingresos_by_fecha(self, fecha_inicio, fecha_fin):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT * FROM `ingresos`
+                    WHERE `fecha_pago` BETWEEN %s AND %s
+                    ORDER BY `fecha_pago` DESC
+                """, (fecha_inicio, fecha_fin))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer ingresos por fecha: %s", error)
+            return []
+
+    def get_ingresos_detallados(self, limite=None, despues_de=None, fecha_inicio=None, fecha_fin=None, tipo_pago=None, texto=None):
+        """
+        Ingresos con nombre de atleta, plan y procesador, del más reciente al más antiguo.
+        Paginación por clave: `despues_de` es el (fecha_pago, id_pago) de la última fila
+        de la página anterior, así cada página es una lectura acotada sobre el índice.
+        """
+        condiciones = []
+        parametros = []
+
+        if fecha_inicio is not None:
+            condiciones.append("i.`fecha_pago` >= %s")
+            parametros.append(fecha_inicio)
+        if fecha_fin is not None:
+            condiciones.append("i.`fecha_pago` <= %s")
+            parametros.append(fecha_fin)
+        if tipo_pago:
+            condiciones.append("i.`tipo_pago` = %s")
+            parametros.append(tipo_pago)
+        if texto:
+            # '%' y '_' escritos por el usuario se buscan literalmente ('!' es el escape:
+            # la barra invertida se interpreta distinto en MySQL y SQLite)
+            patron = "%" + texto.replace('!', '!!').replace('%', '!%').replace('_', '!_') + "%"
+            condiciones.append("(CONCAT(ua.`nombre`, ' ', ua.`apellido`) LIKE %s ESCAPE '!' "
+                               "OR i.`descripcion` LIKE %s ESCAPE '!')")
+            parametros.extend([patron, patron])
+        if despues_de is not None:
+            fecha_cursor, id_cursor = despues_de
+            condiciones.append("(i.`fecha_pago` < %s OR (i.`fecha_pago` = %s AND i.`id_pago` < %s))")
+            parametros.extend([fecha_cursor, fecha_cursor, id_cursor])
+
+        consulta = """
+            SELECT i.`id_pago`, i.`id_atleta`, i.`id_plan`, i.`monto`, i.`tipo_pago`, i.`metodo_pago`,
+                   i.`descripcion`, i.`fecha_pago`, i.`procesado_por`,
+                   CONCAT(ua.`nombre`, ' ', ua.`apellido`) AS nombre_atleta,
+                   p.`nombre_plan`,
+                   CONCAT(up.`nombre`, ' ', up.`apellido`) AS nombre_procesador
+            FROM `ingresos` i
+            LEFT JOIN `usuarios` ua ON ua.`id` = i.`id_atleta`
+            LEFT JOIN `planes` p ON p.`id_plan` = i.`id_plan`
+            LEFT JOIN `usuarios` up ON up.`id` = i.`procesado_por`
+        """
+        if condiciones:
+            consulta += " WHERE " + " AND ".join(condiciones)
+        consulta += " ORDER BY i.`fecha_pago` DESC, i.`id_pago` DESC"
+        if limite is not None:
+            consulta += " LIMIT %s"
+            parametros.append(limite)
+
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute(consulta, tuple(parametros))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer ingresos detallados: %s", error)
+            return None
+
+    def get_totales_por_tipo(self, fecha_inicio, fecha_fin):
+        """Cantidad y suma de ingresos por tipo_pago dentro del periodo (agregado en la BD)"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT `tipo_pago`, COUNT(*), COALESCE(SUM(`monto`), 0)
+                    FROM `ingresos`
+                    WHERE `fecha_pago` BETWEEN %s AND %s
+                    GROUP BY `tipo_pago`
+                """, (fecha_inicio, fecha_fin))
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al totalizar ingresos: %s", error)
+            return None
 
     def update_ingreso(self, id_pago, id_atleta, id_plan, monto, tipo_pago, metodo_pago, descripcion, fecha_pago, fecha_vencimiento_anterior, fecha_vencimiento_nueva, procesado_por):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                UPDATE `ingresos` SET 
-                    `id_atleta`=%s, `id_plan`=%s, `monto`=%s, `tipo_pago`=%s, `metodo_pago`=%s,
-                    `descripcion`=%s, `fecha_pago`=%s, `fecha_vencimiento_anterior`=%s, 
-                    `fecha_vencimiento_nueva`=%s, `procesado_por`=%s
-                WHERE `id_pago`=%s
-            """, (id_atleta, id_plan, monto, tipo_pago, metodo_pago, descripcion, fecha_pago, fecha_vencimiento_anterior, fecha_vencimiento_nueva, procesado_por, id_pago))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            actualizar_resumen = self.resumen.disponible()
+            with self.db.cursor(commit=True) as cursor:
+                anterior = self._movimiento_resumen(cursor, id_pago) if actualizar_resumen else None
+                cursor.execute("""
+                    UPDATE `ingresos` SET 
+                        `id_atleta`=%s, `id_plan`=%s, `monto`=%s, `tipo_pago`=%s, `metodo_pago`=%s,
+                        `descripcion`=%s, `fecha_pago`=%s, `fecha_vencimiento_anterior`=%s, 
+                        `fecha_vencimiento_nueva`=%s, `procesado_por`=%s
+                    WHERE `id_pago`=%s
+                """, (id_atleta, id_plan, monto, tipo_pago, metodo_pago, descripcion, fecha_pago, fecha_vencimiento_anterior, fecha_vencimiento_nueva, procesado_por, id_pago))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                if anterior:
+                    self.resumen.aplicar(cursor, 'ingreso', *anterior, signo=-1)
+                    self.resumen.aplicar(cursor, 'ingreso', fecha_pago, tipo_pago, metodo_pago, monto)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al actualizar ingreso: {error}")
+            logger.error("Error al actualizar ingreso: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def delete_ingreso(self, id_pago):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("DELETE FROM `ingresos` WHERE `id_pago`=%s", (id_pago,))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            actualizar_resumen = self.resumen.disponible()
+            with self.db.cursor(commit=True) as cursor:
+                anterior = self._movimiento_resumen(cursor, id_pago) if actualizar_resumen else None
+                cursor.execute("DELETE FROM `ingresos` WHERE `id_pago`=%s", (id_pago,))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                if anterior:
+                    self.resumen.aplicar(cursor, 'ingreso', *anterior, signo=-1)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar ingreso: {error}")
+            logger.error("Error al eliminar ingreso: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
\ No newline at end of file
+    def _movimiento_resumen(self, cursor, id_pago):
+        """(fecha, tipo, metodo, monto) actuales del ingreso, bloqueado hasta el commit"""
+        cursor.execute("""
+            SELECT `fecha_pago`, `tipo_pago`, `metodo_pago`, `monto`
+            FROM `ingresos` WHERE `id_pago`=%s FOR UPDATE
+        """, (id_pago,))
+        return cursor.fetchone()
@@ -0,0 +1,283 @@
+# Instrumentación de consultas: tiempos, filas y detección de N+1 por acción de la interfaz
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+# activa: envolver los cursores (apagada no cuesta nada); umbral_n_mas_1: una misma
+# consulta ejecutada más veces que esto en una acción se marca como N+1; archivo:
+# registro JSON (una línea por acción) o None; historial: acciones que guarda el panel
+INSTRUMENTACION_CONFIG = {
+    'activa': False,
+    'umbral_n_mas_1': 10,
+    'archivo': None,
+    'historial': 200
+}
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CONTROLADORES = os.path.join(_RAIZ, 'controllers') + os.sep
+_MODELOS = os.path.join(_RAIZ, 'models') + os.sep
+
+_LITERALES = re.compile(r"'(?:[^'\\]|\\.|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def huella(consulta):
+    """
+    Forma normalizada de una consulta: sin literales ni espacios de más y con las
+    listas IN de cualquier largo iguales, para agrupar las que solo cambian en valores
+    """
+    texto = _LITERALES.sub('?', consulta.replace('%s', '?'))
+    texto = _LISTAS.sub('(?, ...)', texto)
+    return _ESPACIOS.sub(' ', texto).strip()
+
+
+@lru_cache(maxsize=4096)
+def _ubicar(codigo):
+    """(es_controlador, es_modelo, nombre) de una función, por el archivo que la define"""
+    archivo = os.path.abspath(codigo.co_filename)
+    nombre = getattr(codigo, 'co_qualname', codigo.co_name)
+    return archivo.startswith(_CONTROLADORES), archivo.startswith(_MODELOS), nombre
+
+
+def _origen():
+    """
+    Método de controlador que originó la consulta; si no pasó por uno, la primera
+    función fuera de models/ y de contextlib (la vista o el script que llamó)
+    """
+    frame = sys._getframe(2)
+    externo = None
+    while frame is not None:
+        codigo = frame.f_code
+        controlador, modelo, nombre = _ubicar(codigo)
+        if controlador:
+            return nombre
+        if externo is None and not modelo and not codigo.co_filename.endswith('contextlib.py'):
+            externo = nombre
+        frame = frame.f_back
+    return externo or '?'
+
+
+class Accion:
+    """Consultas y conexiones de una acción de la interfaz, agrupadas por huella"""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.hilo = threading.current_thread().name
+        self.fecha = datetime.now()
+        self.inicio = time.perf_counter()
+        self.duracion = 0.0
+        self.consultas = {}
+        self.conexiones = 0
+        self.tiempo_conexion = 0.0
+
+    def registrar(self, consulta, duracion, origen):
+        clave = huella(consulta)
+        estadistica = self.consultas.get(clave)
+        if estadistica is None:
+            estadistica = self.consultas[clave] = {'veces': 0, 'tiempo': 0.0, 'filas': 0, 'origenes': Counter()}
+        estadistica['veces'] += 1
+        estadistica['tiempo'] += duracion
+        estadistica['origenes'][origen] += 1
+        return estadistica
+
+    @property
+    def total_consultas(self):
+        return sum(estadistica['veces'] for estadistica in self.consultas.values())
+
+    @property
+    def tiempo_consultas(self):
+        return sum(estadistica['tiempo'] for estadistica in self.consultas.values())
+
+    def n_mas_1(self, umbral):
+        """Huellas ejecutadas más de `umbral` veces, de la más repetida a la menos"""
+        return sorted(((clave, estadistica) for clave, estadistica in self.consultas.items()
+                       if estadistica['veces'] > umbral), key=lambda par: -par[1]['veces'])
+
+    def como_dict(self, umbral):
+        return {
+            'accion': self.nombre,
+            'hilo': self.hilo,
+            'fecha': self.fecha.isoformat(timespec='seconds'),
+            'duracion_ms': round(self.duracion * 1000, 3),
+            'consultas': self.total_consultas,
+            'tiempo_consultas_ms': round(self.tiempo_consultas * 1000, 3),
+            'conexiones': self.conexiones,
+            'tiempo_conexion_ms': round(self.tiempo_conexion * 1000, 3),
+            'n_mas_1': [clave for clave, _ in self.n_mas_1(umbral)],
+            'detalle': [
+                {
+                    'huella': clave,
+                    'veces': estadistica['veces'],
+                    'tiempo_ms': round(estadistica['tiempo'] * 1000, 3),
+                    'filas': estadistica['filas'],
+                    'origenes': dict(estadistica['origenes'])
+                }
+                for clave, estadistica in sorted(self.consultas.items(), key=lambda par: -par[1]['tiempo'])
+            ]
+        }
+
+
+class CursorInstrumentado:
+    """Cursor que mide cada execute y suma las filas leídas a la huella de la última consulta"""
+
+    def __init__(self, cursor, instrumentacion):
+        self._cursor = cursor
+        self._instrumentacion = instrumentacion
+        self._estadistica = None
+
+    def execute(self, consulta, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.execute(consulta, *args, **kwargs)
+        finally:
+            self._estadistica = self._instrumentacion.registrar_consulta(consulta, time.perf_counter() - inicio)
+
+    def executemany(self, consulta, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.executemany(consulta, *args, **kwargs)
+        finally:
+            self._estadistica = self._instrumentacion.registrar_consulta(consulta, time.perf_counter() - inicio)
+
+    def fetchone(self):
+        fila = self._leer(self._cursor.fetchone)
+        self._sumar_filas(1 if fila is not None else 0)
+        return fila
+
+    def fetchmany(self, *args, **kwargs):
+        filas = self._leer(lambda: self._cursor.fetchmany(*args, **kwargs))
+        self._sumar_filas(len(filas))
+        return filas
+
+    def fetchall(self):
+        filas = self._leer(self._cursor.fetchall)
+        self._sumar_filas(len(filas))
+        return filas
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def _leer(self, lectura):
+        # Con cursores sin buffer las filas llegan al leerlas: ese tiempo es de la consulta
+        inicio = time.perf_counter()
+        try:
+            return lectura()
+        finally:
+            if self._estadistica is not None:
+                self._estadistica['tiempo'] += time.perf_counter() - inicio
+
+    def _sumar_filas(self, cantidad):
+        if self._estadistica is not None:
+            self._estadistica['filas'] += cantidad
+
+
+class Instrumentacion:
+    """
+    Agrupa lo que hace la base durante cada acción (una tarea en segundo plano, un
+    callback de Tk, un comando) en un `Accion` por hilo. Al cerrarse la acción se
+    guarda en el historial, se escribe en el registro y se avisan los N+1.
+    Las consultas fuera de toda acción forman una acción propia con el nombre de
+    quien las originó.
+    """
+
+    def __init__(self):
+        self._hilo = threading.local()
+        self._lock = threading.Lock()
+        self.historial = deque(maxlen=INSTRUMENTACION_CONFIG['historial'])
+
+    @property
+    def activa(self):
+        return INSTRUMENTACION_CONFIG['activa']
+
+    def envolver(self, cursor):
+        return CursorInstrumentado(cursor, self)
+
+    @contextmanager
+    def accion(self, nombre):
+        """Agrupa en `nombre` las consultas del bloque; un bloque anidado se suma al exterior"""
+        if not self.activa or self._accion_actual() is not None:
+            yield
+            return
+
+        accion = Accion(nombre)
+        self._hilo.accion = accion
+        try:
+            yield accion
+        finally:
+            self._hilo.accion = None
+            accion.duracion = time.perf_counter() - accion.inicio
+            self._cerrar(accion)
+
+    def registrar_consulta(self, consulta, duracion):
+        accion = self._accion_actual()
+        if accion is not None:
+            return accion.registrar(consulta, duracion, _origen())
+
+        origen = _origen()
+        accion = Accion(f"(sin acción) {origen}")
+        estadistica = accion.registrar(consulta, duracion, origen)
+        accion.duracion = duracion
+        self._cerrar(accion)
+        return estadistica
+
+    def registrar_conexion(self, duracion):
+        """Tiempo en obtener una conexión del pool (incluye abrirla si hizo falta)"""
+        accion = self._accion_actual()
+        if accion is not None:
+            accion.conexiones += 1
+            accion.tiempo_conexion += duracion
+
+    def limpiar(self):
+        self.historial.clear()
+
+    def volcar(self, ruta):
+        """Escribe el historial completo en `ruta` (JSON) y devuelve cuántas acciones guardó"""
+        umbral = INSTRUMENTACION_CONFIG['umbral_n_mas_1']
+        acciones = [accion.como_dict(umbral) for accion in list(self.historial)]
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(acciones, archivo, ensure_ascii=False, indent=2)
+        return len(acciones)
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _accion_actual(self):
+        return getattr(self._hilo, 'accion', None)
+
+    def _cerrar(self, accion):
+        if not accion.consultas and not accion.conexiones:
+            return
+        self.historial.append(accion)
+
+        umbral = INSTRUMENTACION_CONFIG['umbral_n_mas_1']
+        for clave, estadistica in accion.n_mas_1(umbral):
+            logger.warning("N+1 en '%s': %s veces (%.1f ms) %s", accion.nombre, estadistica['veces'],
+                           estadistica['tiempo'] * 1000, clave[:120])
+
+        ruta = INSTRUMENTACION_CONFIG['archivo']
+        if ruta:
+            linea = json.dumps(accion.como_dict(umbral), ensure_ascii=False, default=str)
+            try:
+                with self._lock, open(ruta, 'a', encoding='utf-8') as archivo:
+                    archivo.write(linea + '\n')
+            except OSError as error:
+                logger.error("Error al escribir el registro de consultas: %s", error)
+
+
+# Instancia compartida por Database, las vistas y los benchmarks
+instrumentacion = Instrumentacion()
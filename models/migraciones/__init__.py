@@ -0,0 +1,104 @@
+# Migraciones versionadas del esquema de la base de datos
+import logging
+import mysql.connector
+from mysql.connector import Error
+from ..database import Database
+from . import v001_esquema_inicial, v002_indices_consultas, v003_ancho_password, v004_sesiones
+
+logger = logging.getLogger(__name__)
+
+
+# al_iniciar: aplicar las pendientes al abrir la aplicación (False si las aplica un DBA
+# con --migrar); espera_bloqueo: segundos esperando a otro puesto que esté migrando
+MIGRACION_CONFIG = {
+    'al_iniciar': True,
+    'espera_bloqueo': 30
+}
+
+# En orden: la versión de cada migración es su posición (1, 2, ...). Solo se agregan al final.
+MIGRACIONES = [
+    v001_esquema_inicial,
+    v002_indices_consultas,
+    v003_ancho_password,
+    v004_sesiones,
+]
+
+TABLA_VERSION = 'schema_version'
+NOMBRE_BLOQUEO = 'gimnasio_migraciones'
+
+
+class Migrador:
+    """
+    Aplica en orden las migraciones con versión mayor a la registrada en
+    `schema_version`. En MySQL el DDL confirma solo, así que cada migración debe
+    poder repetirse sin efecto si se interrumpe antes de quedar registrada.
+    Un bloqueo con nombre (GET_LOCK en MySQL) evita que dos puestos migren a la vez.
+    """
+
+    def __init__(self):
+        self.db = Database()
+
+    def version_actual(self):
+        """Última versión aplicada (0 si ninguna), o None si falla"""
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                self._asegurar_tabla_version(cursor)
+                cursor.execute(f"SELECT COALESCE(MAX(`version`), 0) FROM `{TABLA_VERSION}`")
+                return cursor.fetchone()[0]
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer la versión del esquema: %s", error)
+            return None
+
+    def pendientes(self, version):
+        return [(numero, migracion) for numero, migracion in enumerate(MIGRACIONES, start=1) if numero > version]
+
+    def migrar(self):
+        """Aplica las pendientes; devuelve la lista de (versión, descripción) aplicadas, o None si falla"""
+        aplicadas = []
+        en_curso = None
+        try:
+            with self.db.conexion() as conexion:
+                dialecto = self.db.dialecto
+                cursor = conexion.cursor()
+                try:
+                    if not dialecto.bloquear(cursor, NOMBRE_BLOQUEO, MIGRACION_CONFIG['espera_bloqueo']):
+                        logger.error("Error al migrar: otro puesto está actualizando el esquema")
+                        return None
+                    try:
+                        self._asegurar_tabla_version(cursor)
+                        cursor.execute(f"SELECT COALESCE(MAX(`version`), 0) FROM `{TABLA_VERSION}`")
+                        version = cursor.fetchone()[0]
+
+                        for numero, migracion in self.pendientes(version):
+                            en_curso = numero
+                            migracion.aplicar(cursor, dialecto)
+                            cursor.execute(
+                                f"INSERT INTO `{TABLA_VERSION}` (`version`, `descripcion`) VALUES (%s, %s)",
+                                (numero, migracion.DESCRIPCION)
+                            )
+                            conexion.commit()
+                            aplicadas.append((numero, migracion.DESCRIPCION))
+                    finally:
+                        dialecto.desbloquear(cursor, NOMBRE_BLOQUEO)
+                finally:
+                    cursor.close()
+            return aplicadas
+
+        except mysql.connector.Error as error:
+            if en_curso is None:
+                logger.error("Error al migrar el esquema: %s", error)
+            else:
+                logger.error("Error al aplicar la migración %s: %s", en_curso, error)
+            return None
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _asegurar_tabla_version(self, cursor):
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS `{TABLA_VERSION}` (
+                `version` INT NOT NULL PRIMARY KEY,
+                `descripcion` VARCHAR(255) NOT NULL,
+                `aplicada_en` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
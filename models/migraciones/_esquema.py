@@ -0,0 +1,40 @@
+# Utilidades de DDL idempotente para las migraciones
+import logging
+from mysql.connector import Error, errorcode
+
+logger = logging.getLogger(__name__)
+
+
+def existe_indice(cursor, dialecto, tabla, nombre, columnas):
+    """True si hay un índice con ese nombre o uno que empiece por esas columnas"""
+    indices = dialecto.indices(cursor, tabla)
+    columnas = list(columnas)
+    return nombre in indices or any(cols[:len(columnas)] == columnas for cols in indices.values())
+
+
+def crear_indice(cursor, dialecto, tabla, nombre, columnas, unico=False):
+    """
+    Crea el índice si todavía no existe uno equivalente (MySQL no tiene
+    CREATE INDEX IF NOT EXISTS). Devuelve True si lo creó.
+    """
+    if existe_indice(cursor, dialecto, tabla, nombre, columnas):
+        return False
+    cursor.execute(
+        f"CREATE {'UNIQUE ' if unico else ''}INDEX `{nombre}` ON `{tabla}` "
+        f"({', '.join(f'`{columna}`' for columna in columnas)})"
+    )
+    return True
+
+
+def crear_indice_unico(cursor, dialecto, tabla, nombre, columnas):
+    """
+    Índice único; si la tabla ya tiene valores repetidos crea uno simple, para que
+    la búsqueda igual sea rápida, y avisa para que se depuren los datos.
+    """
+    try:
+        return crear_indice(cursor, dialecto, tabla, nombre, columnas, unico=True)
+    except Error as error:
+        if error.errno != errorcode.ER_DUP_ENTRY:
+            raise
+        logger.warning("`%s` tiene valores repetidos en %s: `%s` se crea sin UNIQUE", tabla, ', '.join(columnas), nombre)
+        return crear_indice(cursor, dialecto, tabla, nombre, columnas)
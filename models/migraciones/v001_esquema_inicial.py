@@ -0,0 +1,165 @@
+# Tablas de la aplicación. En una base existente no cambia nada (IF NOT EXISTS);
+# en una nueva las crea con sus claves, restricciones e índices.
+
+DESCRIPCION = "Esquema inicial"
+
+TABLAS = [
+    """
+    CREATE TABLE IF NOT EXISTS `usuarios` (
+        `id` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `nombre` VARCHAR(100) NOT NULL,
+        `apellido` VARCHAR(100) NOT NULL,
+        `edad` INT NULL,
+        `direccion` VARCHAR(255) NULL,
+        `telefono` VARCHAR(30) NULL,
+        `email` VARCHAR(150) NOT NULL,
+        `contraseña` VARCHAR(255) NOT NULL,
+        `rol` VARCHAR(30) NOT NULL,
+        `estado_activo` TINYINT(1) NOT NULL DEFAULT 1,
+        `creado_por` INT NULL,
+        `fecha_actualizacion` DATETIME NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        `fecha_creacion` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY `idx_usuarios_email` (`email`)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `planes` (
+        `id_plan` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `nombre_plan` VARCHAR(100) NOT NULL,
+        `descripcion` TEXT NULL,
+        `precio` DECIMAL(10, 2) NOT NULL,
+        `duracion_dias` INT NOT NULL,
+        `estado_activo` TINYINT(1) NOT NULL DEFAULT 1,
+        CHECK (`precio` >= 0),
+        CHECK (`duracion_dias` > 0)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `coaches` (
+        `id_coach` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `id_usuario` INT NOT NULL,
+        `especialidades` TEXT NULL,
+        `horario_disponible` TEXT NULL,
+        `fecha_contratacion` DATE NULL,
+        `salario` DECIMAL(10, 2) NULL,
+        KEY `idx_coaches_usuario` (`id_usuario`),
+        CONSTRAINT `fk_coaches_usuario` FOREIGN KEY (`id_usuario`) REFERENCES `usuarios` (`id`)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `atletas` (
+        `id_atleta` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `id_usuario` INT NOT NULL,
+        `cedula` VARCHAR(20) NOT NULL,
+        `peso` DECIMAL(5, 2) NULL,
+        `fecha_nacimiento` DATE NULL,
+        `fecha_inscripcion` DATE NOT NULL,
+        `fecha_vencimiento` DATE NULL,
+        `id_plan` INT NULL,
+        `id_coach` INT NULL,
+        `meta_largo_plazo` TEXT NULL,
+        `valoracion_especiales` TEXT NULL,
+        `estado_solvencia` VARCHAR(20) NOT NULL DEFAULT 'solvente',
+        UNIQUE KEY `idx_atletas_cedula` (`cedula`),
+        KEY `idx_atletas_usuario` (`id_usuario`),
+        KEY `idx_atletas_coach` (`id_coach`),
+        KEY `idx_atletas_plan` (`id_plan`),
+        KEY `idx_atletas_vencimiento` (`estado_solvencia`, `fecha_vencimiento`),
+        CONSTRAINT `fk_atletas_usuario` FOREIGN KEY (`id_usuario`) REFERENCES `usuarios` (`id`),
+        CONSTRAINT `fk_atletas_plan` FOREIGN KEY (`id_plan`) REFERENCES `planes` (`id_plan`),
+        CONSTRAINT `fk_atletas_coach` FOREIGN KEY (`id_coach`) REFERENCES `coaches` (`id_coach`)
+            ON DELETE SET NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `asignaciones_coach_atleta` (
+        `id_asignacion` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `id_coach` INT NOT NULL,
+        `id_atleta` INT NOT NULL,
+        `fecha_asignacion` DATE NOT NULL,
+        `fecha_fin` DATE NULL,
+        `estado_activo` TINYINT(1) NOT NULL DEFAULT 1,
+        `notas` TEXT NULL,
+        KEY `idx_asignaciones_coach` (`id_coach`, `estado_activo`),
+        KEY `idx_asignaciones_atleta` (`id_atleta`, `estado_activo`),
+        CONSTRAINT `fk_asignaciones_coach` FOREIGN KEY (`id_coach`) REFERENCES `coaches` (`id_coach`)
+            ON DELETE CASCADE,
+        CONSTRAINT `fk_asignaciones_atleta` FOREIGN KEY (`id_atleta`) REFERENCES `atletas` (`id_atleta`)
+            ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    # `id_atleta` de ingresos guarda el ID de usuario en los pagos de inscripción,
+    # por eso no lleva clave foránea
+    """
+    CREATE TABLE IF NOT EXISTS `ingresos` (
+        `id_pago` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `id_atleta` INT NULL,
+        `id_plan` INT NULL,
+        `monto` DECIMAL(10, 2) NOT NULL,
+        `tipo_pago` VARCHAR(30) NOT NULL,
+        `metodo_pago` VARCHAR(30) NOT NULL,
+        `descripcion` TEXT NULL,
+        `fecha_pago` DATE NOT NULL,
+        `fecha_vencimiento_anterior` DATE NULL,
+        `fecha_vencimiento_nueva` DATE NULL,
+        `procesado_por` INT NULL,
+        KEY `idx_ingresos_fecha` (`fecha_pago`),
+        KEY `idx_ingresos_atleta` (`id_atleta`, `fecha_pago`),
+        CHECK (`monto` > 0)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `egresos` (
+        `id_egreso` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `monto` DECIMAL(10, 2) NOT NULL,
+        `tipo_egreso` VARCHAR(30) NOT NULL,
+        `descripcion` TEXT NULL,
+        `beneficiario` VARCHAR(150) NULL,
+        `metodo_pago` VARCHAR(30) NOT NULL,
+        `fecha_egreso` DATE NOT NULL,
+        `registrado_por` INT NULL,
+        `comprobante` VARCHAR(255) NULL,
+        KEY `idx_egresos_fecha` (`fecha_egreso`),
+        CHECK (`monto` > 0)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `rutinas` (
+        `id_rutina` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `nombre_rutina` VARCHAR(150) NOT NULL,
+        `nivel` VARCHAR(30) NULL,
+        `descripcion` TEXT NULL,
+        `creado_por` INT NULL,
+        `fecha_creacion` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `ejercicios` (
+        `id_ejercicio` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `nombre_ejercicio` VARCHAR(150) NOT NULL,
+        `tipo_ejercicio` VARCHAR(50) NULL,
+        `descripcion` TEXT NULL,
+        `instrucciones` TEXT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `rutina_ejercicios` (
+        `id` INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        `id_rutina` INT NOT NULL,
+        `id_ejercicio` INT NOT NULL,
+        `nivel` VARCHAR(30) NULL,
+        `series` INT NULL,
+        `rondas` INT NULL,
+        `orden_ejercicio` INT NULL,
+        KEY `idx_rutina_ejercicios_rutina` (`id_rutina`, `orden_ejercicio`),
+        CONSTRAINT `fk_rutina_ejercicios_rutina` FOREIGN KEY (`id_rutina`) REFERENCES `rutinas` (`id_rutina`)
+            ON DELETE CASCADE,
+        CONSTRAINT `fk_rutina_ejercicios_ejercicio` FOREIGN KEY (`id_ejercicio`) REFERENCES `ejercicios` (`id_ejercicio`)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """
+]
+
+
+def aplicar(cursor, dialecto):
+    for tabla in TABLAS:
+        dialecto.crear_tabla(cursor, tabla)
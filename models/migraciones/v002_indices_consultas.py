@@ -0,0 +1,26 @@
+# Índices para los filtros frecuentes en bases creadas antes de las migraciones
+# (las nuevas ya los traen de v001; los que existan con el mismo nombre se saltan).
+from ._esquema import crear_indice, crear_indice_unico
+
+DESCRIPCION = "Índices de las consultas filtradas"
+
+INDICES = [
+    # (tabla, nombre, columnas)
+    ('atletas', 'idx_atletas_usuario', ('id_usuario',)),
+    ('atletas', 'idx_atletas_coach', ('id_coach',)),
+    # barrido de vencidos y "próximos a vencer": estado_solvencia='solvente' AND fecha_vencimiento < x
+    ('atletas', 'idx_atletas_vencimiento', ('estado_solvencia', 'fecha_vencimiento')),
+    # reportes y paginación por (fecha_pago, id_pago); InnoDB agrega la clave primaria al índice
+    ('ingresos', 'idx_ingresos_fecha', ('fecha_pago',)),
+    ('ingresos', 'idx_ingresos_atleta', ('id_atleta', 'fecha_pago')),
+    ('egresos', 'idx_egresos_fecha', ('fecha_egreso',)),
+    ('asignaciones_coach_atleta', 'idx_asignaciones_coach', ('id_coach', 'estado_activo')),
+    ('asignaciones_coach_atleta', 'idx_asignaciones_atleta', ('id_atleta', 'estado_activo')),
+]
+
+
+def aplicar(cursor, dialecto):
+    # El login busca por email; además debe ser único
+    crear_indice_unico(cursor, dialecto, 'usuarios', 'idx_usuarios_email', ('email',))
+    for tabla, nombre, columnas in INDICES:
+        crear_indice(cursor, dialecto, tabla, nombre, columnas)
@@ -0,0 +1,12 @@
+# Los hashes de KDF (scrypt/PBKDF2) ocupan más que el SHA-256 en hexadecimal de
+# antes: bases creadas con una columna más angosta se amplían a VARCHAR(255).
+
+DESCRIPCION = "Columna usuarios.contraseña de 255 caracteres"
+
+ANCHO_CONTRASEÑA = 255
+
+
+def aplicar(cursor, dialecto):
+    ancho = dialecto.ancho_columna(cursor, 'usuarios', 'contraseña')
+    if ancho is not None and ancho < ANCHO_CONTRASEÑA:
+        cursor.execute(f"ALTER TABLE `usuarios` MODIFY `contraseña` VARCHAR({ANCHO_CONTRASEÑA}) NOT NULL")
@@ -0,0 +1,38 @@
+# Tablas del almacén de sesiones compartido (models/session_store.DatabaseSessionStore)
+from ._esquema import crear_indice
+
+DESCRIPCION = "Tablas de sesiones e intentos de login"
+
+TABLAS = [
+    """
+    CREATE TABLE IF NOT EXISTS `sesiones` (
+        `token` VARCHAR(64) NOT NULL PRIMARY KEY,
+        `id_usuario` INT NOT NULL,
+        `usuario` TEXT NOT NULL,
+        `ip_cliente` VARCHAR(45) NOT NULL DEFAULT '',
+        `inicio_sesion` DOUBLE NOT NULL,
+        `ultimo_acceso` DOUBLE NOT NULL,
+        `expira_en` DOUBLE NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS `intentos_login` (
+        `ip` VARCHAR(45) NOT NULL PRIMARY KEY,
+        `intentos` INT NOT NULL DEFAULT 0,
+        `ultimo_intento` DOUBLE NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """
+]
+
+INDICES = [
+    # (tabla, nombre, columnas); pueden existir si el almacén creó las tablas antes de esta migración
+    ('sesiones', 'idx_sesiones_usuario', ('id_usuario',)),
+    ('sesiones', 'idx_sesiones_expira', ('expira_en',)),
+]
+
+
+def aplicar(cursor, dialecto):
+    for tabla in TABLAS:
+        dialecto.crear_tabla(cursor, tabla)
+    for tabla, nombre, columnas in INDICES:
+        crear_indice(cursor, dialecto, tabla, nombre, columnas)
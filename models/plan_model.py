@@ -1,87 +1,83 @@
 # Modelo para gestión de planes
+import logging
 import mysql.connector
 from mysql.connector import Error
 from .database import Database
 
+logger = logging.getLogger(__name__)
+
 class PlanModel:
     def __init__(self):
         self.db = Database()
 
     def insert_plan(self, nombre_plan, descripcion, precio, duracion_dias, estado_activo):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `planes`
-                (`nombre_plan`, `descripcion`, `precio`, `duracion_dias`, `estado_activo`)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (nombre_plan, descripcion, precio, duracion_dias, estado_activo))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return cursor.lastrowid  # Retorna el ID del nuevo plan
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `planes`
+                    (`nombre_plan`, `descripcion`, `precio`, `duracion_dias`, `estado_activo`)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (nombre_plan, descripcion, precio, duracion_dias, estado_activo))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return cursor.lastrowid  # Retorna el ID del nuevo plan
 
         except mysql.connector.Error as error:
-            print(f"Error al insertar plan: {error}")
+            logger.error("Error al insertar plan: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def read_planes(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `planes`")
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `planes`")
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al leer planes: {error}")
+            logger.error("Error al leer planes: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def get_plan_by_id(self, id_plan):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `planes` WHERE `id_plan`=%s", (id_plan,))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer plan: %s", error)
+            return None
+
+    def get_plan_by_nombre(self, nombre_plan):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `planes` WHERE LOWER(`nombre_plan`)=LOWER(%s)", (nombre_plan,))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer plan por nombre: %s", error)
+            return None
 
     def update_plan(self, id_plan, nombre_plan, descripcion, precio, duracion_dias, estado_activo):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                UPDATE `planes` SET 
-                    `nombre_plan`=%s, `descripcion`=%s, `precio`=%s, 
-                    `duracion_dias`=%s, `estado_activo`=%s 
-                WHERE `id_plan`=%s
-            """, (nombre_plan, descripcion, precio, duracion_dias, estado_activo, id_plan))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    UPDATE `planes` SET 
+                        `nombre_plan`=%s, `descripcion`=%s, `precio`=%s, 
+                        `duracion_dias`=%s, `estado_activo`=%s 
+                    WHERE `id_plan`=%s
+                """, (nombre_plan, descripcion, precio, duracion_dias, estado_activo, id_plan))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al actualizar plan: {error}")
+            logger.error("Error al actualizar plan: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def delete_plan(self, id_plan):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("DELETE FROM `planes` WHERE `id_plan`=%s", (id_plan,))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return True
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `planes` WHERE `id_plan`=%s", (id_plan,))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                return True
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar plan: {error}")
+            logger.error("Error al eliminar plan: %s", error)
             return False
-
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
@@ -0,0 +1,80 @@
+# Configuración del registro (logging) de la aplicación
+import json
+import logging
+import logging.handlers
+from datetime import datetime
+
+
+# nivel: el de los módulos de la aplicación (DEBUG muestra el detalle fila por fila);
+# niveles: excepciones por módulo, p. ej. {'controllers.auth_controller': 'DEBUG'};
+# archivo: registro rotativo (None = solo consola); max_bytes/copias: tamaño y
+# cantidad de archivos viejos; json: una línea JSON por mensaje en el archivo;
+# consola: mostrar también los mensajes en la terminal
+REGISTRO_CONFIG = {
+    'nivel': 'INFO',
+    'niveles': {},
+    'archivo': None,
+    'max_bytes': 5 * 1024 * 1024,
+    'copias': 3,
+    'json': False,
+    'consola': True
+}
+
+# Raíces de los loggers propios (cada módulo usa logging.getLogger(__name__));
+# el resto de las bibliotecas queda en WARNING
+MODULOS_APLICACION = ('models', 'controllers', 'views', 'benchmarks', 'main', '__main__')
+
+FORMATO_CONSOLA = "%(asctime)s %(levelname)-7s %(message)s"
+FORMATO_ARCHIVO = "%(asctime)s %(levelname)-7s [%(threadName)s] %(name)s: %(message)s"
+
+
+class FormatoJSON(logging.Formatter):
+    """Un objeto JSON por mensaje, con la excepción (si la hay) como texto"""
+
+    def format(self, record):
+        datos = {
+            'fecha': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'modulo': record.name,
+            'funcion': record.funcName,
+            'hilo': record.threadName,
+            'mensaje': record.getMessage()
+        }
+        if record.exc_info:
+            datos['excepcion'] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+def configurar_registro(**cambios):
+    """
+    Aplica REGISTRO_CONFIG (con `cambios` encima) a los loggers de la aplicación.
+    Se puede llamar de nuevo: reemplaza los handlers de la llamada anterior.
+    """
+    REGISTRO_CONFIG.update(cambios)
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+        handler.close()
+
+    if REGISTRO_CONFIG['consola']:
+        consola = logging.StreamHandler()
+        consola.setFormatter(logging.Formatter(FORMATO_CONSOLA, datefmt='%H:%M:%S'))
+        raiz.addHandler(consola)
+
+    if REGISTRO_CONFIG['archivo']:
+        archivo = logging.handlers.RotatingFileHandler(
+            REGISTRO_CONFIG['archivo'], maxBytes=REGISTRO_CONFIG['max_bytes'],
+            backupCount=REGISTRO_CONFIG['copias'], encoding='utf-8'
+        )
+        archivo.setFormatter(FormatoJSON() if REGISTRO_CONFIG['json'] else logging.Formatter(FORMATO_ARCHIVO))
+        raiz.addHandler(archivo)
+
+    if not raiz.handlers:
+        raiz.addHandler(logging.NullHandler())
+
+    raiz.setLevel(logging.WARNING)
+    nivel = REGISTRO_CONFIG['nivel'].upper()
+    for modulo in MODULOS_APLICACION:
+        logging.getLogger(modulo).setLevel(nivel)
+    for modulo, nivel_modulo in REGISTRO_CONFIG['niveles'].items():
+        logging.getLogger(modulo).setLevel(nivel_modulo.upper())
@@ -0,0 +1,128 @@
+# Modelo para el resumen financiero diario (acumulado por día, tipo y método de pago)
+import logging
+from decimal import Decimal
+
+import mysql.connector
+from mysql.connector import Error
+from .database import Database
+
+logger = logging.getLogger(__name__)
+
+
+TABLA_RESUMEN = 'resumen_financiero_diario'
+
+
+class ResumenFinancieroModel:
+    """
+    Mantiene una fila por (fecha, movimiento, tipo, metodo_pago) con la cantidad de
+    registros y la suma de montos. IngresoModel y EgresoModel la actualizan dentro de
+    la misma transacción en que insertan, modifican o eliminan un movimiento.
+    """
+
+    _tabla_verificada = False
+
+    def __init__(self):
+        self.db = Database()
+
+    def disponible(self):
+        """True si la tabla de resumen existe (se verifica una vez por proceso)"""
+        return ResumenFinancieroModel._tabla_verificada or self.asegurar_tabla()
+
+    def asegurar_tabla(self):
+        """Crea la tabla si no existe y, en ese caso, la llena desde ingresos y egresos"""
+        try:
+            with self.db.cursor() as cursor:
+                existe = self.db.dialecto.existe_tabla(cursor, TABLA_RESUMEN)
+
+            if not existe:
+                with self.db.cursor(commit=True) as cursor:
+                    self.db.dialecto.crear_tabla(cursor, f"""
+                        CREATE TABLE IF NOT EXISTS `{TABLA_RESUMEN}` (
+                            `fecha` DATE NOT NULL,
+                            `movimiento` ENUM('ingreso', 'egreso') NOT NULL,
+                            `tipo` VARCHAR(50) NOT NULL,
+                            `metodo_pago` VARCHAR(50) NOT NULL,
+                            `cantidad` INT NOT NULL DEFAULT 0,
+                            `total` DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            PRIMARY KEY (`fecha`, `movimiento`, `tipo`, `metodo_pago`)
+                        )
+                    """)
+                if not self.reconstruir():
+                    return False
+
+            ResumenFinancieroModel._tabla_verificada = True
+            return True
+
+        except mysql.connector.Error as error:
+            logger.error("Error al verificar resumen financiero: %s", error)
+            return False
+
+    def aplicar(self, cursor, movimiento, fecha, tipo, metodo_pago, monto, signo=1, cantidad=1):
+        """
+        Suma (signo=1) o resta (signo=-1) un movimiento en el resumen usando el cursor
+        de la transacción que lo registra, para que ambos se confirmen juntos.
+        Con `cantidad` > 1, `monto` es el total de esos movimientos (registro por lote).
+        """
+        clave = (fecha, movimiento, tipo or '', metodo_pago or '')
+        monto = Decimal(str(monto or 0))
+        cursor.execute(self.db.dialecto.insertar_acumulando(
+            TABLA_RESUMEN,
+            ('fecha', 'movimiento', 'tipo', 'metodo_pago', 'cantidad', 'total'),
+            ('DATE(%s)', '%s', '%s', '%s', '%s', '%s'),
+            clave=('fecha', 'movimiento', 'tipo', 'metodo_pago'),
+            sumar=('cantidad', 'total')
+        ), clave + (signo * cantidad, signo * monto))
+
+        if signo < 0:
+            cursor.execute(f"""
+                DELETE FROM `{TABLA_RESUMEN}`
+                WHERE `fecha` = DATE(%s) AND `movimiento` = %s AND `tipo` = %s
+                  AND `metodo_pago` = %s AND `cantidad` <= 0
+            """, clave)
+
+    def reconstruir(self):
+        """Recalcula todo el resumen desde ingresos y egresos en una sola transacción"""
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute(f"DELETE FROM `{TABLA_RESUMEN}`")
+                cursor.execute(f"""
+                    INSERT INTO `{TABLA_RESUMEN}`
+                    (`fecha`, `movimiento`, `tipo`, `metodo_pago`, `cantidad`, `total`)
+                    SELECT `fecha_pago`, 'ingreso', COALESCE(`tipo_pago`, ''), COALESCE(`metodo_pago`, ''),
+                           COUNT(*), COALESCE(SUM(`monto`), 0)
+                    FROM `ingresos`
+                    GROUP BY `fecha_pago`, `tipo_pago`, `metodo_pago`
+                """)
+                cursor.execute(f"""
+                    INSERT INTO `{TABLA_RESUMEN}`
+                    (`fecha`, `movimiento`, `tipo`, `metodo_pago`, `cantidad`, `total`)
+                    SELECT `fecha_egreso`, 'egreso', COALESCE(`tipo_egreso`, ''), COALESCE(`metodo_pago`, ''),
+                           COUNT(*), COALESCE(SUM(`monto`), 0)
+                    FROM `egresos`
+                    GROUP BY `fecha_egreso`, `tipo_egreso`, `metodo_pago`
+                """)
+                cursor.execute(f"SELECT COUNT(*) FROM `{TABLA_RESUMEN}`")
+                filas = cursor.fetchone()[0]
+
+            logger.info("Resumen financiero reconstruido: %s filas", filas)
+            return True
+
+        except mysql.connector.Error as error:
+            logger.error("Error al reconstruir resumen financiero: %s", error)
+            return False
+
+    def get_totales_por_tipo(self, movimiento, fecha_inicio, fecha_fin):
+        """(tipo, cantidad, total) del periodo sumando filas del resumen"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT `tipo`, SUM(`cantidad`), COALESCE(SUM(`total`), 0)
+                    FROM `{TABLA_RESUMEN}`
+                    WHERE `movimiento` = %s AND `fecha` BETWEEN %s AND %s
+                    GROUP BY `tipo`
+                """, (movimiento, fecha_inicio, fecha_fin))
+                return [(tipo, int(cantidad), total) for tipo, cantidad, total in cursor.fetchall()]
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer resumen financiero: %s", error)
+            return None
@@ -1,208 +1,170 @@
+import logging
 import mysql.connector
 from mysql.connector import Error
 from .database import Database
 
+logger = logging.getLogger(__name__)
+
 class RutinaModel:
     def __init__(self):
         self.db = Database()
     
     def insert_rutina(self, nombre_rutina, nivel, descripcion, creado_por):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `rutinas` 
-                (`nombre_rutina`, `nivel`, `descripcion`, `creado_por`) 
-                VALUES (%s, %s, %s, %s)
-            """, (nombre_rutina, nivel, descripcion, creado_por))
-            self.db.connection.commit()
-            return cursor.lastrowid
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `rutinas` 
+                    (`nombre_rutina`, `nivel`, `descripcion`, `creado_por`) 
+                    VALUES (%s, %s, %s, %s)
+                """, (nombre_rutina, nivel, descripcion, creado_por))
+                return cursor.lastrowid
 
         except mysql.connector.Error as error:
-            print(f"Error al insertar rutina: {error}")
+            logger.error("Error al insertar rutina: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def read_rutinas(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `rutinas`")
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `rutinas`")
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al leer rutinas: {error}")
+            logger.error("Error al leer rutinas: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def read_rutinas_resumen(self):
+        """
+        Rutinas con dos columnas extra al final: número de ejercicios y nombre del creador.
+        Una sola consulta para toda la pantalla de rutinas.
+        """
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT r.*,
+                           COALESCE(re.num_ejercicios, 0) AS num_ejercicios,
+                           CONCAT(u.nombre, ' ', u.apellido) AS creador
+                    FROM rutinas r
+                    LEFT JOIN (
+                        SELECT id_rutina, COUNT(*) AS num_ejercicios
+                        FROM rutina_ejercicios
+                        GROUP BY id_rutina
+                    ) re ON re.id_rutina = r.id_rutina
+                    LEFT JOIN usuarios u ON u.id = r.creado_por
+                    ORDER BY r.id_rutina
+                """)
+                return cursor.fetchall()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer resumen de rutinas: %s", error)
+            return []
 
     def insert_ejercicio(self, nombre_ejercicio, tipo_ejercicio, descripcion, instrucciones):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `ejercicios` 
-                (`nombre_ejercicio`, `tipo_ejercicio`, `descripcion`, `instrucciones`) 
-                VALUES (%s, %s, %s, %s)
-            """, (nombre_ejercicio, tipo_ejercicio, descripcion, instrucciones))
-            self.db.connection.commit()
-            return cursor.lastrowid
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `ejercicios` 
+                    (`nombre_ejercicio`, `tipo_ejercicio`, `descripcion`, `instrucciones`) 
+                    VALUES (%s, %s, %s, %s)
+                """, (nombre_ejercicio, tipo_ejercicio, descripcion, instrucciones))
+                return cursor.lastrowid
 
         except mysql.connector.Error as error:
-            print(f"Error al insertar ejercicio: {error}")
+            logger.error("Error al insertar ejercicio: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def read_ejercicios(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `ejercicios`")
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `ejercicios`")
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al leer ejercicios: {error}")
+            logger.error("Error al leer ejercicios: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def asignar_ejercicio_rutina(self, id_rutina, id_ejercicio, nivel, series, rondas, orden_ejercicio):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `rutina_ejercicios` 
-                (`id_rutina`, `id_ejercicio`, `nivel`, `series`, `rondas`, `orden_ejercicio`) 
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (id_rutina, id_ejercicio, nivel, series, rondas, orden_ejercicio))
-            self.db.connection.commit()
-            return cursor.lastrowid
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `rutina_ejercicios` 
+                    (`id_rutina`, `id_ejercicio`, `nivel`, `series`, `rondas`, `orden_ejercicio`) 
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, (id_rutina, id_ejercicio, nivel, series, rondas, orden_ejercicio))
+                return cursor.lastrowid
 
         except mysql.connector.Error as error:
-            print(f"Error al asignar ejercicio: {error}")
+            logger.error("Error al asignar ejercicio: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def get_rutina_completa(self, id_rutina):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                SELECT r.nombre_rutina, e.nombre_ejercicio, re.nivel, re.series, re.rondas, re.orden_ejercicio
-                FROM rutinas r
-                JOIN rutina_ejercicios re ON r.id_rutina = re.id_rutina
-                JOIN ejercicios e ON re.id_ejercicio = e.id_ejercicio
-                WHERE r.id_rutina = %s
-                ORDER BY re.orden_ejercicio
-            """, (id_rutina,))
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT r.nombre_rutina, e.nombre_ejercicio, re.nivel, re.series, re.rondas, re.orden_ejercicio
+                    FROM rutinas r
+                    JOIN rutina_ejercicios re ON r.id_rutina = re.id_rutina
+                    JOIN ejercicios e ON re.id_ejercicio = e.id_ejercicio
+                    WHERE r.id_rutina = %s
+                    ORDER BY re.orden_ejercicio
+                """, (id_rutina,))
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al obtener rutina completa: {error}")
+            logger.error("Error al obtener rutina completa: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def contar_ejercicios_rutina(self, id_rutina):
         """Cuenta cuántos ejercicios tiene una rutina"""
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM rutina_ejercicios WHERE id_rutina = %s", (id_rutina,))
-            resultado = cursor.fetchone()
-            return resultado[0] if resultado else 0
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM rutina_ejercicios WHERE id_rutina = %s", (id_rutina,))
+                resultado = cursor.fetchone()
+                return resultado[0] if resultado else 0
 
         except mysql.connector.Error as error:
-            print(f"Error al contar ejercicios: {error}")
+            logger.error("Error al contar ejercicios: %s", error)
             return 0
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def update_rutina(self, id_rutina, nombre_rutina, nivel, descripcion):
         """NECESARIO para editar rutinas"""
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                UPDATE `rutinas` SET 
-                `nombre_rutina`=%s, `nivel`=%s, `descripcion`=%s 
-                WHERE `id_rutina`=%s
-            """, (nombre_rutina, nivel, descripcion, id_rutina))
-            self.db.connection.commit()
-            return cursor.rowcount > 0
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    UPDATE `rutinas` SET 
+                    `nombre_rutina`=%s, `nivel`=%s, `descripcion`=%s 
+                    WHERE `id_rutina`=%s
+                """, (nombre_rutina, nivel, descripcion, id_rutina))
+                return cursor.rowcount > 0
 
         except mysql.connector.Error as error:
-            print(f"Error al actualizar rutina: {error}")
+            logger.error("Error al actualizar rutina: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def delete_rutina(self, id_rutina):
         """NECESARIO para eliminar rutinas"""
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `rutina_ejercicios` WHERE `id_rutina`=%s", (id_rutina,))
             
-            cursor.execute("DELETE FROM `rutina_ejercicios` WHERE `id_rutina`=%s", (id_rutina,))
+                cursor.execute("DELETE FROM `rutinas` WHERE `id_rutina`=%s", (id_rutina,))
             
-            cursor.execute("DELETE FROM `rutinas` WHERE `id_rutina`=%s", (id_rutina,))
-            
-            self.db.connection.commit()
-            return cursor.rowcount > 0
+                return cursor.rowcount > 0
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar rutina: {error}")
+            logger.error("Error al eliminar rutina: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def eliminar_ejercicio_de_rutina(self, id_rutina, id_ejercicio):
         """NECESARIO para quitar ejercicios de rutinas"""
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                DELETE FROM `rutina_ejercicios` 
-                WHERE `id_rutina`=%s AND `id_ejercicio`=%s
-            """, (id_rutina, id_ejercicio))
-            self.db.connection.commit()
-            return cursor.rowcount > 0
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    DELETE FROM `rutina_ejercicios` 
+                    WHERE `id_rutina`=%s AND `id_ejercicio`=%s
+                """, (id_rutina, id_ejercicio))
+                return cursor.rowcount > 0
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar ejercicio de rutina: {error}")
-            return False
-
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
\ No newline at end of file
+            logger.error("Error al eliminar ejercicio de rutina: %s", error)
+            return False
\ No newline at end of file
@@ -0,0 +1,309 @@
+# Almacenes de sesiones e intentos fallidos de login para AuthController
+import heapq
+import json
+import logging
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import Error
+from .database import Database
+
+logger = logging.getLogger(__name__)
+
+
+# 'bd' comparte sesiones y bloqueos entre los puestos que usan la misma base de datos;
+# 'memoria' los mantiene solo en este proceso
+SESSION_CONFIG = {
+    'backend': 'bd',
+    'intervalo_limpieza': 60  # segundos mínimos entre barridos de sesiones vencidas en la BD
+}
+
+
+class MemorySessionStore:
+    """
+    Sesiones en un diccionario por token, con un heap (vencimiento, token) para
+    desalojar las vencidas en O(log n) cada una, y un índice por usuario para
+    cerrar todas sus sesiones sin recorrer el resto.
+
+    El heap guarda una sola entrada por token: al renovar una sesión solo se
+    actualiza el diccionario, y cuando su entrada llega al tope con un
+    vencimiento viejo se vuelve a encolar con el vigente.
+    """
+
+    def __init__(self, tiempo_expiracion):
+        self.tiempo_expiracion = tiempo_expiracion
+        self._sesiones = {}
+        self._por_usuario = {}
+        self._vencimientos = []
+        self._intentos = {}
+        self._lock = threading.RLock()
+
+    # ==================== SESIONES ====================
+
+    def guardar(self, token, sesion):
+        with self._lock:
+            self.limpiar_expiradas()
+            self._sesiones[token] = sesion
+            self._por_usuario.setdefault(sesion["usuario"]["id"], set()).add(token)
+            heapq.heappush(self._vencimientos, (self._vence(sesion), token))
+
+    def obtener(self, token):
+        """Sesión del token (puede estar vencida si aún no se desalojó), o None"""
+        return self._sesiones.get(token)
+
+    def tocar(self, token, sesion, ahora):
+        """Actualiza el último acceso; el heap se corrige en forma perezosa"""
+        sesion["ultimo_acceso"] = ahora
+
+    def eliminar(self, token):
+        with self._lock:
+            sesion = self._sesiones.pop(token, None)
+            if sesion is not None:
+                tokens = self._por_usuario.get(sesion["usuario"]["id"])
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._por_usuario[sesion["usuario"]["id"]]
+            return sesion
+
+    def eliminar_por_usuario(self, user_id):
+        """Cierra todas las sesiones de un usuario y devuelve cuántas eran"""
+        with self._lock:
+            tokens = list(self._por_usuario.get(user_id, ()))
+            for token in tokens:
+                self.eliminar(token)
+            return len(tokens)
+
+    def sesiones(self):
+        """Lista de (token, sesión) vigentes"""
+        with self._lock:
+            self.limpiar_expiradas()
+            return list(self._sesiones.items())
+
+    def limpiar_expiradas(self):
+        """Desaloja las sesiones cuyo vencimiento ya pasó, empezando por el tope del heap"""
+        ahora = time.time()
+        with self._lock:
+            while self._vencimientos and self._vencimientos[0][0] <= ahora:
+                _, token = heapq.heappop(self._vencimientos)
+                sesion = self._sesiones.get(token)
+                if sesion is None:
+                    continue
+                vence = self._vence(sesion)
+                if vence <= ahora:
+                    self.eliminar(token)
+                else:
+                    # Se renovó después de encolarse: vuelve con su vencimiento real
+                    heapq.heappush(self._vencimientos, (vence, token))
+
+    # ==================== INTENTOS FALLIDOS ====================
+
+    def obtener_intentos(self, ip):
+        """{"intentos", "ultimo_intento"} de la IP, o None"""
+        datos = self._intentos.get(ip)
+        return dict(datos) if datos else None
+
+    def registrar_intento(self, ip, ahora):
+        with self._lock:
+            datos = self._intentos.setdefault(ip, {"intentos": 0, "ultimo_intento": 0})
+            datos["intentos"] += 1
+            datos["ultimo_intento"] = ahora
+
+    def limpiar_intentos(self, ip):
+        with self._lock:
+            self._intentos.pop(ip, None)
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _vence(self, sesion):
+        return sesion["ultimo_acceso"] + self.tiempo_expiracion
+
+
+class DatabaseSessionStore:
+    """
+    Sesiones e intentos fallidos en las tablas `sesiones` e `intentos_login`,
+    compartidas por todos los puestos conectados a la misma base de datos.
+    Cada operación es una consulta por clave primaria o por índice; las sesiones
+    vencidas se borran por el índice de vencimiento como mucho una vez por
+    `intervalo_limpieza` segundos. Las tablas las crea la migración v004.
+
+    El vencimiento deslizante solo se escribe cuando a la sesión le queda menos de
+    `fraccion_renovacion` del tiempo de expiración: validar una sesión recién
+    renovada no cuesta un UPDATE, a cambio de que venza hasta esa fracción antes.
+    """
+
+    def __init__(self, tiempo_expiracion, intervalo_limpieza=60, fraccion_renovacion=0.5):
+        self.db = Database()
+        self.tiempo_expiracion = tiempo_expiracion
+        self.intervalo_limpieza = intervalo_limpieza
+        self.fraccion_renovacion = fraccion_renovacion
+        self._ultima_limpieza = 0
+
+    def verificar_tablas(self):
+        """True si existen las tablas de la migración v004"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM `sesiones` LIMIT 1")
+                cursor.fetchall()
+                cursor.execute("SELECT 1 FROM `intentos_login` LIMIT 1")
+                cursor.fetchall()
+            return True
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer tablas de sesiones (¿falta aplicar --migrar?): %s", error)
+            return False
+
+    # ==================== SESIONES ====================
+
+    def guardar(self, token, sesion):
+        self._limpiar_si_corresponde()
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    REPLACE INTO `sesiones`
+                    (`token`, `id_usuario`, `usuario`, `ip_cliente`, `inicio_sesion`, `ultimo_acceso`, `expira_en`)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, (token, sesion["usuario"]["id"], json.dumps(sesion["usuario"]), sesion["ip_cliente"] or '',
+                      sesion["inicio_sesion"], sesion["ultimo_acceso"],
+                      sesion["ultimo_acceso"] + self.tiempo_expiracion))
+
+        except mysql.connector.Error as error:
+            logger.error("Error al guardar sesión: %s", error)
+
+    def obtener(self, token):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT `usuario`, `ip_cliente`, `inicio_sesion`, `ultimo_acceso`
+                    FROM `sesiones` WHERE `token`=%s
+                """, (token,))
+                fila = cursor.fetchone()
+            return self._sesion_desde_fila(fila) if fila else None
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer sesión: %s", error)
+            return None
+
+    def tocar(self, token, sesion, ahora):
+        """Renueva el vencimiento si ya pasó `fraccion_renovacion` del tiempo desde la última escritura"""
+        if ahora - sesion["ultimo_acceso"] < self.tiempo_expiracion * self.fraccion_renovacion:
+            return
+        sesion["ultimo_acceso"] = ahora
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute(
+                    "UPDATE `sesiones` SET `ultimo_acceso`=%s, `expira_en`=%s WHERE `token`=%s",
+                    (ahora, ahora + self.tiempo_expiracion, token)
+                )
+
+        except mysql.connector.Error as error:
+            logger.error("Error al actualizar sesión: %s", error)
+
+    def eliminar(self, token):
+        sesion = self.obtener(token)
+        if sesion is None:
+            return None
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `sesiones` WHERE `token`=%s", (token,))
+            return sesion
+
+        except mysql.connector.Error as error:
+            logger.error("Error al eliminar sesión: %s", error)
+            return None
+
+    def eliminar_por_usuario(self, user_id):
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `sesiones` WHERE `id_usuario`=%s", (user_id,))
+                return cursor.rowcount
+
+        except mysql.connector.Error as error:
+            logger.error("Error al eliminar sesiones del usuario: %s", error)
+            return 0
+
+    def sesiones(self):
+        self.limpiar_expiradas()
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("""
+                    SELECT `token`, `usuario`, `ip_cliente`, `inicio_sesion`, `ultimo_acceso`
+                    FROM `sesiones` ORDER BY `inicio_sesion`
+                """)
+                return [(fila[0], self._sesion_desde_fila(fila[1:])) for fila in cursor.fetchall()]
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer sesiones: %s", error)
+            return []
+
+    def limpiar_expiradas(self):
+        self._ultima_limpieza = time.time()
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `sesiones` WHERE `expira_en` <= %s", (self._ultima_limpieza,))
+
+        except mysql.connector.Error as error:
+            logger.error("Error limpiando sesiones: %s", error)
+
+    # ==================== INTENTOS FALLIDOS ====================
+
+    def obtener_intentos(self, ip):
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT `intentos`, `ultimo_intento` FROM `intentos_login` WHERE `ip`=%s", (ip,))
+                fila = cursor.fetchone()
+            return {"intentos": fila[0], "ultimo_intento": fila[1]} if fila else None
+
+        except mysql.connector.Error as error:
+            logger.error("Error al leer intentos fallidos: %s", error)
+            return None
+
+    def registrar_intento(self, ip, ahora):
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute(
+                    "UPDATE `intentos_login` SET `intentos`=`intentos`+1, `ultimo_intento`=%s WHERE `ip`=%s",
+                    (ahora, ip)
+                )
+                if cursor.rowcount == 0:
+                    cursor.execute(
+                        "INSERT INTO `intentos_login` (`ip`, `intentos`, `ultimo_intento`) VALUES (%s, 1, %s)",
+                        (ip, ahora)
+                    )
+
+        except mysql.connector.Error as error:
+            logger.error("Error al registrar intento fallido: %s", error)
+
+    def limpiar_intentos(self, ip):
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `intentos_login` WHERE `ip`=%s", (ip,))
+
+        except mysql.connector.Error as error:
+            logger.error("Error al limpiar intentos fallidos: %s", error)
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _limpiar_si_corresponde(self):
+        if time.time() - self._ultima_limpieza >= self.intervalo_limpieza:
+            self.limpiar_expiradas()
+
+    def _sesion_desde_fila(self, fila):
+        usuario, ip_cliente, inicio_sesion, ultimo_acceso = fila
+        return {
+            "usuario": json.loads(usuario),
+            "inicio_sesion": float(inicio_sesion),
+            "ultimo_acceso": float(ultimo_acceso),
+            "ip_cliente": ip_cliente
+        }
+
+
+def crear_almacen_sesiones(tiempo_expiracion):
+    """Almacén según SESSION_CONFIG; si la BD no está disponible se usa memoria"""
+    if SESSION_CONFIG['backend'] == 'bd':
+        almacen = DatabaseSessionStore(tiempo_expiracion, SESSION_CONFIG['intervalo_limpieza'])
+        if almacen.verificar_tablas():
+            return almacen
+        logger.warning("Sesiones en memoria: no se pudo usar la base de datos")
+    return MemorySessionStore(tiempo_expiracion)
@@ -0,0 +1,71 @@
+# Directorio de usuarios en memoria con índices por id, email y rol
+import threading
+import time
+
+
+class UserDirectory:
+    """
+    Cache de la tabla usuarios indexada para búsquedas O(1).
+    Se recarga completa cuando vence el TTL o tras una invalidación explícita.
+    """
+
+    def __init__(self, cargador, ttl=60):
+        self.cargador = cargador
+        self.ttl = ttl
+        self._por_id = {}
+        self._por_email = {}
+        self._por_rol = {}
+        self._cargado_en = None
+        self._lock = threading.RLock()
+
+    def invalidar(self):
+        """Marca el directorio como desactualizado (insert/update/delete de usuarios)"""
+        with self._lock:
+            self._cargado_en = None
+
+    def por_id(self, user_id):
+        """Tupla del usuario con ese id, o None"""
+        return self._indices()[0].get(user_id)
+
+    def por_email(self, email):
+        """Tupla del usuario con ese email (sin distinguir mayúsculas), o None"""
+        if not email:
+            return None
+        return self._indices()[1].get(email.strip().lower())
+
+    def por_rol(self, rol):
+        """Lista de usuarios con ese rol"""
+        return list(self._indices()[2].get(rol, ()))
+
+    def todos(self):
+        """Lista de todos los usuarios del directorio"""
+        return list(self._indices()[0].values())
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _vigente(self):
+        return self._cargado_en is not None and (time.monotonic() - self._cargado_en) < self.ttl
+
+    def _indices(self):
+        with self._lock:
+            if not self._vigente():
+                self._recargar()
+            return self._por_id, self._por_email, self._por_rol
+
+    def _recargar(self):
+        usuarios = self.cargador()
+
+        por_id = {}
+        por_email = {}
+        por_rol = {}
+        for usuario in usuarios:
+            por_id[usuario[0]] = usuario  # id en posición 0
+            if usuario[6]:
+                por_email[str(usuario[6]).strip().lower()] = usuario  # email en posición 6
+            por_rol.setdefault(usuario[8], []).append(usuario)  # rol en posición 8
+
+        self._por_id = por_id
+        self._por_email = por_email
+        self._por_rol = por_rol
+        # Una lectura vacía suele ser un error de conexión: no se da por vigente
+        self._cargado_en = time.monotonic() if usuarios else None
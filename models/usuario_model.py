@@ -1,10 +1,16 @@
 # Modelo para gestión de usuarios
+import logging
 import mysql.connector
 from mysql.connector import Error
 from .database import Database
+from .user_directory import UserDirectory
 
+logger = logging.getLogger(__name__)
 
 class UsuarioModel:
+    # Largo de `usuarios`.`contraseña` leído del esquema: False sin leer, None sin límite
+    _ancho_contraseña = False
+
     def __init__(self):
         self.db = Database()
     
@@ -12,79 +18,114 @@ class UsuarioModel:
     
     def insert_usuario(self, nombre, apellido, edad, direccion, telefono, email, contraseña, rol, creado_por):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO `usuarios` 
-                (`nombre`, `apellido`, `edad`, `direccion`, `telefono`, `email`, `contraseña`, `rol`, `creado_por`) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (nombre, apellido, edad, direccion, telefono, email, contraseña, rol, creado_por))
-            self.db.connection.commit()
-            print(cursor.rowcount)
-            return cursor.lastrowid  # Retorna el ID del usuario insertado
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO `usuarios` 
+                    (`nombre`, `apellido`, `edad`, `direccion`, `telefono`, `email`, `contraseña`, `rol`, `creado_por`) 
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (nombre, apellido, edad, direccion, telefono, email, contraseña, rol, creado_por))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+                nuevo_id = cursor.lastrowid  # Retorna el ID del usuario insertado
+            self.db.al_finalizar(directorio.invalidar)
+            return nuevo_id
 
         except mysql.connector.Error as error:
-            print(f"Error al insertar usuario: {error}")
+            logger.error("Error al insertar usuario: %s", error)
             return None
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
-
     def read_usuarios(self):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT * FROM `usuarios`")
-            return cursor.fetchall()
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `usuarios`")
+                return cursor.fetchall()
 
         except mysql.connector.Error as error:
-            print(f"Error al leer usuarios: {error}")
+            logger.error("Error al leer usuarios: %s", error)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    # Consultas servidas por el directorio en memoria
 
-    def update_usuario(self, id, nombre, apellido, edad, direccion, telefono, email, contraseña, rol, estado_activo):
+    def get_user_by_id(self, id):
+        return directorio.por_id(id)
+
+    def get_user_by_email(self, email):
+        return directorio.por_email(email)
+
+    def get_users_by_rol(self, rol):
+        return directorio.por_rol(rol)
+
+    def get_usuarios_cache(self):
+        return directorio.todos()
+
+    def buscar_por_email(self, email):
+        """Consulta puntual por email (índice único) sin cargar el directorio completo; para el login"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT * FROM `usuarios` WHERE `email`=%s LIMIT 1", (email.strip(),))
+                return cursor.fetchone()
+
+        except mysql.connector.Error as error:
+            logger.error("Error al buscar usuario por email: %s", error)
+            return None
+
+    def admite_contraseña(self, contraseña):
+        """
+        True si el hash cabe en la columna. Una base sin la migración v003 puede
+        tener la columna del SHA-256 heredado (64), donde un hash de KDF se cortaría.
+        """
+        if UsuarioModel._ancho_contraseña is False:
+            try:
+                with self.db.cursor() as cursor:
+                    UsuarioModel._ancho_contraseña = self.db.dialecto.ancho_columna(cursor, 'usuarios', 'contraseña')
+
+            except mysql.connector.Error as error:
+                logger.error("Error al leer el ancho de la contraseña: %s", error)
+                return False
+
+        ancho = UsuarioModel._ancho_contraseña
+        return ancho is None or len(contraseña) <= ancho
+
+    def update_password(self, id, contraseña):
+        """Reemplaza solo el hash de la contraseña (p. ej. al migrar un hash heredado)"""
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                UPDATE `usuarios` SET 
-                    `nombre`=%s, `apellido`=%s, `edad`=%s, `direccion`=%s, `telefono`=%s, 
-                    `email`=%s, `contraseña`=%s, `rol`=%s, `estado_activo`=%s 
-                WHERE `id`=%s
-            """, (nombre, apellido, edad, direccion, telefono, email, contraseña, rol, estado_activo, id))
-            self.db.connection.commit()
-            print(cursor.rowcount)
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("UPDATE `usuarios` SET `contraseña`=%s WHERE `id`=%s", (contraseña, id))
+            self.db.al_finalizar(directorio.invalidar)
             return True
 
         except mysql.connector.Error as error:
-            print(f"Error al actualizar usuario: {error}")
+            logger.error("Error al actualizar contraseña: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
+    def update_usuario(self, id, nombre, apellido, edad, direccion, telefono, email, contraseña, rol, estado_activo):
+        try:
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("""
+                    UPDATE `usuarios` SET 
+                        `nombre`=%s, `apellido`=%s, `edad`=%s, `direccion`=%s, `telefono`=%s, 
+                        `email`=%s, `contraseña`=%s, `rol`=%s, `estado_activo`=%s 
+                    WHERE `id`=%s
+                """, (nombre, apellido, edad, direccion, telefono, email, contraseña, rol, estado_activo, id))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+            self.db.al_finalizar(directorio.invalidar)
+            return True
+
+        except mysql.connector.Error as error:
+            logger.error("Error al actualizar usuario: %s", error)
+            return False
 
     def delete_usuario(self, id):
         try:
-            self.db.connect()
-            cursor = self.db.connection.cursor()
-            cursor.execute("DELETE FROM `usuarios` WHERE `id`=%s", (id,))
-            self.db.connection.commit()
-            print(cursor.rowcount)
+            with self.db.cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM `usuarios` WHERE `id`=%s", (id,))
+                logger.debug("Filas afectadas: %s", cursor.rowcount)
+            self.db.al_finalizar(directorio.invalidar)
             return True
 
         except mysql.connector.Error as error:
-            print(f"Error al eliminar usuario: {error}")
+            logger.error("Error al eliminar usuario: %s", error)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            self.db.disconnect()
\ No newline at end of file
+
+# Directorio compartido por todas las instancias del modelo
+directorio = UserDirectory(cargador=lambda: UsuarioModel().read_usuarios())
@@ -0,0 +1,33 @@
+# Agrupa llamadas seguidas (p. ej. una por tecla) en una sola
+
+
+class Debouncer:
+    """
+    Llamar al debouncer reprograma `funcion` para dentro de `retraso` ms; solo se
+    ejecuta cuando pasa ese tiempo sin nuevas llamadas. Se cancela solo si el
+    widget dueño se destruye (p. ej. al cambiar de módulo).
+    """
+
+    def __init__(self, widget, retraso, funcion):
+        self.widget = widget
+        self.retraso = retraso
+        self.funcion = funcion
+        self._programado = None
+
+        self.widget.bind('<Destroy>', lambda _evento: self.cancelar(), add='+')
+
+    def __call__(self, *args):
+        self.cancelar()
+        self._programado = self.widget.after(self.retraso, self._ejecutar)
+
+    def cancelar(self):
+        if self._programado is not None:
+            try:
+                self.widget.after_cancel(self._programado)
+            except Exception:
+                pass
+            self._programado = None
+
+    def _ejecutar(self):
+        self._programado = None
+        self.funcion()
@@ -0,0 +1,121 @@
+# Panel de depuración con las consultas de cada acción (requiere --instrumentar)
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from models.instrumentacion import instrumentacion, INSTRUMENTACION_CONFIG
+
+
+class _CallWrapperInstrumentado(tk.CallWrapper):
+    """Cada callback de Tk (botón, evento, after) es una acción con el nombre de su función"""
+
+    def __call__(self, *args):
+        nombre = getattr(self.func, '__qualname__', None) or repr(self.func)
+        with instrumentacion.accion(nombre):
+            return super().__call__(*args)
+
+
+def instrumentar_callbacks_tk():
+    """Debe llamarse antes de crear la ventana: Tk envuelve los callbacks al registrarlos"""
+    tk.CallWrapper = _CallWrapperInstrumentado
+
+
+class PanelConsultas:
+    """
+    Lista las últimas acciones con su tiempo, consultas y conexiones; al elegir una
+    muestra sus consultas agrupadas por huella. Las marcadas N+1 se ven en rojo.
+    """
+
+    def __init__(self, root):
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title("Consultas por acción")
+        self.ventana.geometry("1000x600")
+        self.ventana.transient(root)
+        self._acciones = []
+
+        barra = ttk.Frame(self.ventana, padding=(10, 10, 10, 0))
+        barra.pack(fill='x')
+        self.resumen = ttk.Label(barra, text="")
+        self.resumen.pack(side='left')
+        ttk.Button(barra, text="💾 Guardar JSON", command=self.guardar).pack(side='right')
+        ttk.Button(barra, text="🗑️ Limpiar", command=self.limpiar).pack(side='right', padx=5)
+        ttk.Button(barra, text="🔄 Actualizar", command=self.actualizar).pack(side='right')
+
+        paneles = ttk.PanedWindow(self.ventana, orient='vertical')
+        paneles.pack(fill='both', expand=True, padx=10, pady=10)
+
+        columnas = ('hora', 'accion', 'duracion', 'consultas', 'tiempo_bd', 'conexiones', 'n_mas_1')
+        self.acciones_tree = self._crear_tabla(paneles, columnas, (
+            ("Hora", 70), ("Acción", 380), ("Duración ms", 90), ("Consultas", 80),
+            ("En BD ms", 80), ("Conexiones", 80), ("N+1", 50)
+        ))
+        self.acciones_tree.bind('<<TreeviewSelect>>', self._mostrar_detalle)
+
+        columnas = ('huella', 'veces', 'tiempo', 'filas', 'origen')
+        self.detalle_tree = self._crear_tabla(paneles, columnas, (
+            ("Consulta", 520), ("Veces", 60), ("ms", 70), ("Filas", 70), ("Origen", 250)
+        ))
+
+        self.actualizar()
+
+    def actualizar(self):
+        umbral = INSTRUMENTACION_CONFIG['umbral_n_mas_1']
+        self._acciones = list(instrumentacion.historial)[::-1]
+        self.acciones_tree.delete(*self.acciones_tree.get_children())
+        self.detalle_tree.delete(*self.detalle_tree.get_children())
+
+        con_n_mas_1 = 0
+        for indice, accion in enumerate(self._acciones):
+            sospechosas = len(accion.n_mas_1(umbral))
+            con_n_mas_1 += bool(sospechosas)
+            self.acciones_tree.insert('', 'end', iid=str(indice), tags=('n_mas_1',) if sospechosas else (), values=(
+                accion.fecha.strftime('%H:%M:%S'), accion.nombre, f"{accion.duracion * 1000:.1f}",
+                accion.total_consultas, f"{accion.tiempo_consultas * 1000:.1f}", accion.conexiones,
+                sospechosas or ""
+            ))
+        self.resumen.config(text=f"{len(self._acciones)} acciones, {con_n_mas_1} con N+1 "
+                                 f"(más de {umbral} ejecuciones de una misma consulta)")
+
+    def limpiar(self):
+        instrumentacion.limpiar()
+        self.actualizar()
+
+    def guardar(self):
+        ruta = filedialog.asksaveasfilename(parent=self.ventana, defaultextension='.json',
+                                            filetypes=[("JSON", "*.json")], initialfile="consultas.json")
+        if not ruta:
+            return
+        try:
+            cantidad = instrumentacion.volcar(ruta)
+            messagebox.showinfo("Consultas", f"{cantidad} acciones guardadas en {ruta}", parent=self.ventana)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar: {e}", parent=self.ventana)
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _crear_tabla(self, paneles, columnas, encabezados):
+        marco = ttk.Frame(paneles)
+        paneles.add(marco, weight=1)
+        tabla = ttk.Treeview(marco, columns=columnas, show='headings')
+        for columna, (titulo, ancho) in zip(columnas, encabezados):
+            tabla.heading(columna, text=titulo)
+            tabla.column(columna, width=ancho, stretch=columna in ('accion', 'huella'))
+        tabla.tag_configure('n_mas_1', background='#FFD6D6')
+        barra = ttk.Scrollbar(marco, orient='vertical', command=tabla.yview)
+        tabla.configure(yscrollcommand=barra.set)
+        tabla.pack(side='left', fill='both', expand=True)
+        barra.pack(side='right', fill='y')
+        return tabla
+
+    def _mostrar_detalle(self, event=None):
+        seleccion = self.acciones_tree.selection()
+        self.detalle_tree.delete(*self.detalle_tree.get_children())
+        if not seleccion:
+            return
+
+        umbral = INSTRUMENTACION_CONFIG['umbral_n_mas_1']
+        accion = self._acciones[int(seleccion[0])]
+        for clave, estadistica in sorted(accion.consultas.items(), key=lambda par: -par[1]['tiempo']):
+            origen, _ = estadistica['origenes'].most_common(1)[0]
+            self.detalle_tree.insert('', 'end', tags=('n_mas_1',) if estadistica['veces'] > umbral else (), values=(
+                clave, estadistica['veces'], f"{estadistica['tiempo'] * 1000:.1f}", estadistica['filas'], origen
+            ))
@@ -0,0 +1,100 @@
+# Tabla perezosa: materializa las filas de un Treeview por bloques según el scroll
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LazyTable:
+    """
+    Envuelve un ttk.Treeview para que solo existan como items las filas visibles
+    más un margen. El resto se inserta por bloques cuando el scroll se acerca al
+    final; si se indica `cargar_mas`, al agotarse los registros locales se piden
+    más a la fuente (paginación incremental).
+
+    `cargar_mas` puede devolver la lista siguiente (vacía si no hay más) o None si
+    la pidió en segundo plano; en ese caso la página llega luego con `agregar`.
+    """
+
+    def __init__(self, tree, scrollbar, formateador, tamaño_bloque=200, umbral=0.9):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.formateador = formateador  # registro -> tupla de valores (None para omitirlo)
+        self.tamaño_bloque = tamaño_bloque
+        self.umbral = umbral
+
+        self._registros = []
+        self._siguiente = 0
+        self._cargar_mas = None
+        self._esperando = False
+        self._programado = False
+
+        self.tree.configure(yscrollcommand=self._on_scroll)
+
+    def mostrar(self, registros, cargar_mas=None):
+        """Reemplaza el contenido de la tabla e inserta solo el primer bloque"""
+        self.limpiar()
+        self._registros = registros if isinstance(registros, list) else list(registros)
+        self._cargar_mas = cargar_mas
+        self._materializar_bloque()
+
+    def limpiar(self):
+        """Borra todos los items de una vez y olvida los registros pendientes"""
+        items = self.tree.get_children()
+        if items:
+            self.tree.delete(*items)
+        self._registros = []
+        self._siguiente = 0
+        self._cargar_mas = None
+        self._esperando = False
+
+    def agregar(self, registros, hay_mas=True):
+        """Recibe una página pedida en segundo plano por `cargar_mas`"""
+        self._esperando = False
+        self._registros.extend(registros)
+        if not hay_mas:
+            self._cargar_mas = None
+        self._materializar_bloque()
+
+    def registros(self):
+        """Registros cargados hasta ahora (materializados o no)"""
+        return self._registros
+
+    def pendientes(self):
+        """Cantidad de registros locales que aún no son items del Treeview"""
+        return len(self._registros) - self._siguiente
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _on_scroll(self, primero, ultimo):
+        if self.scrollbar is not None:
+            self.scrollbar.set(primero, ultimo)
+
+        hay_mas = self.pendientes() > 0 or (self._cargar_mas is not None and not self._esperando)
+        if hay_mas and float(ultimo) >= self.umbral and not self._programado:
+            # Fuera del callback de scroll para no insertar mientras Tk redibuja
+            self._programado = True
+            self.tree.after_idle(self._materializar_bloque)
+
+    def _materializar_bloque(self):
+        self._programado = False
+
+        if self.pendientes() <= 0 and self._cargar_mas is not None and not self._esperando:
+            nuevos = self._cargar_mas()
+            if nuevos is None:
+                self._esperando = True
+                return
+            if nuevos:
+                self._registros.extend(nuevos)
+            else:
+                self._cargar_mas = None
+
+        fin = min(self._siguiente + self.tamaño_bloque, len(self._registros))
+        for registro in self._registros[self._siguiente:fin]:
+            try:
+                valores = self.formateador(registro)
+            except Exception as e:
+                logger.error("Error procesando fila: %s", e)
+                continue
+            if valores is not None:
+                self.tree.insert('', 'end', values=valores)
+        self._siguiente = fin
@@ -0,0 +1,68 @@
+# Ventana modal con barra de progreso para tareas largas en segundo plano
+import tkinter as tk
+from tkinter import ttk
+
+
+class ProgressDialog:
+    """
+    La tarea (en otro hilo) llama `progreso(hechas, total)` y consulta `cancelado()`;
+    la ventana lee el último valor cada `intervalo` ms desde el hilo de Tk, ya que
+    los widgets no deben tocarse desde otros hilos.
+    """
+
+    def __init__(self, root, titulo, intervalo=100):
+        self.intervalo = intervalo
+        self._estado = (0, 0)
+        self._cancelado = False
+        self._cerrado = False
+
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title(titulo)
+        self.ventana.resizable(False, False)
+        self.ventana.transient(root)
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cancelar)
+
+        marco = ttk.Frame(self.ventana, padding=20)
+        marco.pack(fill='both', expand=True)
+
+        ttk.Label(marco, text=titulo, font=('Segoe UI', 11, 'bold')).pack(anchor='w')
+        self.barra = ttk.Progressbar(marco, length=320, mode='determinate')
+        self.barra.pack(fill='x', pady=10)
+        self.etiqueta = ttk.Label(marco, text="Preparando...")
+        self.etiqueta.pack(anchor='w')
+        self.boton_cancelar = ttk.Button(marco, text="Cancelar", command=self.cancelar)
+        self.boton_cancelar.pack(anchor='e', pady=(10, 0))
+
+        self.ventana.grab_set()
+        self.ventana.after(self.intervalo, self._refrescar)
+
+    # Llamados desde el hilo de la tarea
+
+    def progreso(self, hechas, total):
+        self._estado = (hechas, total)
+
+    def cancelado(self):
+        return self._cancelado
+
+    # Llamados desde el hilo de Tk
+
+    def cancelar(self):
+        self._cancelado = True
+        self.etiqueta.config(text="Cancelando...")
+        self.boton_cancelar.config(state='disabled')
+
+    def cerrar(self):
+        if not self._cerrado:
+            self._cerrado = True
+            self.ventana.grab_release()
+            self.ventana.destroy()
+
+    def _refrescar(self):
+        if self._cerrado:
+            return
+        hechas, total = self._estado
+        if total:
+            self.barra['value'] = hechas * 100 / total
+            if not self._cancelado:
+                self.etiqueta.config(text=f"{hechas:,} de {total:,} filas")
+        self.ventana.after(self.intervalo, self._refrescar)
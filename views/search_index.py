@@ -0,0 +1,78 @@
+# Índice de búsqueda en memoria para los filtros de texto de las tablas
+import unicodedata
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos, para que 'José' coincida con 'jose'"""
+    texto = unicodedata.normalize('NFKD', str(texto or '').lower())
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+
+def unir(*campos):
+    """Texto buscable de varios campos; los vacíos (None) no aportan el texto 'None'"""
+    return ' '.join(str(campo) for campo in campos if campo is not None)
+
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class SearchIndex:
+    """
+    Se construye una vez por carga de datos: guarda el texto buscable de cada
+    registro ya normalizado y un índice de trigramas -> posiciones. Una búsqueda
+    de 3 o más caracteres solo revisa los registros que contienen todos sus
+    trigramas, y si el texto extiende a la búsqueda anterior se filtra sobre el
+    resultado previo en lugar de sobre todos los registros.
+    """
+
+    def __init__(self, registros, texto_de):
+        self.registros = list(registros)
+        self._textos = [normalizar(texto_de(registro)) for registro in self.registros]
+
+        self._trigramas = {}
+        for posicion, texto in enumerate(self._textos):
+            for trigrama in _trigramas(texto):
+                self._trigramas.setdefault(trigrama, []).append(posicion)
+
+        self._ultima_consulta = ''
+        self._ultimo_resultado = range(len(self.registros))
+
+    def buscar(self, consulta):
+        """Registros cuyo texto contiene `consulta`, en el orden original"""
+        return [self.registros[posicion] for posicion in self.posiciones(consulta)]
+
+    def posiciones(self, consulta):
+        consulta = normalizar(consulta).strip()
+        if not consulta:
+            resultado = range(len(self.registros))
+        elif self._ultima_consulta and self._ultima_consulta in consulta:
+            # Refinamiento: todo lo que contiene la consulta nueva contenía la anterior
+            resultado = [p for p in self._ultimo_resultado if consulta in self._textos[p]]
+        elif len(consulta) >= 3:
+            resultado = [p for p in self._candidatos(consulta) if consulta in self._textos[p]]
+        else:
+            resultado = [p for p, texto in enumerate(self._textos) if consulta in texto]
+
+        self._ultima_consulta = consulta
+        self._ultimo_resultado = resultado
+        return resultado
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _candidatos(self, consulta):
+        """Intersección de las listas de trigramas, empezando por la más corta"""
+        listas = []
+        for trigrama in _trigramas(consulta):
+            lista = self._trigramas.get(trigrama)
+            if not lista:
+                return []
+            listas.append(lista)
+
+        listas.sort(key=len)
+        candidatos = set(listas[0])
+        for lista in listas[1:]:
+            candidatos.intersection_update(lista)
+            if not candidatos:
+                break
+        return sorted(candidatos)
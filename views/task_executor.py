@@ -0,0 +1,133 @@
+# Ejecutor de tareas en segundo plano para la interfaz Tk
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+
+class Tarea:
+    """Una llamada enviada al ejecutor; cancelada, su resultado se descarta"""
+
+    def __init__(self, grupo, al_terminar, al_fallar):
+        self.grupo = grupo
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.cancelada = False
+        self.future = None
+
+    def cancelar(self):
+        self.cancelada = True
+        if self.future is not None:
+            self.future.cancel()  # solo tiene efecto si aún no empezó
+
+
+class TaskExecutor:
+    """
+    Corre funciones bloqueantes (consultas a la BD) en un pool de hilos y entrega
+    sus resultados al hilo de Tk a través de una cola revisada con `after`.
+    Los callbacks siempre se ejecutan en el hilo principal, así que pueden tocar widgets.
+    Con `contexto`, cada tarea corre dentro de `contexto(nombre)` (p. ej. la acción de
+    la instrumentación de consultas); el nombre es el grupo o el de la función.
+    """
+
+    def __init__(self, root, max_hilos=4, intervalo=50, contexto=None):
+        self.root = root
+        self.intervalo = intervalo  # milisegundos entre revisiones de la cola
+        self.contexto = contexto
+
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix='tarea-bd')
+        self._terminadas = queue.Queue()
+        self._activas = set()
+        self._por_grupo = {}
+        self._sondeando = False
+
+    def ejecutar(self, funcion, al_terminar, al_fallar=None, grupo=None):
+        """
+        Envía `funcion` al pool y llama `al_terminar(resultado)` en el hilo de Tk.
+        Una tarea nueva de un mismo `grupo` cancela la anterior (petición obsoleta).
+        """
+        if grupo is not None:
+            self.cancelar_grupo(grupo)
+
+        tarea = Tarea(grupo, al_terminar, al_fallar)
+        self._activas.add(tarea)
+        if grupo is not None:
+            self._por_grupo[grupo] = tarea
+
+        if self.contexto is not None:
+            funcion = self._en_contexto(funcion, f"tarea {grupo}" if grupo else funcion.__qualname__)
+        tarea.future = self._pool.submit(funcion)
+        tarea.future.add_done_callback(lambda _future: self._terminadas.put(tarea))
+        self._programar_sondeo()
+        return tarea
+
+    def cancelar_grupo(self, grupo):
+        """Descarta la tarea pendiente de un grupo, si la hay"""
+        tarea = self._por_grupo.pop(grupo, None)
+        if tarea is not None:
+            tarea.cancelar()
+
+    def cancelar_todas(self):
+        """Descarta todas las tareas pendientes (p. ej. al cambiar de módulo)"""
+        for tarea in list(self._activas):
+            tarea.cancelar()
+        self._por_grupo.clear()
+
+    def cerrar(self):
+        """Cancela lo pendiente y libera los hilos sin esperar consultas en curso"""
+        self.cancelar_todas()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ==================== MÉTODOS PRIVADOS ====================
+
+    def _en_contexto(self, funcion, nombre):
+        def ejecutar():
+            with self.contexto(nombre):
+                return funcion()
+        return ejecutar
+
+    def _programar_sondeo(self):
+        if self._sondeando:
+            return
+        try:
+            self.root.after(self.intervalo, self._procesar_terminadas)
+            self._sondeando = True
+        except tk.TclError:
+            # La ventana ya fue destruida
+            pass
+
+    def _procesar_terminadas(self):
+        self._sondeando = False
+
+        while True:
+            try:
+                tarea = self._terminadas.get_nowait()
+            except queue.Empty:
+                break
+            self._entregar(tarea)
+
+        if self._activas:
+            self._programar_sondeo()
+
+    def _entregar(self, tarea):
+        self._activas.discard(tarea)
+        if self._por_grupo.get(tarea.grupo) is tarea:
+            del self._por_grupo[tarea.grupo]
+
+        if tarea.cancelada or tarea.future.cancelled():
+            return
+
+        try:
+            error = tarea.future.exception()
+            if error is None:
+                tarea.al_terminar(tarea.future.result())
+            elif tarea.al_fallar is not None:
+                tarea.al_fallar(error)
+            else:
+                logger.error("Error en tarea en segundo plano: %s", error, exc_info=error)
+        except Exception as e:
+            # Un callback roto no debe detener la entrega de las demás tareas
+            logger.exception("Error entregando resultado de tarea: %s", e)